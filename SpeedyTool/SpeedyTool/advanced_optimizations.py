@@ -1,14 +1,16 @@
 """Advanced performance optimizations for ultra-high-speed username checking."""
 
-import asyncio
 import aiohttp
-import time
 import ujson
-from typing import List, Dict, Optional, Tuple
+from typing import List, Optional
 from dataclasses import dataclass
-import hashlib
 import random
 
+from check_engine import CheckOutcome
+from latency_histogram import RequestLatency
+from ttl_cache import TTLCache
+from username_pipeline import canonical_username
+
 @dataclass
 class RequestOptimization:
     """Request optimization strategies."""
@@ -25,13 +27,11 @@ class AdvancedRequestOptimizer:
         self.config = config
         self.session_pool: List[aiohttp.ClientSession] = []
         self.session_index = 0
-        self.response_cache: Dict[str, Tuple[dict, float]] = {}
         self.cache_ttl = 300  # 5 minutes
+        self.response_cache: TTLCache[CheckOutcome] = TTLCache(max_size=10000, ttl=self.cache_ttl)
         
-        # Performance tracking
-        self.request_times: List[float] = []
-        self.success_streak = 0
-        self.error_streak = 0
+        # Performance tracking; sessions report connect and first-byte times here too
+        self.latency = RequestLatency()
         
     async def create_session_pool(self, pool_size: int = 3) -> None:
         """Create a pool of optimized sessions for better performance."""
@@ -81,6 +81,7 @@ class AdvancedRequestOptimizer:
                 headers=headers,
                 json_serialize=ujson.dumps,
                 trust_env=True,
+                trace_configs=[self.latency.trace_config()],
             )
             
             self.session_pool.append(session)
@@ -102,158 +103,24 @@ class AdvancedRequestOptimizer:
     
     def get_cache_key(self, username: str) -> str:
         """Generate cache key for username."""
-        return hashlib.md5(username.encode()).hexdigest()
+        return canonical_username(username)
     
-    def get_cached_response(self, username: str) -> Optional[dict]:
+    def get_cached_response(self, username: str) -> Optional[CheckOutcome]:
         """Get cached response if available and not expired."""
-        cache_key = self.get_cache_key(username)
-        if cache_key in self.response_cache:
-            response, timestamp = self.response_cache[cache_key]
-            if time.time() - timestamp < self.cache_ttl:
-                return response
-            else:
-                # Remove expired cache entry
-                del self.response_cache[cache_key]
-        return None
-    
-    def cache_response(self, username: str, response: dict) -> None:
-        """Cache response with timestamp."""
-        cache_key = self.get_cache_key(username)
-        self.response_cache[cache_key] = (response, time.time())
-        
-        # Limit cache size to prevent memory issues
-        if len(self.response_cache) > 10000:
-            # Remove oldest 20% of entries
-            sorted_cache = sorted(self.response_cache.items(), key=lambda x: x[1][1])
-            for key, _ in sorted_cache[:2000]:
-                del self.response_cache[key]
+        return self.response_cache.get(self.get_cache_key(username))
     
-    async def make_optimized_request(self, username: str) -> dict:
-        """Make an optimized request with advanced techniques."""
-        # Check cache first
-        cached_response = self.get_cached_response(username)
-        if cached_response:
-            return cached_response
-        
-        session = self.get_next_session()
-        url = f"{self.config.api_url}?Username={username}&Birthday={self.config.birthday}"
-        
-        start_time = time.time()
-        
-        try:
-            async with session.get(url) as response:
-                response_time = time.time() - start_time
-                
-                if response.status == 200:
-                    data = await response.json(loads=ujson.loads)
-                    
-                    # Cache successful responses
-                    self.cache_response(username, data)
-                    
-                    # Track performance
-                    self.request_times.append(response_time)
-                    self.success_streak += 1
-                    self.error_streak = 0
-                    
-                    # Keep only recent times for performance calculation
-                    if len(self.request_times) > 1000:
-                        self.request_times = self.request_times[-500:]
-                    
-                    return data
-                else:
-                    self.error_streak += 1
-                    self.success_streak = 0
-                    raise aiohttp.ClientResponseError(
-                        request_info=response.request_info,
-                        history=response.history,
-                        status=response.status
-                    )
-        
-        except Exception as e:
-            self.error_streak += 1
-            self.success_streak = 0
-            raise e
-    
-    def get_adaptive_delay(self) -> float:
-        """Calculate adaptive delay based on performance metrics."""
-        base_delay = self.config.base_delay
-        
-        # If we're on a success streak and performance is good, reduce delay
-        if self.success_streak > 20 and self.request_times:
-            avg_time = sum(self.request_times[-20:]) / min(20, len(self.request_times))
-            if avg_time < 0.2:  # If average response time is under 200ms
-                return max(0.0001, base_delay * 0.5)  # Reduce delay by 50%
-        
-        # If we're having errors, increase delay
-        if self.error_streak > 5:
-            return min(self.config.max_delay, base_delay * (1.5 ** min(self.error_streak, 10)))
-        
-        return base_delay
+    def cache_response(self, username: str, response: CheckOutcome) -> None:
+        """Cache response; the cache evicts and expires entries itself."""
+        self.response_cache.put(self.get_cache_key(username), response)
     
     def get_performance_stats(self) -> dict:
         """Get current performance statistics."""
-        if not self.request_times:
-            return {
-                'avg_response_time': 0.0,
-                'min_response_time': 0.0,
-                'max_response_time': 0.0,
-                'cache_hit_ratio': 0.0,
-                'success_streak': self.success_streak,
-                'error_streak': self.error_streak
-            }
-        
-        recent_times = self.request_times[-100:] if len(self.request_times) > 100 else self.request_times
-        cache_size = len(self.response_cache)
-        
+        total = self.latency.total
         return {
-            'avg_response_time': sum(recent_times) / len(recent_times),
-            'min_response_time': min(recent_times),
-            'max_response_time': max(recent_times),
-            'cache_size': cache_size,
-            'success_streak': self.success_streak,
-            'error_streak': self.error_streak,
-            'total_requests': len(self.request_times)
+            'avg_response_time': total.mean,
+            'min_response_time': total.min,
+            'max_response_time': total.max,
+            'p99_response_time': total.percentile(99),
+            'total_requests': total.count,
+            **self.response_cache.get_stats()
         }
-
-class UltraFastBatchProcessor:
-    """Ultra-fast batch processor with intelligent request distribution."""
-    
-    def __init__(self, optimizer: AdvancedRequestOptimizer, rate_limiter):
-        self.optimizer = optimizer
-        self.rate_limiter = rate_limiter
-    
-    async def process_batch_ultra_fast(self, usernames: List[str]) -> List[dict]:
-        """Process a batch of usernames with maximum performance optimizations."""
-        # Create semaphore for this batch
-        semaphore = asyncio.Semaphore(self.rate_limiter.current_concurrent)
-        
-        async def process_single(username: str) -> dict:
-            async with semaphore:
-                # Apply adaptive delay
-                delay = self.optimizer.get_adaptive_delay()
-                if delay > 0:
-                    await asyncio.sleep(delay)
-                
-                try:
-                    return await self.optimizer.make_optimized_request(username)
-                except Exception as e:
-                    return {'error': str(e), 'username': username}
-        
-        # Create tasks for all usernames
-        tasks = [process_single(username) for username in usernames]
-        
-        # Execute with gather for maximum concurrency
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results and handle exceptions
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    'error': str(result),
-                    'username': usernames[i]
-                })
-            else:
-                processed_results.append(result)
-        
-        return processed_results
\ No newline at end of file
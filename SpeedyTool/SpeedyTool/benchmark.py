@@ -0,0 +1,1685 @@
+#!/usr/bin/env python3
+"""Reproducible micro-benchmarks for the username checker internals.
+
+Run ``python benchmark.py <name>`` for a single benchmark; every benchmark
+prints a short table and can also write its raw numbers with ``--json``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from typing import Callable, Dict, List
+
+
+def _legacy_cache_put(cache: dict, key: str, value: dict) -> None:
+    """The md5 dict cache with sort-on-overflow eviction, kept as a baseline."""
+    import hashlib
+    cache_key = hashlib.md5(key.encode()).hexdigest()
+    cache[cache_key] = (value, time.time())
+    if len(cache) > 10000:
+        sorted_cache = sorted(cache.items(), key=lambda x: x[1][1])
+        for old_key, _ in sorted_cache[:2000]:
+            del cache[old_key]
+
+
+def bench_cache(args) -> Dict:
+    """Measure put/get latency as the response cache fills past capacity."""
+    from ttl_cache import TTLCache
+
+    capacity = args.capacity
+    step = capacity // 10
+    total = capacity * 3
+    response = {'code': 1, 'message': 'Username is already in use'}
+
+    cache: TTLCache[dict] = TTLCache(max_size=capacity, ttl=300)
+    legacy: dict = {}
+    rows: List[Dict] = []
+
+    for start in range(0, total, step):
+        keys = [f"user{i}" for i in range(start, start + step)]
+
+        began = time.perf_counter()
+        for key in keys:
+            cache.put(key, response)
+        put_ns = (time.perf_counter() - began) / step * 1e9
+
+        began = time.perf_counter()
+        for key in keys:
+            cache.get(key)
+        get_ns = (time.perf_counter() - began) / step * 1e9
+
+        worst_ns = 0.0
+        for key in keys:
+            began = time.perf_counter()
+            _legacy_cache_put(legacy, key, response)
+            worst_ns = max(worst_ns, (time.perf_counter() - began) * 1e9)
+
+        rows.append({
+            'filled': start + step,
+            'put_ns': put_ns,
+            'get_ns': get_ns,
+            'legacy_worst_put_ns': worst_ns,
+        })
+
+    print(f"{'Inserted':>10} {'put ns':>10} {'get ns':>10} {'legacy worst put ns':>22}")
+    for row in rows:
+        print(f"{row['filled']:>10,} {row['put_ns']:>10.0f} {row['get_ns']:>10.0f} {row['legacy_worst_put_ns']:>22,.0f}")
+
+    return {'capacity': capacity, 'rows': rows, 'stats': cache.get_stats()}
+
+
+def write_synthetic_usernames(path: str, lines: int, length: int = 5) -> None:
+    """Write ``lines`` random alphanumeric usernames to ``path`` quickly."""
+    alphabet = b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    table = bytes(alphabet[i % len(alphabet)] for i in range(256))
+    per_chunk = 1_000_000
+    with open(path, 'wb') as f:
+        for start in range(0, lines, per_chunk):
+            count = min(per_chunk, lines - start)
+            block = os.urandom(count * length).translate(table)
+            f.write(b'\n'.join(block[i:i + length] for i in range(0, len(block), length)) + b'\n')
+
+
+def _offline_checker_class():
+    """Build a checker whose network step is replaced by a local hash lookup."""
+    from username_checker import CheckResult, UltraUsernameChecker
+
+    class OfflineChecker(UltraUsernameChecker):
+        async def check_username(self, username):
+            # Roughly the real mix: almost everything is taken
+            digest = zlib.crc32(username.lower().encode())
+            code = 0 if digest % 1000 == 0 else 2 if digest % 50 == 0 else 1
+            status = ('valid', 'taken', 'censored')[code]
+            self.result_counts[status] += 1
+            return CheckResult(username=username, status=status, code=code)
+
+    return OfflineChecker
+
+
+async def _run_pipeline(mode: str, file_path: str) -> int:
+    """Push a file through the checker pipeline in list or streaming mode."""
+    from config import Config
+
+    config = Config(result_store_path=None, taken_index_path=None, censor_model_path=None)
+    checker_class = _offline_checker_class()
+    async with checker_class(config) as checker:
+        if mode == 'stream':
+            await checker.process_stream(checker.stream_usernames(file_path), 0, lambda results: None)
+        else:
+            await checker.process_usernames(await checker.load_usernames(file_path))
+        return checker.processed_count
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB.
+
+    ``ru_maxrss`` carries over the parent's peak across fork and exec, so
+    the kernel's per-address-space high-water mark is preferred on Linux.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_pipeline_worker(args) -> Dict:
+    """Run one pipeline mode in this process and report time and peak RSS."""
+    began = time.perf_counter()
+    processed = asyncio.run(_run_pipeline(args.mode, args.file))
+    elapsed = time.perf_counter() - began
+    result = {
+        'mode': args.mode,
+        'processed': processed,
+        'seconds': elapsed,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+    print(json.dumps(result))
+    return result
+
+
+def bench_streaming(args) -> Dict:
+    """Compare peak RSS of streaming and list mode on a synthetic input file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = args.file
+        if not file_path:
+            file_path = os.path.join(tmp, 'usernames.txt')
+            print(f"📝 Writing {args.lines:,} synthetic usernames...")
+            write_synthetic_usernames(file_path, args.lines)
+
+        modes = ['stream', 'list'] if args.compare_list else ['stream']
+        rows = []
+        for mode in modes:
+            print(f"⏱️ Running {mode} mode...")
+            completed = subprocess.run(
+                [sys.executable, __file__, 'pipeline-worker', '--mode', mode, '--file', file_path],
+                capture_output=True, text=True, check=True
+            )
+            rows.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print(f"{'Mode':>8} {'Processed':>12} {'Seconds':>9} {'Names/s':>10} {'Peak RSS MB':>12}")
+    for row in rows:
+        rate = row['processed'] / row['seconds'] if row['seconds'] else 0
+        print(f"{row['mode']:>8} {row['processed']:>12,} {row['seconds']:>9.1f} {rate:>10,.0f} {row['peak_rss_mb']:>12.1f}")
+
+    return {'lines': args.lines, 'rows': rows}
+
+
+async def _legacy_save_results(path: str, rows: List) -> None:
+    """The old end-of-run CSV dump: one awaited aiofiles write per line."""
+    import aiofiles
+    async with aiofiles.open(path, 'w', encoding='utf-8') as file:
+        await file.write("Username,Status,Code,ResponseTime,ErrorMessage\n")
+        for row in rows:
+            await file.write(f"{row.username},{row.status},{row.code},{row.response_time:.3f},\n")
+
+
+def bench_sink(args) -> Dict:
+    """Measure result sink throughput and size per format against the old CSV dump."""
+    from result_sink import SINK_FORMATS, SinkRecord, open_sink
+
+    statuses = ('taken',) * 97 + ('censored', 'censored', 'valid')
+    records = [SinkRecord(f"user{i:07d}", statuses[i % len(statuses)], 1, 0.05) for i in range(args.records)]
+    batch = 250
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'legacy.csv')
+        began = time.perf_counter()
+        asyncio.run(_legacy_save_results(path, records))
+        rows.append({'format': 'legacy csv', 'seconds': time.perf_counter() - began,
+                     'bytes': os.path.getsize(path)})
+
+        for name, sink_class in SINK_FORMATS.items():
+            path = os.path.join(tmp, f"results{sink_class.extension}")
+            began = time.perf_counter()
+            with open_sink(path, name) as sink:
+                for i in range(0, len(records), batch):
+                    sink.write_records(records[i:i + batch])
+            rows.append({'format': name, 'seconds': time.perf_counter() - began,
+                         'bytes': os.path.getsize(path)})
+
+    print(f"{'Format':>12} {'Seconds':>9} {'Records/s':>12} {'Bytes/record':>13}")
+    for row in rows:
+        print(f"{row['format']:>12} {row['seconds']:>9.2f} {args.records / row['seconds']:>12,.0f} "
+              f"{row['bytes'] / args.records:>13.1f}")
+
+    return {'records': args.records, 'rows': rows}
+
+
+async def _simulated_scheduler_run(mode: str, latencies: List[float], concurrency: int, batch_size: int) -> float:
+    """Run fake requests with the given latencies; returns elapsed seconds."""
+    from worker_pool import WorkerPool
+
+    async def request(latency: float) -> float:
+        await asyncio.sleep(latency)
+        return latency
+
+    began = time.perf_counter()
+    if mode == 'gather':
+        # The old scheme: every batch waits for its slowest request
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(latency: float) -> float:
+            async with semaphore:
+                return await request(latency)
+
+        for i in range(0, len(latencies), batch_size):
+            await asyncio.gather(*(limited(latency) for latency in latencies[i:i + batch_size]))
+    else:
+        async with WorkerPool(request, concurrency) as pool:
+            for latency in latencies:
+                await pool.submit(latency, lambda _: None)
+            await pool.join()
+    return time.perf_counter() - began
+
+
+def bench_scheduler(args) -> Dict:
+    """Compare gather-per-batch against the worker pool under tail latency."""
+    import random
+
+    rng = random.Random(args.seed)
+    latencies = [args.slow_latency if rng.random() < args.slow_fraction else args.latency
+                 for _ in range(args.requests)]
+
+    rows = []
+    for mode in ('gather', 'pool'):
+        elapsed = asyncio.run(_simulated_scheduler_run(mode, latencies, args.concurrency, args.batch_size))
+        rows.append({'mode': mode, 'seconds': elapsed, 'requests_per_second': args.requests / elapsed})
+
+    # With perfect packing the run takes total latency / concurrency
+    ideal = sum(latencies) / args.concurrency
+    print(f"{'Mode':>8} {'Seconds':>9} {'Requests/s':>12} {'vs ideal':>9}")
+    for row in rows:
+        print(f"{row['mode']:>8} {row['seconds']:>9.2f} {row['requests_per_second']:>12,.0f} "
+              f"{row['seconds'] / ideal:>8.2f}x")
+
+    return {'requests': args.requests, 'concurrency': args.concurrency, 'ideal_seconds': ideal, 'rows': rows}
+
+
+async def _simulated_retry_run(mode: str, args) -> Dict:
+    """Push fake requests that sometimes fail through the pool, retrying inline or through the retry queue."""
+    import random
+    from check_engine import RetryPolicy, CheckOutcome
+    from retry_queue import RetryQueue
+    from worker_pool import RetryLater, WorkerPool
+
+    rng = random.Random(args.seed)
+    policy = RetryPolicy(max_retries=args.max_retries, retry_delay=args.retry_delay)
+    failure = CheckOutcome('error', error_kind='http_500', retryable=True)
+    retries = RetryQueue(budget=args.budget)
+    waited = 0.0  # Seconds workers spent sleeping through backoff
+    errors = 0
+
+    async def attempt() -> bool:
+        await asyncio.sleep(args.latency)
+        return rng.random() >= args.error_rate
+
+    async def inline(name: int) -> None:
+        nonlocal waited, errors
+        tries = 0
+        while not await attempt():
+            delay = policy.delay(tries, failure)
+            if delay is None:
+                errors += 1
+                return
+            waited += delay
+            await asyncio.sleep(delay)
+            tries += 1
+
+    async def deferred(job) -> None:
+        nonlocal errors
+        name, tries, first_failure = job
+        if await attempt():
+            return
+        delay = policy.delay(tries, failure)
+        if delay is not None:
+            first_failure = first_failure or retries.clock()
+            if retries.admits(delay, first_failure):
+                raise RetryLater((name, tries + 1, first_failure), delay)
+        errors += 1
+
+    began = time.perf_counter()
+    if mode == 'inline':
+        async with WorkerPool(inline, args.concurrency) as pool:
+            for name in range(args.requests):
+                await pool.submit(name, lambda _: None)
+            await pool.join()
+    else:
+        async with WorkerPool(deferred, args.concurrency, retries=retries) as pool:
+            for name in range(args.requests):
+                await pool.submit((name, 0, 0.0), lambda _: None)
+            await pool.join()
+    elapsed = time.perf_counter() - began
+    return {
+        'mode': mode,
+        'seconds': elapsed,
+        'requests_per_second': args.requests / elapsed,
+        'errors': errors,
+        'idle_worker_share': waited / (elapsed * args.concurrency),
+        'scheduled': retries.scheduled,
+        'refused': retries.refused,
+    }
+
+
+def bench_retries(args) -> Dict:
+    """Compare sleeping through backoff inside a worker against parking failed requests in the retry queue."""
+    rows = [asyncio.run(_simulated_retry_run(mode, args)) for mode in ('inline', 'deferred')]
+
+    print(f"{'Mode':>9} {'Seconds':>9} {'Requests/s':>12} {'Errors':>7} {'Idle workers':>13}")
+    for row in rows:
+        print(f"{row['mode']:>9} {row['seconds']:>9.2f} {row['requests_per_second']:>12,.0f} "
+              f"{row['errors']:>7} {row['idle_worker_share']:>12.1%}")
+
+    return {'requests': args.requests, 'concurrency': args.concurrency, 'error_rate': args.error_rate, 'rows': rows}
+
+
+async def _ui_run(headless: bool, names: int, latency: float) -> Dict:
+    """Check synthetic names with the live display or headless; measure loop lag and CPU."""
+    from config import Config
+
+    offline_class = _offline_checker_class()
+
+    class SlowOfflineChecker(offline_class):
+        async def check_username(self, username):
+            await asyncio.sleep(latency)
+            return await super().check_username(username)
+
+    lags = []
+
+    async def probe() -> None:
+        # How late a 5 ms timer fires is how long something else held the loop
+        while True:
+            began = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - began - 0.005)
+
+    config = Config(result_store_path=None, taken_index_path=None, censor_model_path=None, headless=headless)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    began = time.perf_counter()
+    probe_task = asyncio.create_task(probe())
+    async with SlowOfflineChecker(config) as checker:
+        await checker.process_usernames([f"name{i}" for i in range(names)])
+    probe_task.cancel()
+    elapsed = time.perf_counter() - began
+    after = resource.getrusage(resource.RUSAGE_SELF)
+
+    lags.sort()
+    return {
+        'mode': 'headless' if headless else 'live',
+        'seconds': elapsed,
+        'cpu_seconds': (after.ru_utime - usage.ru_utime) + (after.ru_stime - usage.ru_stime),
+        'lag_p50_ms': lags[len(lags) // 2] * 1000,
+        'lag_p99_ms': lags[int(len(lags) * 0.99)] * 1000,
+        'lag_max_ms': lags[-1] * 1000,
+    }
+
+
+def bench_ui_worker(args) -> Dict:
+    """Run one UI mode in this process and write the measurements to ``--report``."""
+    result = asyncio.run(_ui_run(args.mode == 'headless', args.names, args.latency))
+    with open(args.report, 'w') as f:
+        json.dump(result, f)
+    return result
+
+
+def bench_ui(args) -> Dict:
+    """Measure what the live display costs in CPU and event-loop lag against headless mode."""
+    import fcntl
+    import pty
+    import struct
+    import termios
+    import threading
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('live', 'headless'):
+            # Run under a pseudo-terminal so the live display draws exactly as it would for a user
+            master, slave = pty.openpty()
+            fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack('HHHH', 40, 120, 0, 0))
+            report = os.path.join(tmp, f"{mode}.json")
+            drained = [0]
+
+            def drain(fd=master, counter=drained) -> None:
+                while True:
+                    try:
+                        data = os.read(fd, 65536)
+                    except OSError:
+                        return
+                    if not data:
+                        return
+                    counter[0] += len(data)
+
+            reader = threading.Thread(target=drain, daemon=True)
+            reader.start()
+            worker = subprocess.run(
+                [sys.executable, __file__, 'ui-worker', '--mode', mode, '--names', str(args.names),
+                 '--latency', str(args.latency), '--report', report],
+                stdin=subprocess.DEVNULL, stdout=slave, stderr=slave
+            )
+            os.close(slave)
+            reader.join(timeout=5)
+            os.close(master)
+            if worker.returncode != 0:
+                raise RuntimeError(f"{mode} worker failed with exit code {worker.returncode}")
+
+            with open(report) as f:
+                row = json.load(f)
+            row['terminal_bytes'] = drained[0]
+            rows.append(row)
+
+    print(f"{'Mode':>9} {'Seconds':>8} {'CPU s':>7} {'Lag p50 ms':>11} {'Lag p99 ms':>11} "
+          f"{'Lag max ms':>11} {'Terminal KB':>12}")
+    for row in rows:
+        print(f"{row['mode']:>9} {row['seconds']:>8.2f} {row['cpu_seconds']:>7.2f} {row['lag_p50_ms']:>11.2f} "
+              f"{row['lag_p99_ms']:>11.2f} {row['lag_max_ms']:>11.2f} {row['terminal_bytes'] / 1024:>12,.0f}")
+
+    return {'names': args.names, 'latency': args.latency, 'rows': rows}
+
+
+async def _monitor_run(headless: bool, seconds: float, fail_display: bool = False) -> Dict:
+    """Drive a PerformanceMonitor with steady progress updates, then check it shut down cleanly."""
+    import contextlib
+    import threading
+    from rich.console import Console
+    from config import Config
+    from performance_monitor import PerformanceMonitor
+
+    config = Config(headless=headless, metrics_interval=1.0)
+    monitor = PerformanceMonitor(1_000_000, config)
+    devnull = open(os.devnull, 'w')
+    monitor.console = Console(file=devnull, force_terminal=True, width=120)
+    if fail_display:
+        def broken() -> None:
+            raise RuntimeError("display failed")
+        monitor._update_display = broken
+
+    counts = {'valid': 0, 'taken': 0, 'censored': 0, 'errors': 0}
+    with contextlib.redirect_stdout(devnull):
+        await monitor.start()
+        began = time.perf_counter()
+        processed = 0
+        while time.perf_counter() - began < seconds:
+            # Roughly 1000 results a second, each reported as it finishes
+            processed += 1
+            counts['taken'] += 1
+            monitor.update_progress(processed, counts)
+            await asyncio.sleep(0.001)
+        overhead = monitor.overhead
+        await monitor.stop()
+    devnull.close()
+
+    leftover_tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    samplers = [thread for thread in threading.enumerate() if thread.name == 'monitor-sampler']
+    return {
+        'mode': 'headless' if headless else 'live',
+        'broken_display': fail_display,
+        'seconds': seconds,
+        'refreshes': monitor.refreshes,
+        'refresh_errors': monitor.refresh_errors,
+        'ms_per_refresh': monitor.loop_seconds / max(1, monitor.refreshes) * 1000,
+        'overhead': overhead,
+        'leftover_tasks': len(leftover_tasks),
+        'leftover_samplers': len(samplers),
+    }
+
+
+def bench_monitor(args) -> Dict:
+    """Measure the performance monitor's event-loop overhead and check its lifecycle."""
+    rows = [asyncio.run(_monitor_run(headless, args.seconds)) for headless in (False, True)]
+    rows.append(asyncio.run(_monitor_run(False, args.seconds, fail_display=True)))
+
+    print(f"{'Mode':>9} {'Display':>8} {'Refreshes':>10} {'Errors':>7} {'ms/refresh':>11} {'Loop share':>11} {'Leaks':>6}")
+    for row in rows:
+        leaks = row['leftover_tasks'] + row['leftover_samplers']
+        print(f"{row['mode']:>9} {'broken' if row['broken_display'] else 'ok':>8} {row['refreshes']:>10} "
+              f"{row['refresh_errors']:>7} {row['ms_per_refresh']:>11.3f} {row['overhead']:>10.2%} {leaks:>6}")
+
+    for row in rows:
+        assert row['leftover_tasks'] == 0, f"{row['leftover_tasks']} monitor tasks outlived stop()"
+        assert row['leftover_samplers'] == 0, "the sampler thread outlived stop()"
+        assert row['overhead'] < args.budget, f"monitor used {row['overhead']:.2%} of the loop in {row['mode']} mode"
+    # A failing refresh must still wait out its interval instead of spinning
+    broken = rows[-1]
+    max_refreshes = args.seconds / 0.1 + 2
+    assert broken['refresh_errors'] == broken['refreshes'] <= max_refreshes, \
+        f"{broken['refreshes']} refreshes in {args.seconds}s with a broken display"
+    print(f"✅ Under the {args.budget:.0%} budget, no leaked tasks or threads, no busy loop on errors")
+    return {'budget': args.budget, 'rows': rows}
+
+
+CHECKERS = ('ultra', 'simple', 'colorful')
+
+
+def _checker_names(count: int) -> List[str]:
+    """The same synthetic usernames for every checker and every run."""
+    return [f"bench{i:06d}" for i in range(count)]
+
+
+async def _ultra_run(url: str, names: List[str]):
+    """Check ``names`` with the async checker; returns (username, code) pairs and its latency histogram."""
+    from config import Config
+    from username_checker import UltraUsernameChecker
+
+    config = Config(result_store_path=None, taken_index_path=None, censor_model_path=None, headless=True,
+                    metrics_interval=3600.0, api_url=url)
+    async with UltraUsernameChecker(config) as checker:
+        results = await checker.process_usernames(names)
+    return [(result.username, result.code) for result in results], checker.optimizer.latency.total
+
+
+def _threaded_run(checker_class, url: str, names: List[str], workers: int):
+    """Check ``names`` with a threaded checker, timing each request from the outside."""
+    import threading
+    from latency_histogram import LatencyHistogram
+
+    latency = LatencyHistogram()
+    lock = threading.Lock()
+
+    class TimedChecker(checker_class):
+        def check_username(self, username):
+            began = time.perf_counter()
+            try:
+                return super().check_username(username)
+            finally:
+                elapsed = time.perf_counter() - began
+                with lock:
+                    latency.record(elapsed)
+
+    checker = TimedChecker(max_workers=workers, headless=True, metrics_interval=3600.0, api_url=url)
+    results = checker.process_usernames(names)
+    return [(result.username, result.code) for result in results], latency
+
+
+def bench_checker_worker(args) -> Dict:
+    """Run one checker against ``--url`` in this process and write the measurements to ``--report``."""
+    names = _checker_names(args.names)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    began = time.perf_counter()
+    if args.checker == 'ultra':
+        answers, latency = asyncio.run(_ultra_run(args.url, names))
+    else:
+        if args.checker == 'simple':
+            from simple_checker import SimpleUsernameChecker as checker_class
+        else:
+            from colorful_checker import ColorfulUsernameChecker as checker_class
+        answers, latency = _threaded_run(checker_class, args.url, names, args.workers)
+    elapsed = time.perf_counter() - began
+    after = resource.getrusage(resource.RUSAGE_SELF)
+
+    result = {
+        'checker': args.checker,
+        'names': len(names),
+        'answers': dict(answers),
+        'seconds': elapsed,
+        'throughput_rps': len(answers) / elapsed if elapsed > 0 else 0.0,
+        'cpu_seconds': (after.ru_utime - usage.ru_utime) + (after.ru_stime - usage.ru_stime),
+        'peak_rss_mb': _peak_rss_mb(),
+        'latency': latency.summary(),
+    }
+    with open(args.report, 'w') as f:
+        json.dump(result, f)
+    return result
+
+
+def _build_info() -> Dict:
+    """Where a set of results came from, so runs can be compared across versions."""
+    import platform
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def _run_checkers(args, settings) -> List[Dict]:
+    """Run each of ``args.checkers`` in its own process against a fresh mock API."""
+    from mock_api import MockValidateApi, expected_code
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for checker in args.checkers:
+            # A fresh server per checker, so counters and the rate limit start from scratch
+            with MockValidateApi(settings) as api:
+                report = os.path.join(tmp, f"{checker}.json")
+                worker = subprocess.run(
+                    [sys.executable, __file__, 'checker-worker', '--checker', checker, '--url', api.url,
+                     '--names', str(args.names), '--workers', str(args.workers), '--report', report],
+                    stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL
+                )
+                server = api.stats.to_record()
+            if worker.returncode != 0:
+                raise RuntimeError(f"{checker} worker failed with exit code {worker.returncode}")
+
+            with open(report) as f:
+                row = json.load(f)
+            answers = row.pop('answers')
+            row['failed'] = sum(1 for code in answers.values() if code not in (0, 1, 2))
+            row['wrong'] = sum(1 for username, code in answers.items()
+                               if code in (0, 1, 2) and code != expected_code(username, settings))
+            row['server'] = server
+            rows.append(row)
+    return rows
+
+
+def _print_checker_rows(rows: List[Dict]) -> None:
+    print(f"{'Checker':>9} {'Seconds':>8} {'Names/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'CPU s':>7} "
+          f"{'RSS MB':>7} {'429s':>6} {'Failed':>7} {'Wrong':>6}")
+    for row in rows:
+        print(f"{row['checker']:>9} {row['seconds']:>8.2f} {row['throughput_rps']:>8.1f} "
+              f"{row['latency']['p50_ms']:>8.1f} {row['latency']['p99_ms']:>8.1f} {row['cpu_seconds']:>7.2f} "
+              f"{row['peak_rss_mb']:>7.1f} {row['server']['throttled']:>6} {row['failed']:>7} {row['wrong']:>6}")
+
+
+def bench_checkers(args) -> Dict:
+    """Run every checker against the local mock API: throughput, latency, CPU and peak RSS."""
+    from dataclasses import asdict
+    from mock_api import settings_from_args
+
+    settings = settings_from_args(args)
+    rows = _run_checkers(args, settings)
+    _print_checker_rows(rows)
+
+    for row in rows:
+        assert row['wrong'] == 0, f"{row['checker']} reported {row['wrong']} names differently from the mock"
+    return {'build': _build_info(), 'mock': asdict(settings), 'names': args.names, 'rows': rows}
+
+
+def bench_parity(args) -> Dict:
+    """Check that every front-end sends the same request and reaches the same answers."""
+    from dataclasses import asdict
+    from mock_api import settings_from_args
+
+    # A misbehaving server: every front-end has to retry its way to the right answers
+    settings = settings_from_args(args)
+    rows = _run_checkers(args, settings)
+    _print_checker_rows(rows)
+
+    formats = {row['checker']: row['server']['query_formats'] for row in rows}
+    print(f"🔗 Query formats seen by the mock: {formats}")
+    for row in rows:
+        assert list(row['server']['query_formats']) == ['Birthday&Username'], \
+            f"{row['checker']} sent {row['server']['query_formats']}"
+        assert row['wrong'] == 0, f"{row['checker']} reported {row['wrong']} names differently from the mock"
+        assert row['failed'] <= args.names * args.max_failed, \
+            f"{row['checker']} gave up on {row['failed']} names despite retries"
+    print("✅ Every front-end sent the same request and agreed with the mock on every answered name")
+    return {'build': _build_info(), 'mock': asdict(settings), 'names': args.names, 'rows': rows}
+
+
+# Dependencies that only a run making requests or drawing the live display needs
+HEAVY_MODULES = ('aiohttp', 'requests', 'rich', 'psutil', 'aiofiles')
+
+
+def _import_profile(command: List[str], env: Dict[str, str], cwd: str) -> Dict:
+    """Run ``command`` under ``-X importtime``; returns wall time and what it imported."""
+    began = time.perf_counter()
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + command, env=env, cwd=cwd,
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - began
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} exited with {process.returncode}")
+
+    import_us = 0
+    modules = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules.add(name.strip())
+        # Top-level imports carry no indentation; their cumulative times add up to the total
+        if not name[1:].startswith(' '):
+            import_us += int(cumulative)
+    return {'seconds': elapsed, 'import_seconds': import_us / 1e6, 'modules': len(modules),
+            'heavy': sorted(module for module in HEAVY_MODULES if module in modules)}
+
+
+def bench_importtime(args) -> Dict:
+    """Measure startup cost of the entry points with ``-X importtime``, and what each one loads."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = os.path.join(tmp, 'usernames.txt')
+        write_synthetic_usernames(input_file, args.names)
+        env = dict(os.environ, INPUT_FILE=input_file, RESULT_STORE='', TAKEN_INDEX='', CENSOR_MODEL='')
+        scenarios = {
+            'main --help': [os.path.join(here, 'main.py'), '--help'],
+            'main --dry-run': [os.path.join(here, 'main.py'), '--dry-run'],
+            'simple --help': [os.path.join(here, 'simple_checker.py'), '--help'],
+            'import username_checker': ['-c', 'import username_checker'],
+            'import simple_checker': ['-c', 'import simple_checker'],
+        }
+
+        rows = []
+        for scenario, command in scenarios.items():
+            # The fastest of several runs, to keep disk-cache noise out
+            runs = [_import_profile(command, env, here) for _ in range(args.repeat)]
+            best = min(runs, key=lambda run: run['seconds'])
+            rows.append(dict(best, scenario=scenario))
+
+    print(f"{'Scenario':>24} {'Wall ms':>8} {'Import ms':>10} {'Modules':>8}  Heavy modules loaded")
+    for row in rows:
+        print(f"{row['scenario']:>24} {row['seconds'] * 1000:>8.1f} {row['import_seconds'] * 1000:>10.1f} "
+              f"{row['modules']:>8}  {', '.join(row['heavy']) or '-'}")
+
+    for row in rows:
+        if row['scenario'].startswith('main'):
+            assert not row['heavy'], f"{row['scenario']} loaded {row['heavy']}"
+    return {'build': _build_info(), 'rows': rows}
+
+
+def bench_histogram(args) -> Dict:
+    """Check the latency histogram's percentile error, recording cost and memory."""
+    import random
+    from latency_histogram import REPORTED_PERCENTILES, LatencyHistogram
+
+    rng = random.Random(args.seed)
+    # Log-normal around 50 ms with a long tail, like real API latencies
+    samples = [rng.lognormvariate(-3.0, 1.0) for _ in range(args.samples)]
+
+    histogram = LatencyHistogram()
+    began = time.perf_counter()
+    for sample in samples:
+        histogram.record(sample)
+    record_us = (time.perf_counter() - began) / args.samples * 1e6
+
+    exact = sorted(samples)
+    rows = []
+    for percent, value in histogram.percentiles().items():
+        truth = exact[min(len(exact) - 1, int(len(exact) * percent / 100))]
+        rows.append({'percentile': percent, 'exact_ms': truth * 1000, 'histogram_ms': value * 1000,
+                     'error': (value - truth) / truth})
+
+    print(f"{'Percentile':>10} {'Exact ms':>10} {'Histogram ms':>13} {'Error':>8}")
+    for row in rows:
+        print(f"{row['percentile']:>10g} {row['exact_ms']:>10.2f} {row['histogram_ms']:>13.2f} {row['error']:>8.2%}")
+    memory_kb = histogram.counts.itemsize * len(histogram.counts) / 1024
+    print(f"📏 {len(histogram.counts):,} buckets, {memory_kb:.0f} KB regardless of sample count; "
+          f"{record_us:.2f} us per record")
+
+    worst = max(abs(row['error']) for row in rows)
+    assert worst < 0.01, f"percentile error {worst:.2%} exceeds 1%"
+    assert [row['percentile'] for row in rows] == list(REPORTED_PERCENTILES)
+    return {'samples': args.samples, 'record_us': record_us, 'memory_kb': memory_kb, 'rows': rows}
+
+
+def bench_results(args) -> Dict:
+    """Measure memory per result for the old result shapes and the compact ResultTable."""
+    import gc
+    import random
+    import tracemalloc
+    from dataclasses import dataclass
+    from typing import Optional
+    from colorama import Fore
+    from result_model import CheckResult, ResultTable
+
+    @dataclass
+    class LegacyCheckResult:
+        username: str
+        status: str
+        code: Optional[int] = None
+        error_message: Optional[str] = None
+        response_time: float = 0.0
+
+    rng = random.Random(args.seed)
+    usernames = [f"user{i:07d}" for i in range(args.results)]
+    codes = [0 if rng.random() < 0.02 else 1 for _ in range(args.results)]
+    statuses = ('valid', 'taken')
+
+    def legacy_dicts():
+        # The colorful checker's shape, with its per-result ANSI label
+        return [{'username': username, 'status': statuses[code].upper(), 'code': code,
+                 'color': Fore.GREEN + f"✅ {statuses[code].upper()}", 'display_color': Fore.GREEN}
+                for username, code in zip(usernames, codes)]
+
+    def legacy_dataclasses():
+        return [LegacyCheckResult(username, statuses[code], code, None, i / 1e7)
+                for i, (username, code) in enumerate(zip(usernames, codes))]
+
+    def slotted():
+        return [CheckResult(username, statuses[code], code, None, i / 1e7)
+                for i, (username, code) in enumerate(zip(usernames, codes))]
+
+    def table():
+        results = ResultTable()
+        for i, (username, code) in enumerate(zip(usernames, codes)):
+            results.append(CheckResult(username, statuses[code], code, None, i / 1e7))
+        return results
+
+    rows = []
+    for name, build in (('dicts + ANSI', legacy_dicts), ('dataclass', legacy_dataclasses),
+                        ('slotted', slotted), ('ResultTable', table)):
+        gc.collect()
+        tracemalloc.start()
+        began = time.perf_counter()
+        results = build()
+        seconds = time.perf_counter() - began
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(results) == args.results
+        rows.append({'shape': name, 'bytes_per_result': size / args.results, 'total_mb': size / 1024 / 1024,
+                     'build_seconds': seconds})
+        del results
+
+    print(f"Username strings are shared by every shape and not counted ({args.results:,} results)")
+    print(f"{'Shape':>14} {'Bytes/result':>13} {'Total MB':>9} {'Build s':>8}")
+    for row in rows:
+        print(f"{row['shape']:>14} {row['bytes_per_result']:>13.1f} {row['total_mb']:>9.1f} {row['build_seconds']:>8.2f}")
+    return {'results': args.results, 'rows': rows}
+
+
+def _legacy_generate_username(rng) -> str:
+    """The per-name generator this module replaced: a random lambda, a ``choices`` call per run of characters."""
+    import string
+    letters, lower, upper, digits = string.ascii_letters, string.ascii_lowercase, string.ascii_uppercase, string.digits
+    patterns = [
+        lambda: ''.join(rng.choices(letters, k=5)),
+        lambda: ''.join(rng.choices(letters, k=5)),
+        lambda: ''.join(rng.choices(letters, k=5)),
+        lambda: ''.join(rng.choices(lower, k=5)),
+        lambda: ''.join(rng.choices(lower, k=5)),
+        lambda: ''.join(rng.choices(upper, k=5)),
+        lambda: rng.choice(upper) + ''.join(rng.choices(lower, k=4)),
+        lambda: rng.choice(upper) + ''.join(rng.choices(lower, k=4)),
+        lambda: ''.join(rng.choices(lower, k=2)) + rng.choice(upper) + ''.join(rng.choices(lower, k=2)),
+        lambda: ''.join(rng.choices(upper, k=2)) + ''.join(rng.choices(lower, k=3)),
+        lambda: ''.join(rng.choices(lower, k=3)) + ''.join(rng.choices(upper, k=2)),
+        lambda: ''.join(rng.choices(lower, k=4)) + rng.choice(digits),
+        lambda: ''.join(rng.choices(lower, k=3)) + ''.join(rng.choices(digits, k=2)),
+        lambda: ''.join(rng.choices(letters, k=2)) + ''.join(rng.choices(digits, k=3)),
+        lambda: rng.choice(upper) + ''.join(rng.choices(lower, k=2)) + ''.join(rng.choices(digits, k=2)),
+        lambda: ''.join(rng.choices(upper, k=2)) + ''.join(rng.choices(lower, k=2)) + rng.choice(digits),
+        lambda: rng.choice(digits) + ''.join(rng.choices(letters, k=4)),
+        lambda: ''.join(rng.choices(letters, k=3)) + ''.join(rng.choices(digits, k=2)),
+        lambda: rng.choice(digits) + ''.join(rng.choices(lower, k=3)) + rng.choice(digits),
+        lambda: ''.join(rng.choices(letters + digits, k=5)),
+        lambda: rng.choice('ABCDEFG') + ''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=4)),
+        lambda: ''.join(rng.choices('abcdefghijklmnopqr', k=3)) + ''.join(rng.choices('0123456789', k=2)),
+        lambda: ''.join(rng.choices('ABCDEFGHIJK', k=2)) + ''.join(rng.choices('abcdefghijklm', k=3)),
+        lambda: rng.choice('123456789') + ''.join(rng.choices('ABCDEFGHIJabcdefghij', k=4)),
+        lambda: ''.join(rng.choices('abcdefghijk', k=2)) + rng.choice('0123456789') + ''.join(rng.choices('lmnopqrstuvwxyz', k=2)),
+    ]
+    return rng.choice(patterns)()
+
+
+def bench_generator(args) -> Dict:
+    """Compare the compiled pattern generator against the old per-name generator."""
+    import random
+    from username_patterns import PatternGenerator, default_patterns, load_patterns
+    from username_rules import partition_usernames
+
+    patterns = load_patterns(args.patterns) if args.patterns else default_patterns()
+    rows = []
+
+    rng = random.Random(args.seed)
+    legacy_names = args.legacy_names or args.names
+    began = time.perf_counter()
+    legacy = [_legacy_generate_username(rng) for _ in range(legacy_names)]
+    elapsed = time.perf_counter() - began
+    rows.append({'generator': 'legacy', 'names': legacy_names, 'seconds': elapsed})
+    del legacy
+
+    generator = PatternGenerator(patterns, args.seed)
+    began = time.perf_counter()
+    generated = 0
+    for names in generator.batches(args.names, args.batch_size):
+        generated += len(names)
+        sample = names
+    elapsed = time.perf_counter() - began
+    rows.append({'generator': 'patterns', 'names': generated, 'seconds': elapsed})
+
+    generator = PatternGenerator(patterns, args.seed)
+    began = time.perf_counter()
+    written = 0
+    with open(os.devnull, 'wb') as devnull:
+        for start in range(0, args.names, args.batch_size):
+            written += devnull.write(generator.generate_block(min(args.batch_size, args.names - start)))
+    elapsed = time.perf_counter() - began
+    rows.append({'generator': 'patterns-bytes', 'names': args.names, 'seconds': elapsed})
+
+    print(f"{'Generator':>15} {'Names':>12} {'Seconds':>9} {'Names/s':>13}")
+    for row in rows:
+        row['names_per_second'] = row['names'] / row['seconds']
+        print(f"{row['generator']:>15} {row['names']:>12,} {row['seconds']:>9.2f} {row['names_per_second']:>13,.0f}")
+
+    # Every name has to get past the local rule engine, in the weighted mix asked for
+    possible, invalid = partition_usernames(sample)
+    assert not invalid, f"generated names the rule engine rejects, e.g. {invalid[:3]}"
+    total = sum(pattern.weight for pattern in patterns)
+    mix = {pattern.source: pattern.weight / total for pattern in patterns}
+    print(f"✅ {len(sample):,} sampled names all pass the rule engine; "
+          f"speedup {rows[1]['names_per_second'] / rows[0]['names_per_second']:.0f}x")
+    return {'build': _build_info(), 'mix': mix, 'rows': rows}
+
+
+def _legacy_unique_usernames(generator, count: int) -> List[str]:
+    """Draw random names until ``count`` are unique or ``count * 5`` have been drawn, as before the sampler."""
+    usernames = {}
+    attempts = 0
+    while len(usernames) < count and attempts < count * 5:
+        size = min(1 << 16, count * 5 - attempts)
+        text = generator.generate_block(size).decode('ascii')
+        names = text.split('\n')
+        names.pop()
+        usernames.update(zip(text.lower().split('\n'), names))
+        attempts += size
+    return list(usernames.values())[:count]
+
+
+def bench_sampler(args) -> Dict:
+    """Compare retry-until-unique generation against the keyspace sampler as the count nears the keyspace size."""
+    import itertools
+    import tracemalloc
+    from keyspace_sampler import KeyspaceSampler
+    from username_patterns import PatternGenerator, compile_pattern
+
+    pattern = compile_pattern(args.pattern)
+    sampler = KeyspaceSampler([pattern], args.seed)
+    keyspace = sampler.size
+    rows = []
+    for fraction in args.fractions:
+        count = int(keyspace * fraction)
+        for mode in ('retry', 'sampler'):
+            def run() -> int:
+                if mode == 'retry':
+                    return len(_legacy_unique_usernames(PatternGenerator([pattern], args.seed), count))
+                # Streamed, as a pipe into the checker would take them
+                return sum(1 for _ in itertools.islice(sampler.iter_names(), count))
+
+            began = time.perf_counter()
+            returned = run()
+            elapsed = time.perf_counter() - began
+            # Timed and traced separately; tracing slows the sampler's many small allocations down a lot
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows.append({'mode': mode, 'fraction': fraction, 'requested': count, 'returned': returned,
+                         'seconds': elapsed, 'peak_mb': peak / 1e6})
+
+    print(f"Keyspace of {args.pattern!r}: {keyspace:,} names")
+    print(f"{'Mode':>8} {'Fraction':>9} {'Requested':>10} {'Returned':>10} {'Seconds':>8} {'Peak MB':>8}")
+    for row in rows:
+        print(f"{row['mode']:>8} {row['fraction']:>9.0%} {row['requested']:>10,} {row['returned']:>10,} "
+              f"{row['seconds']:>8.2f} {row['peak_mb']:>8.1f}")
+
+    # Resuming and sharding must neither repeat nor skip a name
+    whole, end = sampler.sample(keyspace)
+    first, offset = sampler.sample(keyspace // 3)
+    rest, _ = sampler.sample(keyspace, offset)
+    assert first + rest == whole
+    middle = sampler.end // 2
+    shards = [name for _, name in sampler.iter_names(0, middle)] + [name for _, name in sampler.iter_names(middle)]
+    assert shards == whole and len({name.lower() for name in whole}) == keyspace
+    print(f"✅ Sampler covered all {keyspace:,} names once; resumed and sharded walks matched the single walk")
+    return {'pattern': args.pattern, 'keyspace': keyspace, 'rows': rows}
+
+
+def _time_to_first_request(commands: List[List[str]], env: Dict[str, str], cwd: str, timeout: float) -> float:
+    """Run ``commands`` one after another against a fresh mock; seconds until the mock saw a request."""
+    from mock_api import MockValidateApi, MockApiSettings
+
+    with MockValidateApi(MockApiSettings()) as api:
+        env = dict(env, API_URL=api.url)
+        began = time.perf_counter()
+        for number, command in enumerate(commands):
+            process = subprocess.Popen([sys.executable] + command, env=env, cwd=cwd,
+                                       stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            # Earlier commands prepare the input and run to completion; the last one is stopped at its first request
+            if number < len(commands) - 1:
+                if process.wait() != 0:
+                    raise RuntimeError(f"{' '.join(command)} exited with {process.returncode}")
+                continue
+            try:
+                while api.stats.first_request_at is None:
+                    if process.poll() is not None or time.perf_counter() - began > timeout:
+                        raise RuntimeError(f"{' '.join(command)} sent no request")
+                    time.sleep(0.001)
+            finally:
+                process.kill()
+                process.wait()
+        return api.stats.first_request_at - began
+
+
+def bench_pipe(args) -> Dict:
+    """Time from launch to the first request: generate a file then check it, or check straight from the generator."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    main_py = os.path.join(here, 'main.py')
+    simple_py = os.path.join(here, 'simple_checker.py')
+    generator_py = os.path.join(here, 'username_generator.py')
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, INPUT_FILE=os.path.join(tmp, 'usernames.txt'), OUTPUT_FILE=os.path.join(tmp, 'out.csv'),
+                   RESULT_STORE='', TAKEN_INDEX='', CENSOR_MODEL='', HEADLESS='true')
+        for count in args.counts:
+            generate = [generator_py, '--count', str(count), '--seed', str(args.seed)]
+            spec = f"generate:count={count},seed={args.seed}"
+            scenarios = {
+                'main, file': [generate, [main_py]],
+                'main, --source': [[main_py, '--source', spec]],
+                'simple, file': [generate, [simple_py, '--headless', '--threads', '50']],
+                'simple, --source': [[simple_py, '--headless', '--threads', '50', '--source', spec]],
+            }
+            for scenario, commands in scenarios.items():
+                seconds = min(_time_to_first_request(commands, env, tmp, args.timeout) for _ in range(args.repeat))
+                rows.append({'scenario': scenario, 'names': count, 'seconds': seconds})
+
+    print(f"{'Scenario':>18} {'Names':>10} {'First request ms':>17}")
+    for row in rows:
+        print(f"{row['scenario']:>18} {row['names']:>10,} {row['seconds'] * 1000:>17.1f}")
+    return {'build': _build_info(), 'rows': rows}
+
+
+def bench_taken(args) -> Dict:
+    """Compare the known-taken index with the result store: file size, open time and lookups."""
+    import random
+    from keyspace_sampler import KeyspaceSampler
+    from result_store import ResultStore
+    from taken_index import TakenIndex, _key, _probes
+    from username_patterns import default_patterns
+
+    sampler = KeyspaceSampler(default_patterns(), args.seed)
+    taken, offset = sampler.sample(args.names)
+    unseen, _ = sampler.sample(args.lookups, offset)
+    rng = random.Random(args.seed)
+    seen = rng.sample(taken, args.lookups)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, 'taken.idx')
+        began = time.perf_counter()
+        with TakenIndex(index_path) as index:
+            for username in taken:
+                index.add(username)
+        build = time.perf_counter() - began
+
+        store_path = os.path.join(tmp, 'results.db')
+        began = time.perf_counter()
+        store = ResultStore(store_path, {'taken': float('inf')}, flush_every=50_000)
+        for username in taken:
+            store.record(username, 'taken', 1)
+        store.close()
+        store_build = time.perf_counter() - began
+
+        for kind in ('index', 'store'):
+            began = time.perf_counter()
+            if kind == 'index':
+                lookup = TakenIndex(index_path)
+                opened = time.perf_counter() - began
+                found = lambda names: len(lookup.partition(names)[1])
+            else:
+                lookup = ResultStore(store_path, {'taken': float('inf')})
+                opened = time.perf_counter() - began
+                found = lambda names: len(lookup.lookup_many(names))
+            row = {'kind': kind, 'names': len(taken), 'build_seconds': build if kind == 'index' else store_build,
+                   'bytes': os.path.getsize(index_path if kind == 'index' else store_path), 'open_ms': opened * 1000}
+            for label, names in (('hit', seen), ('miss', unseen)):
+                began = time.perf_counter()
+                hits = found(names)
+                row[f'{label}_us'] = (time.perf_counter() - began) / len(names) * 1e6
+                assert hits == (len(names) if label == 'hit' else 0), f"{kind} found {hits} of {len(names)} {label}s"
+            lookup.close()
+            rows.append(row)
+
+        # Share of unknown names the filter lets through to the binary search
+        index = TakenIndex(index_path)
+        bloom, bits = index._filter, index._bits
+        passed = sum(all(bloom[bit >> 3] >> (bit & 7) & 1 for bit in _probes(_key(name), index.hashes, bits))
+                     for name in unseen)
+        index.close()
+
+    print(f"{len(taken):,} taken names, {args.lookups:,} lookups each of known and unknown names")
+    print(f"{'Kind':>6} {'Build s':>8} {'Bytes/name':>11} {'Open ms':>8} {'Hit us':>7} {'Miss us':>8}")
+    for row in rows:
+        print(f"{row['kind']:>6} {row['build_seconds']:>8.2f} {row['bytes'] / row['names']:>11.1f} "
+              f"{row['open_ms']:>8.1f} {row['hit_us']:>7.2f} {row['miss_us']:>8.2f}")
+    false_positives = passed / len(unseen)
+    print(f"🔍 Filter false positives: {false_positives:.2%}")
+    return {'build': _build_info(), 'rows': rows, 'false_positive_rate': false_positives}
+
+
+def bench_censor(args) -> Dict:
+    """Mine a censor filter from mock answers, then measure the requests it saves and how often it is wrong."""
+    from censor_filter import CensorFilter, mine_rules
+    from keyspace_sampler import KeyspaceSampler
+    from mock_api import MockApiSettings, expected_code
+    from username_patterns import default_patterns
+
+    settings = MockApiSettings(censored_fraction=args.censored_fraction,
+                               blocked_fragments=tuple(fragment.lower() for fragment in args.blocked))
+    sampler = KeyspaceSampler(default_patterns(), args.seed)
+    train, offset = sampler.sample(args.train)
+    test, _ = sampler.sample(args.test, offset)
+    censored = [name for name in train if expected_code(name, settings) == 2]
+    accepted = [name for name in train if expected_code(name, settings) != 2]
+
+    began = time.perf_counter()
+    rules = mine_rules(censored, accepted, args.min_support, args.threshold)
+    mine_seconds = time.perf_counter() - began
+    censor = CensorFilter(rules, args.threshold, args.audit_rate)
+    print(f"⛏️ {len(censored):,} censored of {len(train):,} training names: {len(rules):,} rules "
+          f"in {mine_seconds:.2f}s, {censor.matcher.states:,} automaton states")
+    print(f"   Rules: {', '.join(sorted(rule.fragment for rule in rules)) or 'none'}")
+
+    # Every test name is 'sent' unless skipped, and the mock's answer scores the filter as the checkers would
+    to_check, skipped = censor.partition(test)
+    for name in to_check:
+        censor.record(name, {0: 'valid', 1: 'taken', 2: 'censored'}[expected_code(name, settings)])
+    truly_censored = sum(1 for name in test if expected_code(name, settings) == 2)
+    wrong = sum(1 for name in skipped if expected_code(name, settings) != 2)
+    caught = len(skipped) - wrong
+    print(censor.summary())
+    print(f"🎯 {len(test):,} test names, {truly_censored:,} censored: {len(skipped):,} skipped "
+          f"({len(skipped) / len(test):.2%} of requests), {wrong:,} wrongly, "
+          f"{caught / truly_censored if truly_censored else 0:.1%} of censored names caught")
+
+    # One pass through the automaton against testing every fragment against every name
+    confident = [rule for rule in rules if rule.confidence >= args.threshold]
+    timings = {}
+    for kind in ('automaton', 'scan'):
+        began = time.perf_counter()
+        if kind == 'automaton':
+            matches = [censor.predict(name) for name in test]
+        else:
+            matches = [max((rule for rule in confident if rule.fragment in name.lower()),
+                           key=lambda rule: rule.confidence, default=None) for name in test]
+        timings[kind] = (time.perf_counter() - began) / len(test) * 1e6
+        if kind == 'automaton':
+            expected = matches
+        else:
+            assert [bool(match) for match in matches] == [bool(match) for match in expected], \
+                "automaton and scan disagree"
+    print(f"⚡ Per name: automaton {timings['automaton']:.2f} us, scan of {len(confident):,} fragments "
+          f"{timings['scan']:.2f} us")
+
+    assert wrong <= len(skipped) * (1 - args.threshold) + 1, f"{wrong} of {len(skipped)} skipped names weren't censored"
+    return {'build': _build_info(), 'rules': len(rules), 'states': censor.matcher.states,
+            'mine_seconds': mine_seconds, 'test_names': len(test), 'censored': truly_censored,
+            'skipped': len(skipped), 'wrong': wrong, 'caught': caught, 'audited': censor.audited,
+            'audited_wrong': censor.wrong, 'missed': censor.missed, 'per_name_us': timings}
+
+
+def _legacy_progress_counts(results: List[Dict]) -> Dict[str, int]:
+    """The old display: rebuild the status counts from the whole results list."""
+    counts = {'VALID': 0, 'TAKEN': 0, 'CENSORED': 0, 'INVALID_FORMAT': 0, 'ERROR': 0}
+    for result in results:
+        status = result['status']
+        if status in counts:
+            counts[status] += 1
+        elif status.startswith('UNKNOWN'):
+            counts['ERROR'] += 1
+    return counts
+
+
+def bench_progress(args) -> Dict:
+    """Compare per-result UI bookkeeping: full rescans against running counters."""
+    import random
+    from live_progress import ProgressCounters
+    from result_model import CheckResult
+
+    rng = random.Random(args.seed)
+    rows = []
+    for size in args.sizes:
+        results = [CheckResult(f"user{i}", 'valid' if rng.random() < args.valid_fraction else 'taken')
+                   for i in range(size)]
+        legacy_results = [{'username': result.username, 'status': result.status.upper()} for result in results]
+
+        # The old loop redrew every ``redraw_every`` results and on every valid hit
+        began = time.perf_counter()
+        seen = []
+        redraws = 0
+        for i, result in enumerate(legacy_results):
+            seen.append(result)
+            if i % args.redraw_every == 0 or result['status'] == 'VALID':
+                _legacy_progress_counts(seen)
+                redraws += 1
+        legacy = time.perf_counter() - began
+
+        began = time.perf_counter()
+        counters = ProgressCounters(size)
+        for i, result in enumerate(results):
+            counters.add(result)
+            if i % args.redraw_every == 0:
+                counters.snapshot()
+        counted = time.perf_counter() - began
+
+        rows.append({'results': size, 'legacy_redraws': redraws, 'legacy_seconds': legacy,
+                     'counters_seconds': counted})
+
+    print(f"{'Results':>10} {'Redraws':>9} {'Rescan us/result':>17} {'Counters us/result':>19}")
+    for row in rows:
+        print(f"{row['results']:>10,} {row['legacy_redraws']:>9,} "
+              f"{row['legacy_seconds'] / row['results'] * 1e6:>17.2f} "
+              f"{row['counters_seconds'] / row['results'] * 1e6:>19.2f}")
+
+    return {'rows': rows}
+
+
+class _CountingStream:
+    """Write target that only counts what it is given."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text.encode('utf-8'))
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return True
+
+
+def bench_render(args) -> Dict:
+    """Compare clear-and-reprint redraws against the differential terminal renderer."""
+    from live_progress import ProgressSnapshot
+    from simple_checker import SimpleUsernameChecker
+    from colorful_checker import ColorfulUsernameChecker
+    from terminal_renderer import TerminalRenderer
+
+    total = args.frames * 1000
+    snapshots = []
+    for frame in range(1, args.frames + 1):
+        processed = frame * 1000
+        valid = [f"user{i}" for i in range(frame // 10)]
+        snapshots.append(ProgressSnapshot(
+            processed=processed, total=total, elapsed=frame * 0.5,
+            counts={'VALID': len(valid), 'TAKEN': processed - len(valid), 'CENSORED': 0,
+                    'INVALID_FORMAT': 0, 'ERROR': 0},
+            valid_count=len(valid), first_valid=valid[:15], last_valid=valid[-10:]
+        ))
+
+    rows = []
+    for checker_class in (SimpleUsernameChecker, ColorfulUsernameChecker):
+        for mode in ('clear', 'diff'):
+            checker = checker_class(max_workers=1)
+            stream = _CountingStream()
+            checker.renderer = TerminalRenderer(stream, max_fps=0, enabled=True)
+
+            began = time.perf_counter()
+            for snapshot in snapshots:
+                if mode == 'clear':
+                    # The old redraw: fork a shell to clear, then print every line again
+                    os.system('clear > /dev/null 2>&1')
+                    checker.renderer.clear()
+                checker.display_progress(snapshot)
+            elapsed = time.perf_counter() - began
+
+            rows.append({'checker': checker_class.__name__, 'mode': mode, 'frames': args.frames,
+                         'ms_per_frame': elapsed / args.frames * 1000,
+                         'bytes_per_frame': stream.bytes / args.frames})
+
+    print(f"{'Checker':>24} {'Mode':>6} {'ms/frame':>9} {'bytes/frame':>12}")
+    for row in rows:
+        print(f"{row['checker']:>24} {row['mode']:>6} {row['ms_per_frame']:>9.3f} {row['bytes_per_frame']:>12,.0f}")
+
+    return {'rows': rows}
+
+
+class _SimulatedRateLimitedApi:
+    """Server-side token bucket that answers 429 with a whole-second Retry-After once it runs dry."""
+
+    def __init__(self, rate: float, burst: float, latency: float):
+        self.rate = rate
+        self.burst = burst
+        self.latency = latency
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.throttled = 0
+
+    async def request(self):
+        await asyncio.sleep(self.latency)
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 200, {}
+        self.throttled += 1
+        retry_after = max(1, int((1 - self.tokens) / self.rate + 0.999))
+        return 429, {'Retry-After': str(retry_after)}
+
+
+async def _simulated_pacing_run(mode: str, args) -> Dict:
+    """Push ``args.requests`` fake checks at a rate-limited API; returns the outcome."""
+    from rate_limiter import TokenBucketPacer
+    from worker_pool import WorkerPool
+
+    api = _SimulatedRateLimitedApi(args.server_rps, args.server_burst, args.latency)
+    pacer = TokenBucketPacer(args.max_rps, args.burst, args.min_rps)
+    failures = 0
+
+    async def check(_) -> None:
+        nonlocal failures
+        for attempt in range(args.max_retries + 1):
+            if mode == 'pacer':
+                await pacer.wait()
+            status, headers = await api.request()
+            if mode == 'pacer':
+                pacer.observe(status, headers)
+            if status != 429:
+                return
+            if mode == 'legacy' and attempt < args.max_retries:
+                # The old scheme: sleep off the 429 while holding the slot
+                await asyncio.sleep(args.retry_delay * (2 ** attempt))
+        failures += 1
+
+    began = time.perf_counter()
+    async with WorkerPool(check, args.concurrency) as pool:
+        for i in range(args.requests):
+            await pool.submit(i, lambda _: None)
+        await pool.join()
+    elapsed = time.perf_counter() - began
+    return {'mode': mode, 'seconds': elapsed, 'throttled': api.throttled, 'failures': failures,
+            'requests_per_second': (args.requests - failures) / elapsed}
+
+
+def bench_pacer(args) -> Dict:
+    """Compare sleep-and-retry against the token-bucket pacer against a rate-limited API."""
+    rows = [asyncio.run(_simulated_pacing_run(mode, args)) for mode in ('legacy', 'pacer')]
+
+    ideal = max(0.0, args.requests - args.server_burst) / args.server_rps
+    print(f"{'Mode':>8} {'Seconds':>9} {'Checks/s':>10} {'429s':>7} {'Failed':>7} {'vs ideal':>9}")
+    for row in rows:
+        print(f"{row['mode']:>8} {row['seconds']:>9.2f} {row['requests_per_second']:>10,.0f} "
+              f"{row['throttled']:>7,} {row['failures']:>7,} {row['seconds'] / ideal:>8.2f}x")
+
+    return {'requests': args.requests, 'server_rps': args.server_rps, 'ideal_seconds': ideal, 'rows': rows}
+
+
+class _LegacySemaphoreLimiter:
+    """The old scheme: recreate the semaphore on every resize and poke ``_value``."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self) -> None:
+        await self.semaphore.acquire()
+
+    def release(self) -> None:
+        self.semaphore.release()
+
+    def resize(self, limit: int) -> None:
+        self.limit = limit
+        current_value = self.semaphore._value
+        self.semaphore = asyncio.Semaphore(limit)
+        for _ in range(min(current_value, limit)):
+            self.semaphore._value -= 1
+
+
+async def _limiter_storm(limiter, tasks: int, duration: float, max_limit: int, seed: int) -> Dict:
+    """Hammer a limiter with acquires, resizes and cancellations; count cap violations."""
+    import random
+
+    rng = random.Random(seed)
+    state = {'holders': 0, 'violations': 0, 'worst_overshoot': 0, 'mismatches': 0, 'grants': 0}
+    exact = hasattr(limiter, 'in_flight')
+    stopping = False
+    # Shrinking can't revoke held permits, so that much overshoot is allowed until it drains
+    allowed = 0
+
+    def overshoot() -> int:
+        return (limiter.in_flight if exact else state['holders']) - limiter.limit
+
+    async def client() -> None:
+        nonlocal allowed
+        while not stopping:
+            await limiter.acquire()
+            try:
+                state['holders'] += 1
+                state['grants'] += 1
+                if overshoot() > allowed:
+                    state['violations'] += 1
+                    state['worst_overshoot'] = max(state['worst_overshoot'], overshoot())
+                # Granted permits whose holder hasn't resumed yet are counted too
+                if exact and limiter.in_flight < state['holders']:
+                    state['mismatches'] += 1
+                await asyncio.sleep(rng.random() * 0.002)
+            finally:
+                state['holders'] -= 1
+                limiter.release()
+                allowed = min(allowed, max(0, overshoot()))
+
+    async def resizer() -> None:
+        nonlocal allowed
+        while True:
+            limiter.resize(rng.randint(1, max_limit))
+            allowed = max(0, overshoot())
+            await asyncio.sleep(rng.random() * 0.001)
+
+    async def canceller() -> None:
+        # Cancel clients at random and replace them, so permits get handed to dead waiters
+        while True:
+            await asyncio.sleep(rng.random() * 0.005)
+            index = rng.randrange(len(workers))
+            workers[index].cancel()
+            workers[index] = asyncio.create_task(client())
+
+    workers = [asyncio.create_task(client()) for _ in range(tasks)]
+    background = [asyncio.create_task(resizer()), asyncio.create_task(canceller())]
+    await asyncio.sleep(duration)
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+
+    # Let everyone drain at the final limit; clients still waiting after that are stuck
+    stopping = True
+    done, stuck = await asyncio.wait(workers, timeout=2.0)
+    for task in stuck:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+    state['stuck'] = len(stuck)
+    state['leaked_permits'] = limiter.in_flight if exact else None
+    return state
+
+
+def bench_limiter(args) -> Dict:
+    """Stress the concurrency limiter under resize storms and assert the cap holds."""
+    from rate_limiter import ConcurrencyLimiter
+
+    rows = []
+    for name, limiter_class in (('legacy', _LegacySemaphoreLimiter), ('limiter', ConcurrencyLimiter)):
+        state = asyncio.run(_limiter_storm(limiter_class(args.max_limit), args.tasks, args.seconds,
+                                           args.max_limit, args.seed))
+        state['name'] = name
+        rows.append(state)
+
+    print(f"{'Limiter':>8} {'Grants':>9} {'Over cap':>9} {'Worst':>6} {'Count drift':>12} {'Stuck':>6} {'Leaked':>7}")
+    for row in rows:
+        leaked = '-' if row['leaked_permits'] is None else row['leaked_permits']
+        print(f"{row['name']:>8} {row['grants']:>9,} {row['violations']:>9,} {row['worst_overshoot']:>6} "
+              f"{row['mismatches']:>12,} {row['stuck']:>6} {leaked:>7}")
+
+    limiter = rows[-1]
+    assert limiter['violations'] == 0, f"cap exceeded {limiter['violations']} times"
+    assert limiter['mismatches'] == 0, "in_flight drifted from the real number of holders"
+    assert limiter['stuck'] == 0, f"{limiter['stuck']} waiters never got a permit"
+    assert limiter['leaked_permits'] == 0, f"{limiter['leaked_permits']} permits leaked"
+    print("✅ Cap never exceeded and in-flight count stayed exact")
+    return {'rows': rows}
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'cache': bench_cache,
+    'streaming': bench_streaming,
+    'pipeline-worker': bench_pipeline_worker,
+    'sink': bench_sink,
+    'scheduler': bench_scheduler,
+    'retries': bench_retries,
+    'limiter': bench_limiter,
+    'pacer': bench_pacer,
+    'progress': bench_progress,
+    'render': bench_render,
+    'ui': bench_ui,
+    'ui-worker': bench_ui_worker,
+    'monitor': bench_monitor,
+    'histogram': bench_histogram,
+    'checkers': bench_checkers,
+    'checker-worker': bench_checker_worker,
+    'parity': bench_parity,
+    'results': bench_results,
+    'importtime': bench_importtime,
+    'generator': bench_generator,
+    'sampler': bench_sampler,
+    'pipe': bench_pipe,
+    'taken': bench_taken,
+    'censor': bench_censor,
+}
+
+
+def main(argv=None) -> int:
+    """Parse arguments and run the selected benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--json', metavar='FILE', help="also write raw results to FILE")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    cache_parser = subparsers.add_parser('cache', help=bench_cache.__doc__)
+    cache_parser.add_argument('--capacity', type=int, default=10000)
+
+    streaming_parser = subparsers.add_parser('streaming', help=bench_streaming.__doc__)
+    streaming_parser.add_argument('--lines', type=int, default=10_000_000)
+    streaming_parser.add_argument('--file', help="use an existing username file instead of a synthetic one")
+    streaming_parser.add_argument('--compare-list', action='store_true',
+                                  help="also run list mode (needs memory proportional to the file)")
+
+    worker_parser = subparsers.add_parser('pipeline-worker', help=bench_pipeline_worker.__doc__)
+    worker_parser.add_argument('--mode', choices=['stream', 'list'], required=True)
+    worker_parser.add_argument('--file', required=True)
+
+    sink_parser = subparsers.add_parser('sink', help=bench_sink.__doc__)
+    sink_parser.add_argument('--records', type=int, default=200_000)
+
+    scheduler_parser = subparsers.add_parser('scheduler', help=bench_scheduler.__doc__)
+    scheduler_parser.add_argument('--requests', type=int, default=10_000)
+    scheduler_parser.add_argument('--concurrency', type=int, default=100)
+    scheduler_parser.add_argument('--batch-size', type=int, default=250)
+    scheduler_parser.add_argument('--latency', type=float, default=0.05, help="typical request latency")
+    scheduler_parser.add_argument('--slow-latency', type=float, default=2.0, help="latency of the slow tail")
+    scheduler_parser.add_argument('--slow-fraction', type=float, default=0.01)
+    scheduler_parser.add_argument('--seed', type=int, default=1)
+
+    retries_parser = subparsers.add_parser('retries', help=bench_retries.__doc__)
+    retries_parser.add_argument('--requests', type=int, default=10_000)
+    retries_parser.add_argument('--concurrency', type=int, default=100)
+    retries_parser.add_argument('--latency', type=float, default=0.05, help="request latency")
+    retries_parser.add_argument('--error-rate', type=float, default=0.2, help="share of attempts that fail")
+    retries_parser.add_argument('--max-retries', type=int, default=3)
+    retries_parser.add_argument('--retry-delay', type=float, default=0.5)
+    retries_parser.add_argument('--budget', type=float, default=30.0, help="retry queue time budget")
+    retries_parser.add_argument('--seed', type=int, default=1)
+
+    limiter_parser = subparsers.add_parser('limiter', help=bench_limiter.__doc__)
+    limiter_parser.add_argument('--tasks', type=int, default=500)
+    limiter_parser.add_argument('--seconds', type=float, default=3.0)
+    limiter_parser.add_argument('--max-limit', type=int, default=50)
+    limiter_parser.add_argument('--seed', type=int, default=1)
+
+    pacer_parser = subparsers.add_parser('pacer', help=bench_pacer.__doc__)
+    pacer_parser.add_argument('--requests', type=int, default=5000)
+    pacer_parser.add_argument('--concurrency', type=int, default=100)
+    pacer_parser.add_argument('--latency', type=float, default=0.05)
+    pacer_parser.add_argument('--server-rps', type=float, default=300.0, help="rate the simulated API allows")
+    pacer_parser.add_argument('--server-burst', type=float, default=50.0)
+    pacer_parser.add_argument('--max-rps', type=float, default=1000.0, help="pacer ceiling")
+    pacer_parser.add_argument('--min-rps', type=float, default=2.0)
+    pacer_parser.add_argument('--burst', type=float, default=20.0, help="pacer burst")
+    pacer_parser.add_argument('--max-retries', type=int, default=3)
+    pacer_parser.add_argument('--retry-delay', type=float, default=0.1)
+
+    progress_parser = subparsers.add_parser('progress', help=bench_progress.__doc__)
+    progress_parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 50_000, 200_000])
+    progress_parser.add_argument('--valid-fraction', type=float, default=0.002)
+    progress_parser.add_argument('--redraw-every', type=int, default=500,
+                                 help="results between timed redraws (about 0.5 s of work)")
+    progress_parser.add_argument('--seed', type=int, default=1)
+
+    render_parser = subparsers.add_parser('render', help=bench_render.__doc__)
+    render_parser.add_argument('--frames', type=int, default=300)
+
+    ui_parser = subparsers.add_parser('ui', help=bench_ui.__doc__)
+    ui_parser.add_argument('--names', type=int, default=30_000)
+    ui_parser.add_argument('--latency', type=float, default=0.05, help="simulated request latency")
+
+    ui_worker_parser = subparsers.add_parser('ui-worker', help=bench_ui_worker.__doc__)
+    ui_worker_parser.add_argument('--mode', choices=['live', 'headless'], required=True)
+    ui_worker_parser.add_argument('--names', type=int, required=True)
+    ui_worker_parser.add_argument('--latency', type=float, required=True)
+    ui_worker_parser.add_argument('--report', required=True)
+
+    monitor_parser = subparsers.add_parser('monitor', help=bench_monitor.__doc__)
+    monitor_parser.add_argument('--seconds', type=float, default=5.0)
+    monitor_parser.add_argument('--budget', type=float, default=0.01, help="allowed share of event-loop time")
+
+    histogram_parser = subparsers.add_parser('histogram', help=bench_histogram.__doc__)
+    histogram_parser.add_argument('--samples', type=int, default=1_000_000)
+    histogram_parser.add_argument('--seed', type=int, default=1)
+
+    checkers_parser = subparsers.add_parser('checkers', help=bench_checkers.__doc__)
+    parity_parser = subparsers.add_parser('parity', help=bench_parity.__doc__)
+    for mock_parser, names, error_rate, rate_limit in ((checkers_parser, 2000, 0.0, 0.0),
+                                                       (parity_parser, 1000, 0.05, 400.0)):
+        mock_parser.add_argument('--checkers', nargs='+', choices=CHECKERS, default=list(CHECKERS))
+        mock_parser.add_argument('--names', type=int, default=names)
+        mock_parser.add_argument('--workers', type=int, default=50, help="threads for the threaded checkers")
+        mock_parser.add_argument('--latency', type=float, default=0.05, help="median mock response time")
+        mock_parser.add_argument('--latency-sigma', type=float, default=0.5)
+        mock_parser.add_argument('--valid-fraction', type=float, default=0.02)
+        mock_parser.add_argument('--censored-fraction', type=float, default=0.01)
+        mock_parser.add_argument('--blocked', nargs='*', default=[], metavar='FRAGMENT',
+                                 help="censor every name containing one of these fragments")
+        mock_parser.add_argument('--error-rate', type=float, default=error_rate, help="share of HTTP 500 answers")
+        mock_parser.add_argument('--rate-limit', type=float, default=rate_limit,
+                                 help="mock requests per second (0 = no 429s)")
+        mock_parser.add_argument('--rate-burst', type=float, default=50.0)
+        mock_parser.add_argument('--retry-after', type=float, default=1.0)
+        mock_parser.add_argument('--seed', type=int, default=1)
+    parity_parser.add_argument('--max-failed', type=float, default=0.001,
+                               help="share of names allowed to fail after every retry")
+
+    checker_worker_parser = subparsers.add_parser('checker-worker', help=bench_checker_worker.__doc__)
+    checker_worker_parser.add_argument('--checker', choices=CHECKERS, required=True)
+    checker_worker_parser.add_argument('--url', required=True)
+    checker_worker_parser.add_argument('--names', type=int, required=True)
+    checker_worker_parser.add_argument('--workers', type=int, default=50)
+    checker_worker_parser.add_argument('--report', required=True)
+
+    results_parser = subparsers.add_parser('results', help=bench_results.__doc__)
+    results_parser.add_argument('--results', type=int, default=1_000_000)
+    results_parser.add_argument('--seed', type=int, default=1)
+
+    importtime_parser = subparsers.add_parser('importtime', help=bench_importtime.__doc__)
+    importtime_parser.add_argument('--names', type=int, default=10_000, help="usernames in the dry-run input")
+    importtime_parser.add_argument('--repeat', type=int, default=5)
+
+    generator_parser = subparsers.add_parser('generator', help=bench_generator.__doc__)
+    generator_parser.add_argument('--names', type=int, default=10_000_000)
+    generator_parser.add_argument('--legacy-names', type=int, help="names for the old generator (default: --names)")
+    generator_parser.add_argument('--batch-size', type=int, default=1 << 16)
+    generator_parser.add_argument('--patterns', metavar='FILE', help="patterns file (default: the built-in mix)")
+    generator_parser.add_argument('--seed', type=int, default=1)
+
+    sampler_parser = subparsers.add_parser('sampler', help=bench_sampler.__doc__)
+    sampler_parser.add_argument('--pattern', default='[a-k]{2}d[l-z]{2}')
+    sampler_parser.add_argument('--fractions', type=float, nargs='+', default=[0.5, 0.9, 1.0],
+                                help="requested names as a share of the keyspace")
+    sampler_parser.add_argument('--seed', type=int, default=1)
+
+    pipe_parser = subparsers.add_parser('pipe', help=bench_pipe.__doc__)
+    pipe_parser.add_argument('--counts', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    pipe_parser.add_argument('--repeat', type=int, default=3)
+    pipe_parser.add_argument('--timeout', type=float, default=120.0)
+    pipe_parser.add_argument('--seed', type=int, default=1)
+
+    taken_parser = subparsers.add_parser('taken', help=bench_taken.__doc__)
+    taken_parser.add_argument('--names', type=int, default=1_000_000, help="taken names in the index and the store")
+    taken_parser.add_argument('--lookups', type=int, default=100_000)
+    taken_parser.add_argument('--seed', type=int, default=1)
+
+    censor_parser = subparsers.add_parser('censor', help=bench_censor.__doc__)
+    censor_parser.add_argument('--train', type=int, default=300_000, help="names whose mock answers are mined")
+    censor_parser.add_argument('--test', type=int, default=100_000, help="names the mined filter is scored on")
+    censor_parser.add_argument('--blocked', nargs='+', default=['ass', 'sex', 'fuk', 'xxx', 'wtf', 'kkk'],
+                               metavar='FRAGMENT', help="fragments the mock censors")
+    censor_parser.add_argument('--censored-fraction', type=float, default=0.01,
+                               help="share of names censored at random, which no rule can explain")
+    censor_parser.add_argument('--min-support', type=int, default=3)
+    censor_parser.add_argument('--threshold', type=float, default=0.95)
+    censor_parser.add_argument('--audit-rate', type=float, default=0.05)
+    censor_parser.add_argument('--seed', type=int, default=1)
+
+    args = parser.parse_args(argv)
+    try:
+        result = BENCHMARKS[args.benchmark](args)
+    except AssertionError as e:
+        # The checks double as regression tests, so a failed one must fail the command
+        print(f"❌ {args.benchmark} check failed: {e}")
+        return 1
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({args.benchmark: result}, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
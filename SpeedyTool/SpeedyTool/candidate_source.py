@@ -0,0 +1,210 @@
+"""Lazy sources of usernames to check: a file, standard input or the pattern generator.
+
+A source is named by a spec string:
+
+- ``-`` reads names from standard input, one per line;
+- ``generate:count=N[,patterns=FILE][,seed=S][,offset=O][,state=FILE]``
+  walks the keyspace sampler for ``N`` unique names; with ``state`` the
+  seed and offset are picked up from, and saved back to, that file, so
+  successive runs never see the same name twice, and an interrupted run
+  carries on from the first name it had not finished;
+- anything else is a path to a file with one name per line.
+
+Names are produced as they are pulled, so a checker can start on the
+first batch while the rest are still being generated or read, and the
+whole list never has to exist at once.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from itertools import islice
+from typing import AsyncIterator, Callable, Container, Deque, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, TypeVar
+
+from keyspace_sampler import KeyspaceSampler, load_state, save_state
+from username_patterns import default_patterns, load_patterns
+
+R = TypeVar('R')
+C = TypeVar('C')
+
+STDIN = '-'
+GENERATE_PREFIX = 'generate:'
+# Generated names the saved offset may trail by; older unfinished ones are given up on
+MAX_LAG = 10_000
+
+
+def read_names(stream: TextIO) -> Iterator[str]:
+    """Yield stripped, non-blank lines from a text stream."""
+    for line in stream:
+        name = line.strip()
+        if name:
+            yield name
+
+
+class CandidateSource:
+    """An iterable of usernames opened from a spec; see the module docstring."""
+
+    def __init__(self, spec: str, taken: Optional[Container[str]] = None):
+        self.spec = spec
+        self.taken = taken  # Names the generator passes over, e.g. a TakenIndex
+        self.count: Optional[int] = None  # Known up front only for generated names
+        self.sampler: Optional[KeyspaceSampler] = None
+        self._next = 0  # Sampler offset of the next name to generate
+        # Generated names not finished yet, by sampler offset, oldest first
+        self._in_flight: Dict[str, int] = {}
+        self._pulled: Deque[Tuple[int, str]] = deque()
+        self._done: Set[int] = set()
+        self.max_lag = MAX_LAG
+        self.abandoned = 0  # Names passed by the saved offset without being finished
+        self._lock = threading.Lock()  # Names may be pulled on one thread and finished on another
+        self._state_path: Optional[str] = None
+        self._patterns = None
+        self._file: Optional[TextIO] = None
+
+        if spec.startswith(GENERATE_PREFIX):
+            self._open_generator(spec[len(GENERATE_PREFIX):])
+        elif spec != STDIN and not os.path.isfile(spec):
+            raise FileNotFoundError(f"File '{spec}' not found")
+
+    @property
+    def offset(self) -> int:
+        """Sampler offset to carry on from: the oldest generated name not finished yet.
+
+        Names finished after it are generated and answered again (by the
+        result store, when there is one) rather than risk skipping it. It
+        trails the generator by at most ``max_lag`` names, so one name that
+        never finishes can't hold it back, or grow the bookkeeping, forever.
+        """
+        with self._lock:
+            return self._pulled[0][0] if self._pulled else self._next
+
+    def finished(self, usernames: Iterable[str]) -> None:
+        """Mark generated names as answered, so a saved offset can move past them."""
+        with self._lock:
+            for username in usernames:
+                offset = self._in_flight.pop(username, None)
+                if offset is not None:
+                    self._done.add(offset)
+            self._trim()
+
+    def _trim(self) -> None:
+        """Drop finished names off the front, and unfinished ones lagging more than ``max_lag``."""
+        pulled = self._pulled
+        while pulled and (pulled[0][0] in self._done or len(pulled) > self.max_lag):
+            offset, name = pulled.popleft()
+            if offset in self._done:
+                self._done.remove(offset)
+            else:
+                del self._in_flight[name]
+                self.abandoned += 1
+
+    @property
+    def uses_stdin(self) -> bool:
+        """Whether names come from standard input, which then can't answer prompts."""
+        return self.spec == STDIN
+
+    def _open_generator(self, options: str) -> None:
+        settings: Dict[str, str] = {}
+        for option in filter(None, options.split(',')):
+            key, sep, value = option.partition('=')
+            if not sep or key not in ('count', 'patterns', 'seed', 'offset', 'state'):
+                raise ValueError(f"Unknown generator option {option!r} in {self.spec!r}")
+            settings[key] = value
+        if 'count' not in settings:
+            raise ValueError(f"Generator source needs a count, e.g. '{GENERATE_PREFIX}count=20000'")
+
+        self.count = int(settings['count'])
+        self._patterns = load_patterns(settings['patterns']) if 'patterns' in settings else default_patterns()
+        self._state_path = settings.get('state')
+        state = load_state(self._state_path, self._patterns) if self._state_path else None
+        seed = int(settings['seed']) if 'seed' in settings else state['seed'] if state else random.randrange(1 << 32)
+        self._next = int(settings['offset']) if 'offset' in settings else state['offset'] if state else 0
+        self.sampler = KeyspaceSampler(self._patterns, seed)
+
+    def __iter__(self) -> Iterator[str]:
+        if self.sampler is not None:
+            return self._generate()
+        if self.spec == STDIN:
+            return read_names(sys.stdin)
+        self._file = open(self.spec, 'r', encoding='utf-8')
+        return read_names(self._file)
+
+    def _generate(self) -> Iterator[str]:
+        remaining = self.count
+        for offset, name in self.sampler.iter_names(self._next):
+            if not remaining:
+                break
+            with self._lock:
+                self._next = offset + 1
+                if self.taken is not None and name in self.taken:
+                    continue
+                # Held back as the saved offset until the checker calls finished()
+                self._in_flight[name] = offset
+                self._pulled.append((offset, name))
+                self._trim()
+            remaining -= 1
+            yield name
+
+    def close(self) -> None:
+        """Release the input file and remember how far the generator got."""
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self.sampler is not None and self._state_path:
+            save_state(self._state_path, self._patterns, self.sampler.seed, self.offset)
+
+    def __enter__(self) -> 'CandidateSource':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+async def pull_async(names: Iterable[str], batch_size: int = 250) -> AsyncIterator[str]:
+    """Iterate ``names`` from an event loop, pulling each batch in a worker thread.
+
+    Reading standard input or generating names then never blocks the loop,
+    and nothing is pulled until the consumer asks for it.
+    """
+    iterator = iter(names)
+    while True:
+        batch = await asyncio.to_thread(lambda: list(islice(iterator, batch_size)))
+        if not batch:
+            return
+        for name in batch:
+            yield name
+
+
+def check_batches(executor: Executor, names: Iterable[str], check: Callable[[str], R],
+                  prepare: Callable[[List[str]], Tuple[Iterable[str], C]], on_done: Callable[[R, C], None],
+                  window: int, batch_size: int = 250) -> None:
+    """Check names from ``names`` on ``executor``, pulling a batch only when there's room for it.
+
+    Each batch of raw names goes through ``prepare``, which returns the
+    ones that still need a request plus a context handed back with each of
+    their results. At most about ``window`` checks are queued or running,
+    so a slow API holds the source back instead of the whole input piling
+    up as futures. ``on_done`` runs on the calling thread, in completion
+    order.
+    """
+    iterator = iter(names)
+    pending: Dict[Future, C] = {}
+    exhausted = False
+    while not exhausted or pending:
+        while not exhausted and len(pending) < window:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                exhausted = True
+                break
+            to_check, context = prepare(batch)
+            for name in to_check:
+                pending[executor.submit(check, name)] = context
+        if not pending:
+            continue
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            on_done(future.result(), pending.pop(future))
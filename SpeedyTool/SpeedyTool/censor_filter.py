@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""A local guess at which usernames the API would reject as inappropriate (code 2).
+
+Most censored answers are explained by a small set of blocked fragments.
+``mine_rules`` counts, for every substring of ``MIN_FRAGMENT`` to
+``MAX_FRAGMENT`` characters of a censored name, how many censored and how
+many accepted (valid or taken) names contain it. A fragment seen in enough
+censored names becomes a rule whose confidence is the smoothed share of
+the names containing it that were censored. A rule is dropped when a
+shorter one inside it is at least as confident, since that one already
+catches every name it would.
+
+``CensorFilter`` compiles the confident rules into an Aho-Corasick
+automaton, so a name is matched against all of them in one pass over its
+characters. Names it predicts censored are answered locally instead of
+costing a request, except for an ``audit_rate`` share, picked by a hash of
+the name, that is still checked to keep measuring how often it is wrong.
+"""
+
+import argparse
+import json
+import os
+import sys
+import zlib
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from username_pipeline import canonical_username
+
+MIN_FRAGMENT = 3
+MAX_FRAGMENT = 6
+DEFAULT_MIN_SUPPORT = 3  # Censored names a fragment needs before it can become a rule
+DEFAULT_THRESHOLD = 0.95  # Confidence a rule needs before names matching it are skipped
+MODEL_VERSION = 1
+
+
+class FragmentRule(NamedTuple):
+    """A fragment and how many censored and accepted names contained it."""
+    fragment: str
+    censored: int
+    accepted: int
+
+    @property
+    def confidence(self) -> float:
+        """Share of names containing the fragment that were censored, smoothed towards 1/2."""
+        return (self.censored + 1) / (self.censored + self.accepted + 2)
+
+
+def fragments(username: str) -> Set[str]:
+    """Every distinct substring of ``username`` a rule could be made of, casefolded."""
+    name = canonical_username(username)
+    return {name[start:start + length]
+            for length in range(MIN_FRAGMENT, MAX_FRAGMENT + 1)
+            for start in range(len(name) - length + 1)}
+
+
+def mine_rules(censored: Iterable[str], accepted: Iterable[str], min_support: int = DEFAULT_MIN_SUPPORT,
+               threshold: float = DEFAULT_THRESHOLD) -> List[FragmentRule]:
+    """Rules at least ``threshold`` confident, from censored and accepted usernames."""
+    counts: Dict[str, List[int]] = {}
+    for username in censored:
+        for fragment in fragments(username):
+            counts.setdefault(fragment, [0, 0])[0] += 1
+    # Only fragments with enough support are worth counting in the (far more numerous) accepted names
+    counts = {fragment: count for fragment, count in counts.items() if count[0] >= min_support}
+    for username in accepted:
+        for fragment in fragments(username):
+            count = counts.get(fragment)
+            if count is not None:
+                count[1] += 1
+
+    rules = [FragmentRule(fragment, *count) for fragment, count in counts.items()]
+    kept: Dict[str, FragmentRule] = {}
+    for rule in sorted(rules, key=lambda rule: (len(rule.fragment), rule.fragment)):
+        if rule.confidence < threshold:
+            continue
+        inner = (kept.get(fragment) for fragment in fragments(rule.fragment) if fragment != rule.fragment)
+        if not any(other and other.confidence >= rule.confidence for other in inner):
+            kept[rule.fragment] = rule
+    return list(kept.values())
+
+
+class FragmentMatcher:
+    """Aho-Corasick automaton over rule fragments, compiled to a full transition table.
+
+    Each state's table already folds in its failure links, so matching
+    takes one dict lookup per character and never backtracks. A state
+    remembers the most confident rule ending there or at any suffix of it.
+    """
+
+    def __init__(self, rules: Iterable[FragmentRule]):
+        children: List[Dict[str, int]] = [{}]
+        self._best: List[Optional[FragmentRule]] = [None]
+        for rule in rules:
+            state = 0
+            for char in rule.fragment:
+                child = children[state].get(char)
+                if child is None:
+                    child = children[state][char] = len(children)
+                    children.append({})
+                    self._best.append(None)
+                state = child
+            if self._best[state] is None or rule.confidence > self._best[state].confidence:
+                self._best[state] = rule
+
+        # Breadth first, so a state's failure target is finished before the state itself
+        self._table: List[Dict[str, int]] = [{} for _ in children]
+        self._table[0] = dict(children[0])
+        failure = [0] * len(children)
+        queue = deque(children[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = failure[state]
+            table = dict(self._table[fallback])
+            for char, child in children[state].items():
+                failure[child] = self._table[fallback].get(char, 0)
+                table[char] = child
+                queue.append(child)
+            self._table[state] = table
+            inherited = self._best[fallback]
+            if inherited is not None and (self._best[state] is None
+                                          or inherited.confidence > self._best[state].confidence):
+                self._best[state] = inherited
+        self._confidence = [rule.confidence if rule else 0.0 for rule in self._best]
+
+    @property
+    def states(self) -> int:
+        return len(self._table)
+
+    def match(self, username: str) -> Optional[FragmentRule]:
+        """The most confident rule whose fragment occurs in ``username``, if any."""
+        table, confidence = self._table, self._confidence
+        state = best = 0
+        for char in canonical_username(username):
+            state = table[state].get(char, 0)
+            if confidence[state] > confidence[best]:
+                best = state
+        return self._best[best]
+
+
+class CensorFilter:
+    """Skip names a mined rule says are almost certainly censored, and keep score."""
+
+    def __init__(self, rules: List[FragmentRule], threshold: float = DEFAULT_THRESHOLD,
+                 audit_rate: float = 0.05, path: Optional[str] = None, history: Optional[Dict[str, int]] = None):
+        self.rules = rules
+        self.threshold = threshold
+        self.audit_rate = audit_rate
+        self.path = path
+        self.matcher = FragmentMatcher(rule for rule in rules if rule.confidence >= threshold)
+        # Totals from earlier runs with these rules, folded in by ``close``
+        self.history = dict.fromkeys(('skipped', 'audited', 'wrong', 'missed'), 0)
+        self.history.update(history or {})
+
+        # Statistics for this run
+        self.skipped = 0  # Requests saved
+        self.audited = 0  # Predicted censored but checked anyway
+        self.wrong = 0  # ...and answered valid or taken
+        self.missed = 0  # Answered censored without being predicted
+        self._closed = False
+
+    @classmethod
+    def load(cls, path: str, audit_rate: float = 0.05) -> 'CensorFilter':
+        """Read a model written by ``save``."""
+        with open(path, 'r') as f:
+            model = json.load(f)
+        if model.get('version') != MODEL_VERSION:
+            raise ValueError(f"'{path}' is not a censor model this version understands")
+        rules = [FragmentRule(fragment, censored, accepted) for fragment, censored, accepted in model['rules']]
+        return cls(rules, model['threshold'], audit_rate, path, model.get('history'))
+
+    @classmethod
+    def from_config(cls, config) -> Optional['CensorFilter']:
+        """Load the model configured in ``config``, or None if it is disabled or hasn't been mined yet."""
+        if not config.censor_model_path or not os.path.exists(config.censor_model_path):
+            return None
+        return cls.load(config.censor_model_path, config.censor_audit_rate)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the rules and running totals, replacing the file atomically."""
+        path = path or self.path
+        model = {
+            'version': MODEL_VERSION,
+            'threshold': self.threshold,
+            'history': self.history,
+            'rules': [list(rule) for rule in sorted(self.rules, key=lambda rule: -rule.confidence)],
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(model, f, indent=1)
+        os.replace(tmp_path, path)
+
+    def predict(self, username: str) -> Optional[FragmentRule]:
+        """The rule that makes ``username`` probably censored, or None."""
+        return self.matcher.match(username)
+
+    def _audits(self, username: str) -> bool:
+        # Picked by name rather than at random, so the generator and the checkers agree
+        return zlib.crc32(canonical_username(username).encode()) % 10_000 < self.audit_rate * 10_000
+
+    def __contains__(self, username: str) -> bool:
+        return self.predict(username) is not None and not self._audits(username)
+
+    def partition(self, usernames: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Split usernames into (to check, predicted censored); audited names stay in the first list."""
+        to_check = []
+        skipped = []
+        for username in usernames:
+            (skipped if username in self else to_check).append(username)
+        self.skipped += len(skipped)
+        return to_check, skipped
+
+    def record(self, username: str, status: str) -> None:
+        """Score the filter against an answer from the API."""
+        status = status.lower()
+        if status not in ('valid', 'taken', 'censored'):
+            return
+        if self.predict(username) is not None:
+            self.audited += 1
+            if status != 'censored':
+                self.wrong += 1
+        elif status == 'censored':
+            self.missed += 1
+
+    def summary(self) -> str:
+        """One line on what the filter saved and how often it was wrong this run."""
+        line = f"🧠 Censor filter: {self.skipped:,} requests saved"
+        if self.audited:
+            rate = self.wrong / self.audited
+            line += (f"; {self.wrong:,} of {self.audited:,} audited predictions wrong ({rate:.1%}), "
+                     f"so ~{round(self.skipped * rate):,} skipped names may not be censored")
+        if self.missed:
+            line += f"; {self.missed:,} censored names not predicted"
+        return line
+
+    def close(self) -> None:
+        """Add this run's totals to the model's history; they stay readable for ``summary``."""
+        if self._closed:
+            return
+        self._closed = True
+        run = {'skipped': self.skipped, 'audited': self.audited, 'wrong': self.wrong, 'missed': self.missed}
+        if self.path and any(run.values()):
+            for key, value in run.items():
+                self.history[key] += value
+            self.save()
+
+    def __enter__(self) -> 'CensorFilter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Mine and inspect the model of probably-censored usernames.")
+    parser.add_argument('--model', metavar='FILE', default=os.getenv('CENSOR_MODEL') or 'censor_model.json',
+                        help="the model to work on (default: $CENSOR_MODEL, else censor_model.json)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    mine_parser = commands.add_parser('mine', help="learn rules from every answer in the result store")
+    mine_parser.add_argument('--store', metavar='FILE', default=os.getenv('RESULT_STORE') or 'results.db')
+    mine_parser.add_argument('--taken-index', metavar='FILE', default=os.getenv('TAKEN_INDEX', 'taken.idx'),
+                             help="also count the names in this index as accepted ('' to leave it out)")
+    mine_parser.add_argument('--min-support', type=int, default=DEFAULT_MIN_SUPPORT)
+    mine_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    commands.add_parser('stats', help="show the most confident rules and how the filter has done so far")
+    check_parser = commands.add_parser('check', help="tell whether names would be skipped")
+    check_parser.add_argument('usernames', nargs='+')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Entry point."""
+    args = parse_args(argv)
+    if args.command == 'mine':
+        from result_store import ResultStore
+        from taken_index import TakenIndex
+
+        if not os.path.exists(args.store):
+            print(f"❌ Error: result store '{args.store}' not found")
+            return 1
+        store = ResultStore(args.store, {})
+        try:
+            censored = store.usernames_with('censored')
+            accepted = set(store.usernames_with('valid')) | set(store.usernames_with('taken'))
+        finally:
+            store.close()
+        if args.taken_index and os.path.exists(args.taken_index):
+            with TakenIndex(args.taken_index) as taken:
+                accepted.update(taken)
+
+        rules = mine_rules(censored, accepted, args.min_support, args.threshold)
+        CensorFilter(rules, args.threshold, path=args.model).save()
+        print(f"⛏️ Mined {len(censored):,} censored and {len(accepted):,} accepted names")
+        print(f"💾 {len(rules):,} rules at {args.threshold:.0%} confidence or more written to {args.model}")
+        return 0
+
+    try:
+        censor = CensorFilter.load(args.model)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    if args.command == 'check':
+        for username in args.usernames:
+            rule = censor.predict(username)
+            print(f"{username}: " + (f"probably censored ('{rule.fragment}', {rule.confidence:.1%})"
+                                     if rule else "no rule matches"))
+        return 0
+
+    history = censor.history
+    print(f"📊 {args.model}: {len(censor.rules):,} rules, {censor.matcher.states:,} automaton states")
+    for rule in sorted(censor.rules, key=lambda rule: -rule.confidence)[:10]:
+        print(f"   • {rule.fragment:<8} {rule.confidence:>6.1%}  ({rule.censored:,} censored, {rule.accepted:,} accepted)")
+    print(f"🧠 So far: {history['skipped']:,} requests saved, {history['wrong']:,} of {history['audited']:,} "
+          f"audited predictions wrong, {history['missed']:,} censored names not predicted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""The request, classification and retry logic shared by every checker front-end.
+
+``aiohttp`` and ``requests`` are imported by the engine that uses them, so
+the threaded checkers never load the async client and the other way round.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional, Tuple, Type
+
+import ujson
+
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
+
+from latency_histogram import RequestLatency
+from rate_limiter import parse_retry_after
+from ttl_cache import TTLCache
+from username_pipeline import canonical_username
+
+STATUS_BY_CODE = {0: 'valid', 1: 'taken', 2: 'censored'}
+
+
+def build_url(api_url: str, username: str, birthday: str) -> str:
+    """The validate request for ``username``; every front-end sends exactly this."""
+    return f"{api_url}?Username={username}&Birthday={birthday}"
+
+
+@dataclass
+class CheckOutcome:
+    """What the API said about one username."""
+    status: str  # 'valid', 'taken', 'censored' or 'error'
+    code: Optional[int] = None
+    error: Optional[str] = None
+    error_kind: Optional[str] = None  # Failed request, e.g. 'timeout' or 'http_500'; None if the API answered
+    retryable: bool = False
+    retry_after: Optional[float] = None
+    response_time: float = 0.0
+    attempts: int = 1
+
+
+def classify_response(http_status: int, payload: Any,
+                      headers: Optional[Mapping[str, str]] = None) -> CheckOutcome:
+    """Turn an HTTP status and decoded JSON body (None if it didn't parse) into an outcome."""
+    if http_status == 429:
+        retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+        return CheckOutcome('error', error="HTTP 429", error_kind='429_rate_limit',
+                            retryable=True, retry_after=retry_after)
+    if http_status != 200:
+        # Server errors are usually transient; other client errors will fail the same way again
+        return CheckOutcome('error', error=f"HTTP {http_status}", error_kind=f"http_{http_status}",
+                            retryable=http_status >= 500)
+    if not isinstance(payload, dict):
+        return CheckOutcome('error', error="Response was not a JSON object", error_kind='json_error', retryable=True)
+
+    code = payload.get('code')
+    status = STATUS_BY_CODE.get(code)
+    if status is None:
+        # A real answer, just not one we know; asking again won't change it
+        return CheckOutcome('error', code=code, error=f"Unexpected code {code}")
+    return CheckOutcome(status, code=code)
+
+
+def classify_exception(error: Exception,
+                       timeouts: Tuple[Type[BaseException], ...] = (asyncio.TimeoutError,)) -> CheckOutcome:
+    """Outcome for a request that never got a response; ``timeouts`` are the client's timeout errors."""
+    if isinstance(error, timeouts):
+        return CheckOutcome('error', error="Request timed out", error_kind='timeout', retryable=True)
+    return CheckOutcome('error', error=str(error) or type(error).__name__, error_kind='client_error', retryable=True)
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before asking again."""
+    max_retries: int = 3
+    retry_delay: float = 0.1  # Doubled after every attempt
+    max_retry_after: float = 60.0  # Longest Retry-After honoured by sleeping
+    paced: bool = False  # A pacer already holds every caller back for Retry-After
+
+    @classmethod
+    def from_config(cls, config, paced: bool = False) -> 'RetryPolicy':
+        """Build a policy from the retry settings in ``Config``."""
+        return cls(max_retries=config.max_retries, retry_delay=config.retry_delay, paced=paced)
+
+    def delay(self, attempt: int, outcome: CheckOutcome) -> Optional[float]:
+        """Seconds to wait before retrying after ``attempt`` (0-based), or None to give up."""
+        if not outcome.retryable or attempt >= self.max_retries:
+            return None
+        if outcome.error_kind == '429_rate_limit':
+            if self.paced:
+                return 0.0
+            if outcome.retry_after is not None:
+                return min(outcome.retry_after, self.max_retry_after)
+        return self.retry_delay * (2 ** attempt)
+
+
+class AsyncCheckEngine:
+    """Check usernames over aiohttp within the rate limiter's concurrency and pace limits.
+
+    Every attempt takes a limiter permit (which also waits on the pacer),
+    reports the response to the pacer, and is timed into ``latency``.
+    Answers are cached by canonical username, so case variants and repeats
+    cost a single request.
+    """
+
+    def __init__(self, config, rate_limiter, sessions: Callable[[], 'aiohttp.ClientSession'],
+                 latency: Optional[RequestLatency] = None, cache: Optional[TTLCache[CheckOutcome]] = None):
+        import aiohttp
+        self._client_errors = (asyncio.TimeoutError, aiohttp.ClientError)
+        self._decode_errors = (ValueError, aiohttp.ContentTypeError)
+        self.api_url = config.api_url
+        self.birthday = config.birthday
+        self.policy = RetryPolicy.from_config(config, paced=True)
+        self.rate_limiter = rate_limiter
+        self.sessions = sessions
+        self.latency = latency or RequestLatency()
+        self.cache = cache
+
+        # Set by the owner to count timeouts and network errors on the live display
+        self.monitor = None
+
+    async def check(self, username: str) -> CheckOutcome:
+        """Ask the API about ``username``, retrying transient failures."""
+        attempt = 0
+        while True:
+            outcome, delay = await self.attempt(username, attempt)
+            if delay is None:
+                return outcome
+            if delay > 0:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def attempt(self, username: str, attempt: int = 0) -> Tuple[CheckOutcome, Optional[float]]:
+        """Ask the API about ``username`` once.
+
+        Returns the outcome and how long to wait before trying again, or
+        None for the wait when the outcome is final. The permit is released
+        before returning, so callers that defer the retry elsewhere don't
+        hold a concurrency slot while they wait.
+        """
+        key = canonical_username(username)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached, None
+
+        await self.rate_limiter.acquire()
+        try:
+            outcome = await self._request(username)
+        finally:
+            self.rate_limiter.release()
+        outcome.attempts = attempt + 1
+
+        if outcome.error_kind is None:
+            self.rate_limiter.record_success(outcome.response_time)
+            if self.cache is not None and outcome.status != 'error':
+                self.cache.put(key, replace(outcome, response_time=0.0, attempts=0))
+            return outcome, None
+
+        self._record_error(outcome)
+        return outcome, self.policy.delay(attempt, outcome)
+
+    async def _request(self, username: str) -> CheckOutcome:
+        session = self.sessions()
+        start_time = time.perf_counter()
+        try:
+            async with session.get(build_url(self.api_url, username, self.birthday)) as response:
+                self.rate_limiter.pacer.observe(response.status, response.headers)
+                payload = None
+                if response.status == 200:
+                    try:
+                        payload = await response.json(loads=ujson.loads)
+                    except self._decode_errors:
+                        pass
+                outcome = classify_response(response.status, payload, response.headers)
+        except self._client_errors as e:
+            outcome = classify_exception(e)
+        finally:
+            # Failures and timeouts count too; they are the tail worth tuning for
+            response_time = time.perf_counter() - start_time
+            self.latency.total.record(response_time)
+        outcome.response_time = response_time
+        return outcome
+
+    def _record_error(self, outcome: CheckOutcome) -> None:
+        self.rate_limiter.record_error(outcome.error_kind)
+        if self.monitor:
+            if outcome.error_kind == 'timeout':
+                self.monitor.record_timeout()
+            elif outcome.error_kind != 'json_error':
+                self.monitor.record_network_error()
+
+
+def create_requests_session(pool_size: int = 10) -> 'requests.Session':
+    """A keep-alive ``requests`` session with a connection for each of ``pool_size`` threads."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # The default adapter keeps 10 connections; busier threads would reconnect on every request
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+class SyncCheckEngine:
+    """Blocking counterpart of ``AsyncCheckEngine`` for the threaded checkers.
+
+    Uses the same URL, classification and retry policy over a shared
+    ``requests`` session. Without a pacer, a 429 makes the calling thread
+    sleep for Retry-After (capped) before it asks again.
+    """
+
+    def __init__(self, session: 'requests.Session', api_url: str, birthday: str,
+                 policy: Optional[RetryPolicy] = None, timeout: float = 10.0):
+        import requests
+        self._request_errors = requests.RequestException
+        self._timeouts = (requests.Timeout,)
+        self.session = session
+        self.api_url = api_url
+        self.birthday = birthday
+        self.policy = policy or RetryPolicy()
+        self.timeout = timeout
+
+    def check(self, username: str) -> CheckOutcome:
+        """Ask the API about ``username``, retrying transient failures."""
+        attempt = 0
+        while True:
+            outcome = self._request(username)
+            outcome.attempts = attempt + 1
+            if outcome.error_kind is None:
+                return outcome
+            delay = self.policy.delay(attempt, outcome)
+            if delay is None:
+                return outcome
+            if delay > 0:
+                time.sleep(delay)
+            attempt += 1
+
+    def _request(self, username: str) -> CheckOutcome:
+        start_time = time.perf_counter()
+        try:
+            response = self.session.get(build_url(self.api_url, username, self.birthday), timeout=self.timeout)
+            payload = None
+            if response.status_code == 200:
+                try:
+                    payload = response.json()
+                except ValueError:
+                    pass
+            outcome = classify_response(response.status_code, payload, response.headers)
+        except self._request_errors as e:
+            outcome = classify_exception(e, self._timeouts)
+        outcome.response_time = time.perf_counter() - start_time
+        return outcome
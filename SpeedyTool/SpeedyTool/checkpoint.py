@@ -0,0 +1,258 @@
+"""Checkpoint and resume support for long username checking runs."""
+
+import hashlib
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from username_pipeline import canonical_username
+
+if TYPE_CHECKING:
+    from result_sink import ResultSink
+
+
+class CheckpointEntry(NamedTuple):
+    """A finished username as recorded in the checkpoint log."""
+    username: str  # spelling that was checked
+    status: str  # lower-case status, e.g. 'valid', 'taken', 'invalid_format', 'error'
+    code: Optional[int]
+
+
+class Checkpoint:
+    """Periodic checkpoint of finished usernames plus the input offset reached.
+
+    Two files sit next to each other: ``<path>.log`` is an append-only JSONL
+    log of every finished name, and ``<path>.json`` holds the input offset
+    (the number of leading non-blank input lines whose names are all
+    finished) together with a digest of those lines. The state file is
+    replaced atomically, and a torn last log line is ignored on load, so a
+    crash at any point leaves a usable checkpoint.
+
+    In streaming mode an attached ``sink`` is synced before every state
+    write, and its size as of the last ``advance`` is saved as
+    ``output_bytes``, so the output file can be cut back to exactly the
+    results covered by the offset when resuming.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 5.0):
+        self.log_path = f"{path}.log"
+        self.state_path = f"{path}.json"
+        self.flush_interval = flush_interval
+
+        self.completed: Dict[str, CheckpointEntry] = {}
+        self.offset = 0
+        self.lines: List[str] = []
+        self.sink: Optional['ResultSink'] = None
+        self.output_bytes = 0
+
+        self._expected_digest: Optional[str] = None
+        self._prefix_hash = hashlib.sha256()
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+        self._log = None
+
+    @classmethod
+    def for_input(cls, input_file: str, flush_interval: float = 5.0) -> 'Checkpoint':
+        """Return the checkpoint that belongs to ``input_file``."""
+        return cls(f"{input_file}.checkpoint", flush_interval)
+
+    @classmethod
+    def open_for_run(cls, input_file: str, resume: bool, flush_interval: float = 5.0) -> 'Checkpoint':
+        """Load the input's checkpoint when resuming, otherwise clear it."""
+        checkpoint = cls.for_input(input_file, flush_interval)
+        if resume and checkpoint.exists():
+            checkpoint.load()
+        else:
+            checkpoint.reset()
+        return checkpoint
+
+    def exists(self) -> bool:
+        """Return True if a previous run left a checkpoint behind."""
+        return os.path.exists(self.log_path)
+
+    def load(self) -> int:
+        """Load a previous checkpoint and return the number of finished names."""
+        self.completed.clear()
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        entry = CheckpointEntry(record['u'], record['s'], record.get('c'))
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Torn write from a crash
+                    if entry.status == 'error':
+                        continue  # Logged by older versions; checked again instead
+                    self.completed[canonical_username(entry.username)] = entry
+
+        self.offset = 0
+        self._expected_digest = None
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                self.offset = int(state.get('offset', 0))
+                self.output_bytes = int(state.get('output_bytes', 0))
+                self._expected_digest = state.get('prefix_sha256')
+            except (ValueError, OSError):
+                self.offset = 0
+                self.output_bytes = 0
+
+        return len(self.completed)
+
+    def reset(self) -> None:
+        """Discard any previous checkpoint so the run starts from line one."""
+        for path in (self.log_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.completed.clear()
+        self.offset = 0
+        self.output_bytes = 0
+        self._expected_digest = None
+
+    def begin(self, usernames: List[str]) -> Tuple[List[str], List[CheckpointEntry]]:
+        """Start tracking ``usernames``.
+
+        Returns the usernames that still need to go through the pipeline and
+        the recorded results for the finished prefix that was skipped. The
+        prefix is only skipped if it still matches the digest saved with the
+        offset; otherwise every name is re-read and matched against the log.
+        """
+        self.lines = usernames
+        self._prefix_hash = hashlib.sha256()
+
+        offset = min(self.offset, len(usernames))
+        for username in usernames[:offset]:
+            self._prefix_hash.update(username.encode('utf-8') + b'\n')
+
+        if offset and self._prefix_hash.hexdigest() != self._expected_digest:
+            offset = 0
+            self._prefix_hash = hashlib.sha256()
+        self.offset = offset
+
+        # One row per distinct spelling, as a full run would write; case variants share one answer
+        skipped: Dict[str, CheckpointEntry] = {}
+        for username in usernames[:offset]:
+            entry = self.completed.get(canonical_username(username))
+            if entry is not None and username not in skipped:
+                skipped[username] = entry._replace(username=username)
+
+        self._log = open(self.log_path, 'a', encoding='utf-8')
+        return usernames[offset:], list(skipped.values())
+
+    def begin_stream(self) -> int:
+        """Start tracking a streamed input; returns how many leading lines to skip.
+
+        The caller feeds the skipped lines to ``skip_line`` and must start
+        over from line one if ``prefix_matches`` is False afterwards.
+        """
+        self.lines = []
+        self._prefix_hash = hashlib.sha256()
+        if self._log is None:
+            self._log = open(self.log_path, 'a', encoding='utf-8')
+        return self.offset
+
+    def skip_line(self, username: str) -> None:
+        """Account for a line skipped because it is inside the finished prefix."""
+        self._prefix_hash.update(username.encode('utf-8') + b'\n')
+
+    def prefix_matches(self) -> bool:
+        """Return True if the skipped lines are the ones the checkpoint was taken on."""
+        if self._prefix_hash.hexdigest() == self._expected_digest:
+            return True
+        self.offset = 0
+        self.output_bytes = 0
+        if self.sink is not None:
+            self.sink.reset()
+        self._prefix_hash = hashlib.sha256()
+        return False
+
+    def advance(self, usernames: List[str]) -> None:
+        """Mark the next input lines as finished (streaming mode).
+
+        Streamed input is finished strictly in order, so the offset alone
+        describes progress and per-name records are not kept in memory.
+        """
+        for username in usernames:
+            self._prefix_hash.update(username.encode('utf-8') + b'\n')
+        self.offset += len(usernames)
+        if self.sink is not None:
+            self.output_bytes = self.sink.tell()
+
+    def lookup_many(self, usernames: Iterable[str]) -> Dict[str, CheckpointEntry]:
+        """Return recorded results for the given spellings, keyed by spelling."""
+        found = {}
+        for username in usernames:
+            entry = self.completed.get(canonical_username(username))
+            if entry is not None:
+                found[username] = entry
+        return found
+
+    def record(self, username: str, status: str, code: Optional[int]) -> None:
+        """Record a finished username; written out on the next flush.
+
+        Errors aren't answers, so they are left out and a resumed run checks
+        those names again.
+        """
+        if status.lower() == 'error':
+            return
+        entry = CheckpointEntry(username, status.lower(), code)
+        self.completed[canonical_username(username)] = entry
+        self._pending.append(json.dumps({'u': entry.username, 's': entry.status, 'c': entry.code}))
+
+    def maybe_flush(self) -> None:
+        """Flush if ``flush_interval`` seconds have passed since the last flush."""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append pending records, fsync them and advance the saved offset."""
+        self._last_flush = time.monotonic()
+        if self._log is None:
+            return
+
+        # Results must be on disk before the state that vouches for them
+        if self.sink is not None:
+            self.sink.sync()
+
+        if self._pending:
+            self._log.write("\n".join(self._pending) + "\n")
+            self._pending.clear()
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+        # The offset only ever moves forward, so this is amortised O(1) per line
+        lines = self.lines
+        while self.offset < len(lines) and canonical_username(lines[self.offset]) in self.completed:
+            self._prefix_hash.update(lines[self.offset].encode('utf-8') + b'\n')
+            self.offset += 1
+
+        state = {
+            'offset': self.offset,
+            'prefix_sha256': self._prefix_hash.hexdigest(),
+            'output_bytes': self.output_bytes,
+            'completed': len(self.completed),
+            'updated_at': time.time(),
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    def close(self) -> None:
+        """Flush and keep the checkpoint so the run can be resumed."""
+        self.flush()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def finish(self) -> None:
+        """The run completed; the checkpoint is no longer needed."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self._pending.clear()
+        self.reset()
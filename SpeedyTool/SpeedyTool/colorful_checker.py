@@ -5,47 +5,33 @@ Ultra-fast username validation with beautiful colors!
 Compatible with Python 3.13+ and all environments
 """
 
-import requests
+import argparse
 import time
-import threading
-import queue
-import json
-import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Tuple
-import sys
+from typing import List, Optional
 from pathlib import Path
 from colorama import init, Fore, Back, Style
-import random
+
+from config import Config
+from result_sink import SINK_FORMATS
+from result_model import ResultTable
+from live_progress import ProgressSnapshot, emit_metrics
+from terminal_renderer import TerminalRenderer
+from threaded_checker import ThreadedChecker
+from candidate_source import CandidateSource
 
 # Initialize colorama for cross-platform color support
 init(autoreset=True)
 
-class ColorfulUsernameChecker:
+class ColorfulUsernameChecker(ThreadedChecker):
     """Ultra-fast username checker with beautiful color display."""
     
-    def __init__(self, max_workers: int = 50):
-        self.max_workers = max_workers
-        self.session = requests.Session()
-        
-        # Configure session for better performance
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
-        
-        # Performance tracking
-        self.results = []
-        self.processed = 0
-        self.start_time = None
-        self.valid_usernames = []
-        self.lock = threading.Lock()
-        
-        # Progress display settings
-        self.last_progress_update = 0
-        self.progress_update_interval = 0.3  # Update every 0.3 seconds for smooth animation
+    progress_update_interval = 0.3  # Update every 0.3 seconds for smooth animation
+    stopping_message = "\n\n⏹️ Stopping early... Preparing colorful results..."
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.renderer = TerminalRenderer(max_fps=10)
+        self._header_lines: Optional[List[str]] = None
         
         # Color schemes
         self.colors = {
@@ -67,9 +53,11 @@ class ColorfulUsernameChecker:
             result += color + char
         return result + Style.RESET_ALL
 
-    def print_header(self):
-        """Print colorful header."""
-        self.clear_console()
+    def header_lines(self) -> List[str]:
+        """Return the colorful header, built once."""
+        if self._header_lines is not None:
+            return self._header_lines
+        
         header_lines = [
             "████████████████████████████████████████████████████████████████████████████████",
             "██                                                                            ██",
@@ -80,75 +68,18 @@ class ColorfulUsernameChecker:
             "████████████████████████████████████████████████████████████████████████████████"
         ]
         
-        for line in header_lines:
-            print(self.rainbow_text(line))
-        print()
+        self._header_lines = [self.rainbow_text(line) for line in header_lines] + [""]
+        return self._header_lines
 
-    def check_username(self, username: str) -> Dict:
-        """Check a single username with colorful result."""
-        url = f"https://auth.roblox.com/v1/usernames/validate?username={username}&birthday=01/01/2000"
-        
-        try:
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                code = data.get('code', -1)
-                
-                if code == 0:
-                    return {
-                        'username': username,
-                        'status': 'VALID',
-                        'code': code,
-                        'color': self.colors['success'] + '✅ VALID',
-                        'display_color': self.colors['success']
-                    }
-                elif code == 1:
-                    return {
-                        'username': username,
-                        'status': 'TAKEN',
-                        'code': code,
-                        'color': self.colors['error'] + '❌ TAKEN',
-                        'display_color': self.colors['error']
-                    }
-                elif code == 2:
-                    return {
-                        'username': username,
-                        'status': 'CENSORED',
-                        'code': code,
-                        'color': self.colors['warning'] + '🚫 CENSORED',
-                        'display_color': self.colors['warning']
-                    }
-                else:
-                    return {
-                        'username': username,
-                        'status': f'UNKNOWN_{code}',
-                        'code': code,
-                        'color': self.colors['info'] + f'❓ UNKNOWN_{code}',
-                        'display_color': self.colors['info']
-                    }
-            else:
-                return {
-                    'username': username,
-                    'status': f'HTTP_{response.status_code}',
-                    'code': response.status_code,
-                    'color': self.colors['error'] + f'⚠️ HTTP_{response.status_code}',
-                    'display_color': self.colors['error']
-                }
-                
-        except Exception as e:
-            return {
-                'username': username,
-                'status': 'ERROR',
-                'code': -1,
-                'color': self.colors['error'] + '💥 ERROR',
-                'display_color': self.colors['error'],
-                'error': str(e)
-            }
+    def print_header(self):
+        """Print colorful header."""
+        self.clear_console()
+        for line in self.header_lines():
+            print(line)
 
     def clear_console(self):
         """Clear console screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.renderer.clear()
 
     def create_progress_bar(self, progress: float, width: int = 60) -> str:
         """Create a colorful progress bar."""
@@ -169,155 +100,112 @@ class ColorfulUsernameChecker:
         """Add pulsing animation to text."""
         return color + Style.BRIGHT + text + Style.RESET_ALL
 
-    def display_progress(self, results: List[Dict], total: int, elapsed: float):
+    def display_progress(self, snapshot: ProgressSnapshot):
         """Display beautiful colorful progress information."""
-        self.clear_console()
-        
-        progress = (len(results) / total) * 100
-        rps = len(results) / elapsed if elapsed > 0 else 0
-        
-        # Count results
-        counts = {'VALID': 0, 'TAKEN': 0, 'CENSORED': 0, 'ERROR': 0}
-        for result in results:
-            status = result['status']
-            if status in counts:
-                counts[status] += 1
-            elif status.startswith('UNKNOWN') or status.startswith('HTTP') or status == 'ERROR':
-                counts['ERROR'] += 1
+        progress = snapshot.progress
+        counts = snapshot.counts
         
         # Header
-        self.print_header()
+        lines = list(self.header_lines())
         
         # Progress section
-        print(self.colors['header'] + "┌─" + "─" * 78 + "─┐")
-        print(self.colors['header'] + "│" + self.animate_text("🚀 LIVE PROGRESS", self.colors['accent']).center(88) + self.colors['header'] + "│")
-        print(self.colors['header'] + "└─" + "─" * 78 + "─┘")
-        print()
+        lines.append(self.colors['header'] + "┌─" + "─" * 78 + "─┐")
+        lines.append(self.colors['header'] + "│" + self.animate_text("🚀 LIVE PROGRESS", self.colors['accent']).center(88) + self.colors['header'] + "│")
+        lines.append(self.colors['header'] + "└─" + "─" * 78 + "─┘")
+        lines.append("")
         
         # Progress bar
         progress_bar = self.create_progress_bar(progress)
-        print(f"{self.colors['info']}Progress: {progress_bar} {self.colors['accent']}{progress:.1f}%")
-        print()
+        lines.append(f"{self.colors['info']}Progress: {progress_bar} {self.colors['accent']}{progress:.1f}%")
+        lines.append("")
         
         # Statistics in colorful boxes
-        print(self.colors['header'] + "┌─" + "─" * 38 + "┬─" + "─" * 38 + "─┐")
-        print(self.colors['header'] + "│" + f"{self.colors['info']}📊 STATISTICS".center(48) + self.colors['header'] + "│" + f"{self.colors['accent']}⚡ PERFORMANCE".center(48) + self.colors['header'] + "│")
-        print(self.colors['header'] + "├─" + "─" * 38 + "┼─" + "─" * 38 + "─┤")
-        
-        eta = ((total - len(results)) / rps) if rps > 0 else 0
-        print(self.colors['header'] + "│" + f"{self.colors['success']}Processed: {len(results):,} / {total:,}".ljust(48) + self.colors['header'] + "│" + f"{self.colors['accent']}Speed: {rps:.1f} req/sec".ljust(48) + self.colors['header'] + "│")
-        print(self.colors['header'] + "│" + f"{self.colors['info']}Time: {elapsed:.1f} seconds".ljust(48) + self.colors['header'] + "│" + f"{self.colors['warning']}ETA: {eta:.1f} seconds".ljust(48) + self.colors['header'] + "│")
-        print(self.colors['header'] + "└─" + "─" * 38 + "┴─" + "─" * 38 + "─┘")
-        print()
+        lines.append(self.colors['header'] + "┌─" + "─" * 38 + "┬─" + "─" * 38 + "─┐")
+        lines.append(self.colors['header'] + "│" + f"{self.colors['info']}📊 STATISTICS".center(48) + self.colors['header'] + "│" + f"{self.colors['accent']}⚡ PERFORMANCE".center(48) + self.colors['header'] + "│")
+        lines.append(self.colors['header'] + "├─" + "─" * 38 + "┼─" + "─" * 38 + "─┤")
+        
+        lines.append(self.colors['header'] + "│" + f"{self.colors['success']}Processed: {snapshot.processed:,} / {snapshot.total:,}".ljust(48) + self.colors['header'] + "│" + f"{self.colors['accent']}Speed: {snapshot.rate:.1f} req/sec".ljust(48) + self.colors['header'] + "│")
+        lines.append(self.colors['header'] + "│" + f"{self.colors['info']}Time: {snapshot.elapsed:.1f} seconds".ljust(48) + self.colors['header'] + "│" + f"{self.colors['warning']}ETA: {snapshot.eta:.1f} seconds".ljust(48) + self.colors['header'] + "│")
+        lines.append(self.colors['header'] + "└─" + "─" * 38 + "┴─" + "─" * 38 + "─┘")
+        lines.append("")
         
         # Results breakdown in colorful format
-        print(self.colors['header'] + "┌─" + "─" * 78 + "─┐")
-        print(self.colors['header'] + "│" + f"{self.colors['accent']}🔍 RESULTS BREAKDOWN".center(88) + self.colors['header'] + "│")
-        print(self.colors['header'] + "├─" + "─" * 78 + "─┤")
+        lines.append(self.colors['header'] + "┌─" + "─" * 78 + "─┐")
+        lines.append(self.colors['header'] + "│" + f"{self.colors['accent']}🔍 RESULTS BREAKDOWN".center(88) + self.colors['header'] + "│")
+        lines.append(self.colors['header'] + "├─" + "─" * 78 + "─┤")
         
         # Create colorful result display
         valid_text = f"{self.colors['success']}✅ Valid: {counts['VALID']:,}"
         taken_text = f"{self.colors['error']}❌ Taken: {counts['TAKEN']:,}"
         censored_text = f"{self.colors['warning']}🚫 Censored: {counts['CENSORED']:,}"
         error_text = f"{self.colors['info']}💥 Errors: {counts['ERROR']:,}"
+        invalid_text = f"{Fore.LIGHTBLACK_EX}🧹 Invalid: {counts['INVALID_FORMAT']:,}"
         
-        print(self.colors['header'] + "│" + f"{valid_text:<25} {taken_text:<25}".ljust(88) + self.colors['header'] + "│")
-        print(self.colors['header'] + "│" + f"{censored_text:<25} {error_text:<25}".ljust(88) + self.colors['header'] + "│")
-        print(self.colors['header'] + "└─" + "─" * 78 + "─┘")
-        print()
+        lines.append(self.colors['header'] + "│" + f"{valid_text:<25} {taken_text:<25}".ljust(88) + self.colors['header'] + "│")
+        lines.append(self.colors['header'] + "│" + f"{censored_text:<25} {error_text:<25}".ljust(88) + self.colors['header'] + "│")
+        lines.append(self.colors['header'] + "│" + f"{invalid_text:<25}".ljust(88) + self.colors['header'] + "│")
+        lines.append(self.colors['header'] + "└─" + "─" * 78 + "─┘")
+        lines.append("")
         
         # Show valid usernames found with celebration
-        if self.valid_usernames:
-            print(self.colors['success'] + "🎉" * 80)
-            print(self.animate_text(f"🌟 VALID USERNAMES FOUND ({len(self.valid_usernames)}) 🌟", self.colors['success']).center(80))
-            print(self.colors['success'] + "🎉" * 80)
+        if snapshot.valid_count:
+            lines.append(self.colors['success'] + "🎉" * 80)
+            lines.append(self.animate_text(f"🌟 VALID USERNAMES FOUND ({snapshot.valid_count}) 🌟", self.colors['success']).center(80))
+            lines.append(self.colors['success'] + "🎉" * 80)
             
             # Display valid usernames in colorful columns
-            display_count = min(15, len(self.valid_usernames))
+            display_count = len(snapshot.first_valid)
             for i in range(0, display_count, 5):
-                row = self.valid_usernames[i:i+5]
+                row = snapshot.first_valid[i:i+5]
                 colored_row = []
                 for j, username in enumerate(row):
                     color = self.colors['rainbow'][(i + j) % len(self.colors['rainbow'])]
                     colored_row.append(f"{color}{username:<12}")
-                print("   " + " ".join(colored_row))
+                lines.append("   " + " ".join(colored_row))
             
-            if len(self.valid_usernames) > 15:
-                remaining = len(self.valid_usernames) - 15
-                print(f"{self.colors['accent']}   ... and {remaining} more amazing usernames! 🚀")
-            print()
+            if snapshot.valid_count > 15:
+                remaining = snapshot.valid_count - 15
+                lines.append(f"{self.colors['accent']}   ... and {remaining} more amazing usernames! 🚀")
+            lines.append("")
         
         # Tips and controls
         tip_text = "💡 Press Ctrl+C to stop early and see results"
-        print(self.colors['highlight'] + tip_text.center(80) + Style.RESET_ALL)
-        print(self.rainbow_text("=" * 80))
-
-    def process_usernames(self, usernames: List[str]) -> List[Dict]:
-        """Process usernames with threading and beautiful display."""
-        self.print_header()
-        
-        print(f"{self.colors['accent']}🚀 Starting to check {len(usernames):,} usernames with {self.max_workers} threads...")
-        print(f"{self.colors['info']}💡 Use Ctrl+C to stop early and see results")
-        
-        # Animated countdown
-        for i in range(3, 0, -1):
-            print(f"{self.colors['warning']}Starting in {i}..." + " " * 20, end="\r")
-            time.sleep(1)
-        
-        self.start_time = time.time()
-        results = []
-        
-        try:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                future_to_username = {
-                    executor.submit(self.check_username, username): username 
-                    for username in usernames
-                }
-                
-                for future in as_completed(future_to_username):
-                    result = future.result()
-                    
-                    with self.lock:
-                        results.append(result)
-                        self.processed += 1
-                        
-                        if result['status'] == 'VALID':
-                            self.valid_usernames.append(result['username'])
-                    
-                    current_time = time.time()
-                    if (current_time - self.last_progress_update > self.progress_update_interval or 
-                        result['status'] == 'VALID'):
-                        
-                        elapsed = current_time - self.start_time
-                        self.display_progress(results, len(usernames), elapsed)
-                        self.last_progress_update = current_time
-            
-        except KeyboardInterrupt:
-            print(f"\n\n{self.colors['warning']}⏹️ Stopping early... Preparing colorful results...")
-            time.sleep(1)
+        lines.append(self.colors['highlight'] + tip_text.center(80) + Style.RESET_ALL)
+        lines.append(self.rainbow_text("=" * 80))
         
-        return results
+        # Only changed lines are redrawn; the finished frame always makes it out
+        self.renderer.draw(lines, force=snapshot.processed >= snapshot.total)
+
+    def notify(self, style: str, message: str) -> None:
+        """Print a message in the colour for its style."""
+        print(self.colors[style] + message)
 
-    def print_summary(self, results: List[Dict]) -> None:
+    def start_display(self) -> None:
+        """Draw the header, unless running headless."""
+        if not self.headless:
+            self.print_header()
+
+    def count_down(self) -> None:
+        """Animated countdown before the live display takes over."""
+        if not self.headless:
+            for i in range(3, 0, -1):
+                print(f"{self.colors['warning']}Starting in {i}..." + " " * 20, end="\r")
+                time.sleep(1)
+
+    def print_summary(self, results: ResultTable) -> None:
         """Print beautiful, colorful summary of results."""
+        if self.headless:
+            emit_metrics('summary', self.counters.snapshot().to_record())
+            return
+        
         self.clear_console()
         
         total_time = time.time() - self.start_time
         avg_rps = len(results) / total_time if total_time > 0 else 0
         
         # Count results
-        counts = {'VALID': 0, 'TAKEN': 0, 'CENSORED': 0, 'ERROR': 0}
-        valid_usernames = []
-        
-        for result in results:
-            status = result['status']
-            if status in counts:
-                counts[status] += 1
-            elif status.startswith('UNKNOWN') or status.startswith('HTTP') or status == 'ERROR':
-                counts['ERROR'] += 1
-            
-            if status == 'VALID':
-                valid_usernames.append(result['username'])
+        counts = {status.upper(): count for status, count in results.counts().items()}
+        valid_usernames = results.usernames_with('valid')
         
         # Celebration header
         print(self.rainbow_text("🎊" * 80))
@@ -330,14 +218,10 @@ class ColorfulUsernameChecker:
         print(self.colors['header'] + "│" + f"{self.colors['accent']}📊 PERFORMANCE SUMMARY".center(88) + self.colors['header'] + "│")
         print(self.colors['header'] + "├─" + "─" * 78 + "─┤")
         
-        original_time_estimate = len(results) * 0.05
-        speedup = original_time_estimate / total_time if total_time > 0 else 1
-        
         performance_lines = [
             f"{self.colors['info']}Total Processed:    {len(results):,} usernames",
             f"{self.colors['success']}Processing Time:    {total_time:.2f} seconds",
-            f"{self.colors['accent']}Average Speed:      {avg_rps:.1f} usernames/second",
-            f"{self.colors['warning']}Speedup Factor:     {speedup:.1f}x faster than basic script"
+            f"{self.colors['accent']}Average Speed:      {avg_rps:.1f} usernames/second"
         ]
         
         for line in performance_lines:
@@ -358,6 +242,7 @@ class ColorfulUsernameChecker:
             f"{self.colors['success']}✅ Valid Usernames:     {counts['VALID']:,}",
             f"{self.colors['error']}❌ Taken Usernames:     {counts['TAKEN']:,}",
             f"{self.colors['warning']}🚫 Censored Usernames:  {counts['CENSORED']:,}",
+            f"{Fore.LIGHTBLACK_EX}🧹 Invalid Format:      {counts['INVALID_FORMAT']:,}",
             f"{self.colors['info']}💥 Errors/Timeouts:     {counts['ERROR']:,}",
             f"{self.colors['accent']}✨ Success Rate:        {success_rate:.1f}%"
         ]
@@ -400,37 +285,20 @@ class ColorfulUsernameChecker:
         print()
         print(self.rainbow_text("🎊" * 80))
 
-    def save_results(self, results: List[Dict], base_filename: str = "colorful_results") -> None:
-        """Save results with colorful console output."""
+    def save_results(self, results: ResultTable, base_filename: str = "colorful_results") -> None:
+        """Save a summary next to the results streamed to the sink, with colorful console output."""
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         
         try:
-            # Save files (same logic as before but with colorful output)
-            json_filename = f"{base_filename}_{timestamp}.json"
             txt_filename = f"{base_filename}_{timestamp}.txt"
-            csv_filename = f"{base_filename}_{timestamp}.csv"
-            
-            # Save JSON
-            with open(json_filename, 'w') as f:
-                json.dump(results, f, indent=2)
             
             # Save TXT summary
             with open(txt_filename, 'w') as f:
                 f.write("🌈 COLORFUL ROBLOX USERNAME CHECKER RESULTS 🌈\n")
                 f.write("=" * 60 + "\n\n")
                 
-                counts = {'VALID': 0, 'TAKEN': 0, 'CENSORED': 0, 'ERROR': 0}
-                valid_usernames = []
-                
-                for result in results:
-                    status = result['status']
-                    if status in counts:
-                        counts[status] += 1
-                    elif status.startswith('UNKNOWN') or status.startswith('HTTP') or status == 'ERROR':
-                        counts['ERROR'] += 1
-                    
-                    if status == 'VALID':
-                        valid_usernames.append(result['username'])
+                counts = {status.upper(): count for status, count in results.counts().items()}
+                valid_usernames = results.usernames_with('valid')
                 
                 total_time = time.time() - self.start_time
                 avg_rps = len(results) / total_time if total_time > 0 else 0
@@ -444,6 +312,7 @@ class ColorfulUsernameChecker:
                 f.write(f"Valid usernames: {counts['VALID']:,}\n")
                 f.write(f"Taken usernames: {counts['TAKEN']:,}\n")
                 f.write(f"Censored usernames: {counts['CENSORED']:,}\n")
+                f.write(f"Invalid format: {counts['INVALID_FORMAT']:,}\n")
                 f.write(f"Errors: {counts['ERROR']:,}\n\n")
                 
                 if valid_usernames:
@@ -454,23 +323,33 @@ class ColorfulUsernameChecker:
                 else:
                     f.write("No valid usernames found.\n")
             
-            # Save CSV
-            with open(csv_filename, 'w') as f:
-                f.write("Username,Status,Code,Error\n")
-                for result in results:
-                    error = result.get('error', '').replace(',', ';') if result.get('error') else ''
-                    f.write(f"{result['username']},{result['status']},{result.get('code', '')},{error}\n")
-            
             print(f"\n{self.colors['success']}💾 COLORFUL RESULTS SAVED:")
             print(f"{self.colors['info']}   📄 Summary: {txt_filename}")
-            print(f"{self.colors['accent']}   📊 Spreadsheet: {csv_filename}")
-            print(f"{self.colors['warning']}   📋 Raw data: {json_filename}")
+            if self.flow.sink:
+                print(f"{self.colors['warning']}   📋 Raw data: {self.flow.sink.path}")
             
         except Exception as e:
             print(f"{self.colors['error']}❌ Error saving results: {e}")
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run from its checkpoint instead of starting over")
+    parser.add_argument('--format', choices=sorted(SINK_FORMATS), default='jsonl',
+                        help="format of the raw results file written while checking (default: jsonl)")
+    parser.add_argument('--threads', type=int,
+                        help="number of worker threads (asked for interactively when omitted)")
+    parser.add_argument('--headless', action='store_true',
+                        help="no live display or prompts; print a JSON metrics line every $METRICS_INTERVAL seconds")
+    parser.add_argument('--source', metavar='SPEC',
+                        help="check names as they are produced instead of loading usernames.txt: '-' for stdin, "
+                             "'generate:count=N[,patterns=FILE][,seed=S][,state=FILE]' or a file")
+    return parser.parse_args(argv)
+
 def main():
     """Main function with colorful interface."""
+    args = parse_args()
     init()  # Initialize colorama
     
     # Colorful welcome
@@ -479,45 +358,74 @@ def main():
     print(Fore.CYAN + Style.BRIGHT + "🌈" * 80)
     print()
     
-    # Check if usernames file exists
     username_file = "usernames.txt"
-    if not Path(username_file).exists():
-        print(f"{Fore.RED}❌ File '{username_file}' not found!")
-        print(f"{Fore.YELLOW}💡 Please create a file with usernames (one per line)")
-        return
-    
-    # Load usernames
-    try:
-        with open(username_file, 'r') as f:
-            usernames = [line.strip() for line in f if line.strip()]
-        
-        print(f"{Fore.GREEN}✅ Loaded {len(usernames):,} usernames from {username_file}")
-    except Exception as e:
-        print(f"{Fore.RED}❌ Error loading usernames: {e}")
-        return
+    source = None
+    usernames: List[str] = []
+    if args.source:
+        # Names are pulled from the source while checking, not loaded up front
+        try:
+            source = CandidateSource(args.source)
+        except (OSError, ValueError) as e:
+            print(f"{Fore.RED}❌ Error: {e}")
+            return
+        print(f"{Fore.GREEN}🌊 Checking usernames from '{args.source}' as they are produced")
+    else:
+        # Check if usernames file exists
+        if not Path(username_file).exists():
+            print(f"{Fore.RED}❌ File '{username_file}' not found!")
+            print(f"{Fore.YELLOW}💡 Please create a file with usernames (one per line)")
+            return
+        
+        # Load usernames
+        try:
+            with open(username_file, 'r') as f:
+                usernames = [line.strip() for line in f if line.strip()]
+            
+            print(f"{Fore.GREEN}✅ Loaded {len(usernames):,} usernames from {username_file}")
+        except Exception as e:
+            print(f"{Fore.RED}❌ Error loading usernames: {e}")
+            return
     
-    # Get thread count with colorful input
-    print(f"\n{Fore.CYAN}🔧 How many threads do you want to use?")
-    print(f"{Fore.YELLOW}💡 Recommended: 30-50 (more = faster, but may hit rate limits)")
+    config = Config.from_env()
+    # Names piped in on stdin leave nothing to answer prompts with
+    headless = args.headless or config.headless or (source is not None and source.uses_stdin)
     
-    try:
-        max_workers = int(input(f"{Fore.MAGENTA}Enter threads (default 50): ") or "50")
-        max_workers = max(1, min(100, max_workers))  # Limit between 1-100
-    except ValueError:
+    if args.threads:
+        max_workers = max(1, min(100, args.threads))
+    elif headless:
         max_workers = 50
-        print(f"{Fore.YELLOW}Using default: 50 threads")
+    else:
+        # Get thread count with colorful input
+        print(f"\n{Fore.CYAN}🔧 How many threads do you want to use?")
+        print(f"{Fore.YELLOW}💡 Recommended: 30-50 (more = faster, but may hit rate limits)")
+        
+        try:
+            max_workers = int(input(f"{Fore.MAGENTA}Enter threads (default 50): ") or "50")
+            max_workers = max(1, min(100, max_workers))  # Limit between 1-100
+        except ValueError:
+            max_workers = 50
+            print(f"{Fore.YELLOW}Using default: 50 threads")
     
     # Create and run checker
     print(f"\n{Fore.GREEN}🚀 Initializing colorful checker with {max_workers} threads...")
     
-    checker = ColorfulUsernameChecker(max_workers=max_workers)
-    results = checker.process_usernames(usernames)
+    checker = ColorfulUsernameChecker(max_workers=max_workers, headless=headless,
+                                      metrics_interval=config.metrics_interval, api_url=config.api_url)
+    # Raw results are appended to this file while checking, not dumped at the end
+    config.output_format = args.format
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    results = checker.run(config, f"colorful_results_{timestamp}{SINK_FORMATS[args.format].extension}",
+                          usernames=usernames, source=source, input_file=username_file, resume=args.resume)
     
     # Show final summary
     checker.print_summary(results)
+    if checker.flow.censor is not None:
+        print(checker.flow.censor.summary())
     
     # Save results
     checker.save_results(results)
+    if headless:
+        return
     
     print(f"\n{Fore.CYAN + Style.BRIGHT}🎉 Thank you for using the Colorful Username Checker! 🎉")
     print(f"{Fore.YELLOW}Press Enter to exit...")
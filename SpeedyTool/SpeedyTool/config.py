@@ -13,10 +13,10 @@ class Config:
     min_concurrent_requests: int = 100
     initial_concurrent_requests: int = 200
     
-    # Rate limiting - Optimized for maximum speed
-    base_delay: float = 0.0001  # 0.1ms base delay
-    max_delay: float = 0.5     # 0.5 second max delay
-    backoff_factor: float = 1.2
+    # Rate limiting - requests are paced by a token bucket that follows the API's limits
+    max_requests_per_second: float = 250.0  # Ceiling the pacer never exceeds
+    min_requests_per_second: float = 2.0  # Floor it backs off to after repeated 429s
+    pacer_burst: float = 20.0  # Requests allowed back to back after an idle spell
     
     # Connection settings - Optimized for speed
     total_timeout: int = 15
@@ -26,6 +26,8 @@ class Config:
     # Retry settings
     max_retries: int = 3
     retry_delay: float = 0.1
+    retry_queue_size: int = 10000  # Failed checks waiting out their backoff at once
+    retry_budget: float = 30.0  # Seconds a name may keep retrying after its first failure
     
     # Batch settings - Increased for better throughput
     batch_size: int = 250
@@ -33,6 +35,9 @@ class Config:
     # File settings
     input_file: str = "usernames.txt"
     output_file: Optional[str] = None
+    output_format: Optional[str] = None  # 'csv', 'jsonl' or 'binary'; defaults to the file extension
+    output_flush_bytes: int = 256 * 1024  # Buffered output written once this much piles up...
+    output_flush_interval: float = 1.0  # ...or this many seconds have passed
     
     # API settings
     api_url: str = "https://auth.roblox.com/v1/usernames/validate"
@@ -40,10 +45,30 @@ class Config:
     
     # Performance monitoring
     progress_update_interval: float = 0.1  # Update every 100ms
+    headless: bool = False  # No live UI; log JSON metric lines instead
+    metrics_interval: float = 5.0  # Seconds between metric lines in headless mode
     enable_detailed_logging: bool = True
     
     # Memory management
     chunk_size: int = 1000  # Process usernames in chunks
+    stream_queue_depth: int = 8  # Prepared batches buffered ahead in streaming mode
+    stream_max_pending_batches: int = 64  # Batches being checked at once in streaming mode
+    
+    # Checkpointing for resumable runs
+    checkpoint_interval: float = 5.0  # Seconds between checkpoint flushes
+    
+    # Persistent result store (set to None/empty to disable)
+    result_store_path: Optional[str] = "results.db"
+    store_ttl_valid: float = 300.0  # Free names can be claimed at any moment
+    store_ttl_taken: float = 3 * 24 * 3600.0  # Taken names rarely free up
+    store_ttl_censored: float = 7 * 24 * 3600.0  # Filter changes are rare
+    
+    # Names seen taken, kept with no expiry and skipped by every run (set to None/empty to disable)
+    taken_index_path: Optional[str] = "taken.idx"
+    
+    # Rules mined from censored answers; matching names are answered locally (None/empty to disable)
+    censor_model_path: Optional[str] = "censor_model.json"
+    censor_audit_rate: float = 0.05  # Share of predicted-censored names still checked, to measure the filter
     
     @classmethod
     def from_env(cls) -> 'Config':
@@ -52,10 +77,29 @@ class Config:
             max_concurrent_requests=int(os.getenv('MAX_CONCURRENT', 150)),
             min_concurrent_requests=int(os.getenv('MIN_CONCURRENT', 50)),
             initial_concurrent_requests=int(os.getenv('INITIAL_CONCURRENT', 100)),
-            base_delay=float(os.getenv('BASE_DELAY', 0.001)),
-            max_delay=float(os.getenv('MAX_DELAY', 1.0)),
+            max_requests_per_second=float(os.getenv('MAX_RPS', 250)),
+            min_requests_per_second=float(os.getenv('MIN_RPS', 2)),
+            pacer_burst=float(os.getenv('PACER_BURST', 20)),
             total_timeout=int(os.getenv('TOTAL_TIMEOUT', 30)),
+            retry_queue_size=int(os.getenv('RETRY_QUEUE_SIZE', 10000)),
+            retry_budget=float(os.getenv('RETRY_BUDGET', 30.0)),
             input_file=os.getenv('INPUT_FILE', 'usernames.txt'),
             output_file=os.getenv('OUTPUT_FILE'),
-            enable_detailed_logging=os.getenv('DETAILED_LOGGING', 'true').lower() == 'true'
+            output_format=os.getenv('OUTPUT_FORMAT'),
+            output_flush_bytes=int(os.getenv('OUTPUT_FLUSH_BYTES', 256 * 1024)),
+            output_flush_interval=float(os.getenv('OUTPUT_FLUSH_INTERVAL', 1.0)),
+            enable_detailed_logging=os.getenv('DETAILED_LOGGING', 'true').lower() == 'true',
+            headless=os.getenv('HEADLESS', 'false').lower() == 'true',
+            metrics_interval=float(os.getenv('METRICS_INTERVAL', 5.0)),
+            stream_queue_depth=int(os.getenv('STREAM_QUEUE_DEPTH', 8)),
+            stream_max_pending_batches=int(os.getenv('STREAM_MAX_PENDING', 64)),
+            checkpoint_interval=float(os.getenv('CHECKPOINT_INTERVAL', 5.0)),
+            api_url=os.getenv('API_URL', cls.api_url),
+            result_store_path=os.getenv('RESULT_STORE', 'results.db') or None,
+            store_ttl_valid=float(os.getenv('STORE_TTL_VALID', 300)),
+            store_ttl_taken=float(os.getenv('STORE_TTL_TAKEN', 3 * 24 * 3600)),
+            store_ttl_censored=float(os.getenv('STORE_TTL_CENSORED', 7 * 24 * 3600)),
+            taken_index_path=os.getenv('TAKEN_INDEX', 'taken.idx') or None,
+            censor_model_path=os.getenv('CENSOR_MODEL', 'censor_model.json') or None,
+            censor_audit_rate=float(os.getenv('CENSOR_AUDIT_RATE', 0.05)),
         )
@@ -0,0 +1,254 @@
+"""Walk every name a set of patterns can produce, once each, in a seeded random order."""
+
+import json
+import os
+import random
+from bisect import bisect_right
+from typing import Container, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from username_patterns import UsernamePattern
+
+# Share of each round of offsets given to the patterns, in proportion to their weights
+SCHEDULE_SLOTS = 1000
+
+
+class FeistelPermutation:
+    """A seeded bijection on ``range(size)``, evaluated one index at a time.
+
+    An unbalanced Feistel network permutes the smallest power of two that
+    covers ``size``, its rounds taking turns to scramble the high and the
+    low bits with a hash of the others. Results outside the range are fed
+    through again ("cycle walking") until one lands inside it, which takes
+    fewer than two passes on average. Nothing is stored per index, so any
+    position of the permutation can be computed directly.
+    """
+
+    def __init__(self, size: int, seed: int, rounds: int = 4):
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self.size = size
+        self.bits = max(1, (size - 1).bit_length())
+        self.low_bits = self.bits - self.bits // 2
+        self.high_bits = self.bits // 2
+        self.mask = (1 << self.bits) - 1
+        rng = random.Random(seed)
+        # Odd multipliers make each round a multiply-shift hash of the other part
+        self.keys = [(rng.getrandbits(self.bits), rng.getrandbits(self.bits) | 1) for _ in range(rounds)]
+
+    def _permute(self, value: int) -> int:
+        bits, low_bits, mask = self.bits, self.low_bits, self.mask
+        high, low = value >> low_bits, value & ((1 << low_bits) - 1)
+        for round_number, (key, multiplier) in enumerate(self.keys):
+            if round_number % 2:
+                low ^= ((high ^ key) * multiplier & mask) >> (bits - low_bits)
+            else:
+                high ^= ((low ^ key) * multiplier & mask) >> (bits - self.high_bits)
+        return (high << low_bits) | low
+
+    def __call__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        value = self._permute(index)
+        while value >= self.size:
+            value = self._permute(value)
+        return value
+
+
+class _Keyspace:
+    """One pattern's names with case folded away, numbered in mixed radix."""
+
+    def __init__(self, pattern: UsernamePattern, seed: int):
+        self.pattern = pattern
+        self.weight = pattern.weight
+        # Roblox ignores case, so 'a' and 'A' at the same position are one name, not two
+        self.alphabets: List[str] = []
+        self.folded: List[frozenset] = []
+        for alphabet in pattern.positions:
+            spellings = {}
+            for char in alphabet.decode('ascii'):
+                spellings.setdefault(char.lower(), char)
+            self.alphabets.append(''.join(spellings.values()))
+            self.folded.append(frozenset(spellings))
+        self.size = 1
+        for alphabet in self.alphabets:
+            self.size *= len(alphabet)
+        self.permutation = FeistelPermutation(self.size, seed)
+        # Narrower patterns that can produce some of the same names; those names are theirs
+        self.overlapping: List['_Keyspace'] = []
+
+    def name(self, index: int) -> str:
+        value = self.permutation(index)
+        chars = []
+        for alphabet in reversed(self.alphabets):
+            value, digit = divmod(value, len(alphabet))
+            chars.append(alphabet[digit])
+        return ''.join(reversed(chars))
+
+    def contains(self, name: str) -> bool:
+        """Whether ``name`` (in any case) is one of this pattern's names."""
+        return len(name) == len(self.folded) and all(
+            char in allowed for char, allowed in zip(name.lower(), self.folded))
+
+    def intersects(self, other: '_Keyspace') -> bool:
+        return len(self.folded) == len(other.folded) and all(
+            mine & theirs for mine, theirs in zip(self.folded, other.folded))
+
+    def within(self, other: '_Keyspace') -> bool:
+        return len(self.folded) == len(other.folded) and all(
+            mine <= theirs for mine, theirs in zip(self.folded, other.folded))
+
+
+class _Phase:
+    """A stretch of offsets dealt out in rounds to the patterns that still have names."""
+
+    def __init__(self, start: int, weights: Dict[int, float], used: Dict[int, int]):
+        self.start = start
+        self.used = used  # Names each pattern gave out in earlier phases
+        # Spread each pattern's slots evenly over the round instead of in one run
+        total = sum(weights.values())
+        self.slots = {owner: max(1, round(weight / total * SCHEDULE_SLOTS)) for owner, weight in weights.items()}
+        order = sorted((k / slots, owner) for owner, slots in self.slots.items() for k in range(slots))
+        self.owner: List[int] = []
+        self.rank: List[int] = []
+        seen = dict.fromkeys(self.slots, 0)
+        for _, owner in order:
+            self.owner.append(owner)
+            self.rank.append(seen[owner])
+            seen[owner] += 1
+        self.round_size = len(self.owner)
+        self.rounds = 0
+        self.end = start
+
+
+class KeyspaceSampler:
+    """Unique usernames from weighted patterns, without remembering any of them.
+
+    Every offset maps to one candidate: offsets are dealt out in rounds of
+    ``SCHEDULE_SLOTS``, each pattern owning slots in proportion to its
+    weight, and a pattern's n-th slot yields the n-th name of its own
+    seeded permutation. So a run is fully described by its seed and the
+    offset it stopped at: ``sample`` returns the next offset, a later run
+    continues from there without ever revisiting a name, and separate
+    workers can take disjoint offset ranges. When a pattern runs out, the
+    offsets after that round are dealt out again among the patterns left,
+    so a small pattern next to a huge one costs no empty slots afterwards
+    and walking every name takes about as many offsets as there are names.
+
+    Names are unique case-insensitively, also across patterns: a name two
+    patterns share belongs to the narrower one (the earlier one if they are
+    the same size), and the other skips it, so ``Ll{4}`` keeps its weight
+    next to ``a{5}``. A pattern that repeats an earlier one, like ``l{5}``
+after ``a{5}``, adds its weight to it instead.
+    """
+
+    def __init__(self, patterns: Sequence[UsernamePattern], seed: int):
+        if not patterns:
+            raise ValueError("at least one pattern is needed")
+        self.seed = seed
+        self.keyspaces: List[_Keyspace] = []
+        self.duplicates: List[UsernamePattern] = []
+        for number, pattern in enumerate(patterns):
+            keyspace = _Keyspace(pattern, seed * 1_000_003 + number)
+            same = next((earlier for earlier in self.keyspaces
+                         if keyspace.within(earlier) and earlier.within(keyspace)), None)
+            if same is None:
+                self.keyspaces.append(keyspace)
+            else:
+                same.weight += pattern.weight
+                self.duplicates.append(pattern)
+
+        for number, keyspace in enumerate(self.keyspaces):
+            keyspace.overlapping = [
+                other for other_number, other in enumerate(self.keyspaces)
+                if (other.size, other_number) < (keyspace.size, number) and keyspace.intersects(other)
+            ]
+
+        # A new phase starts whenever a pattern runs out, without it
+        self._phases: List[_Phase] = []
+        used = dict.fromkeys(range(len(self.keyspaces)), 0)
+        start = 0
+        while used:
+            phase = _Phase(start, {owner: self.keyspaces[owner].weight for owner in used}, dict(used))
+            phase.rounds = min(-(-(self.keyspaces[owner].size - used[owner]) // slots)
+                               for owner, slots in phase.slots.items())
+            phase.end = start = start + phase.rounds * phase.round_size
+            self._phases.append(phase)
+            used = {owner: count + phase.rounds * phase.slots[owner] for owner, count in used.items()
+                    if count + phase.rounds * phase.slots[owner] < self.keyspaces[owner].size}
+        self._starts = [phase.start for phase in self._phases]
+
+        # Past this offset every pattern has run out of names
+        self.end = start
+
+    @property
+    def size(self) -> int:
+        """Candidates in all the patterns together, counting shared names once per pattern sharing them."""
+        return sum(keyspace.size for keyspace in self.keyspaces)
+
+    def candidate(self, offset: int) -> Optional[str]:
+        """The name at ``offset``, or None if that slot has nothing to give."""
+        if not 0 <= offset < self.end:
+            return None
+        phase = self._phases[bisect_right(self._starts, offset) - 1]
+        rounds, slot = divmod(offset - phase.start, phase.round_size)
+        owner = phase.owner[slot]
+        index = phase.used[owner] + rounds * phase.slots[owner] + phase.rank[slot]
+        keyspace = self.keyspaces[owner]
+        if index >= keyspace.size:
+            return None
+        name = keyspace.name(index)
+        for earlier in keyspace.overlapping:
+            if earlier.contains(name):
+                return None
+        return name
+
+    def iter_names(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (offset, name) for every name in offsets ``start`` up to ``stop``."""
+        stop = self.end if stop is None else min(stop, self.end)
+        for offset in range(start, stop):
+            name = self.candidate(offset)
+            if name is not None:
+                yield offset, name
+
+    def sample(self, count: int, offset: int = 0,
+               skip: Sequence[Container[str]] = ()) -> Tuple[List[str], int]:
+        """Up to ``count`` names from ``offset`` on, and the offset to continue from.
+
+        Names in any of ``skip``, such as a ``TakenIndex``, are passed over
+        without counting towards ``count``. Fewer than ``count`` names only
+        come back once every pattern is used up.
+        """
+        names = []
+        if count <= 0:
+            return names, offset
+        for position, name in self.iter_names(offset):
+            if any(name in excluded for excluded in skip):
+                continue
+            names.append(name)
+            if len(names) == count:
+                return names, position + 1
+        return names, self.end
+
+
+def _pattern_key(patterns: Sequence[UsernamePattern]) -> List[List]:
+    return [[pattern.source, pattern.weight] for pattern in patterns]
+
+
+def load_state(path: str, patterns: Sequence[UsernamePattern]) -> Optional[Dict]:
+    """Read the seed and offset a previous run stopped at, or None if it never ran."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        state = json.load(f)
+    # Offsets only mean something for the same patterns and seed
+    if state.get('patterns') != _pattern_key(patterns):
+        raise ValueError(f"State file '{path}' was written for different patterns")
+    return state
+
+
+def save_state(path: str, patterns: Sequence[UsernamePattern], seed: int, offset: int) -> None:
+    """Remember where this run stopped, so the next one carries on from there."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'patterns': _pattern_key(patterns), 'seed': seed, 'offset': offset}, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,179 @@
+"""Fixed-memory latency histograms with percentile reporting."""
+
+import time
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+REPORTED_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations, in the style of HdrHistogram.
+
+    Durations are counted in whole microseconds. Values below
+    ``2 ** sub_bucket_bits`` get a bucket each; above that, every power of
+    two is split into ``2 ** (sub_bucket_bits - 1)`` equal buckets, so any
+    recorded value is reported to within about 0.8% (with the default 8
+    bits) no matter how large it is. Memory is fixed by ``highest`` and the
+    precision, not by how many values are recorded.
+    """
+
+    def __init__(self, highest: float = 120.0, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count // 2
+        self.highest_us = max(int(highest * 1_000_000), self.sub_bucket_count)
+        self.counts = array('Q', bytes(8 * (self._index(self.highest_us) + 1)))
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (value >> shift) - self.half_count
+
+    def _bucket_bounds(self, index: int) -> tuple:
+        """Lowest and highest microsecond value that land in ``index``."""
+        if index < self.sub_bucket_count:
+            return index, index
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        top = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        return top << shift, ((top + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """Count one duration; values past ``highest`` are clamped to it."""
+        value = min(max(int(seconds * 1_000_000), 0), self.highest_us)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total_us += value
+        if self.min_us is None or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add another histogram's counts (same layout) to this one."""
+        if len(other.counts) != len(self.counts) or other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("histograms have different layouts")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    @property
+    def mean(self) -> float:
+        """Mean duration in seconds."""
+        return self.total_us / self.count / 1_000_000 if self.count else 0.0
+
+    @property
+    def min(self) -> float:
+        """Shortest duration in seconds."""
+        return (self.min_us or 0) / 1_000_000
+
+    @property
+    def max(self) -> float:
+        """Longest duration in seconds."""
+        return self.max_us / 1_000_000
+
+    def percentile(self, percent: float) -> float:
+        """Duration in seconds that ``percent`` of the recorded values do not exceed."""
+        return self.percentiles((percent,))[percent]
+
+    def percentiles(self, percents: Iterable[float] = REPORTED_PERCENTILES) -> Dict[float, float]:
+        """Several percentiles from a single pass over the buckets."""
+        percents = sorted(percents)
+        result = {percent: 0.0 for percent in percents}
+        if not self.count:
+            return result
+
+        pending = iter(percents)
+        percent = next(pending)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while seen >= self.count * percent / 100:
+                # Report the bucket's upper edge, but never past the largest real value
+                result[percent] = min(self._bucket_bounds(index)[1], self.max_us) / 1_000_000
+                percent = next(pending, None)
+                if percent is None:
+                    return result
+        return result
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, min, max and the reported percentiles, in milliseconds."""
+        summary = {
+            'count': self.count,
+            'mean_ms': round(self.mean * 1000, 3),
+            'min_ms': round(self.min * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+        }
+        for percent, seconds in self.percentiles().items():
+            summary[f"p{percent:g}_ms"] = round(seconds * 1000, 3)
+        return summary
+
+
+class RequestLatency:
+    """Connect, time-to-first-byte and total time of every API request.
+
+    Connect and time-to-first-byte are picked up by the aiohttp trace hooks
+    from ``trace_config``; the caller records the total once the body has
+    been read. Time to first byte runs from the start of the request to the
+    response headers, so it includes waiting for a pooled connection.
+    """
+
+    def __init__(self, highest: float = 120.0):
+        self.connect = LatencyHistogram(highest)
+        self.ttfb = LatencyHistogram(highest)
+        self.total = LatencyHistogram(highest)
+
+    def trace_config(self) -> 'aiohttp.TraceConfig':
+        """Trace hooks to pass to ``aiohttp.ClientSession(trace_configs=[...])``."""
+        import aiohttp
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params) -> None:
+            ctx.start = time.perf_counter()
+
+        async def on_connection_create_start(session, ctx, params) -> None:
+            ctx.connect_start = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params) -> None:
+            self.connect.record(time.perf_counter() - ctx.connect_start)
+
+        async def on_request_end(session, ctx, params) -> None:
+            self.ttfb.record(time.perf_counter() - ctx.start)
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-phase summaries, for JSON output."""
+        return {
+            'connect': self.connect.summary(),
+            'ttfb': self.ttfb.summary(),
+            'total': self.total.summary(),
+        }
@@ -0,0 +1,167 @@
+"""Running progress counters, the redraw loop and headless metric lines."""
+
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, TextIO
+
+if TYPE_CHECKING:
+    from result_model import CheckResult
+
+PROGRESS_STATUSES = ('VALID', 'TAKEN', 'CENSORED', 'INVALID_FORMAT', 'ERROR')
+_DISPLAY_STATUS = {status.lower(): status for status in PROGRESS_STATUSES}
+
+
+@dataclass
+class ProgressSnapshot:
+    """Consistent view of a run's progress at one moment."""
+    processed: int = 0
+    total: int = 0
+    elapsed: float = 0.0
+    counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(PROGRESS_STATUSES, 0))
+    valid_count: int = 0
+    first_valid: List[str] = field(default_factory=list)
+    last_valid: List[str] = field(default_factory=list)
+
+    @property
+    def progress(self) -> float:
+        """Percentage of the run that is finished."""
+        return (self.processed / self.total) * 100 if self.total else 0.0
+
+    @property
+    def rate(self) -> float:
+        """Usernames finished per second."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float:
+        """Seconds left at the current rate."""
+        rate = self.rate
+        # A streamed run's total can trail the names already finished
+        return (self.total - self.processed) / rate if rate > 0 and self.total > self.processed else 0.0
+
+    def to_record(self) -> Dict:
+        """Flat metrics for a headless log line."""
+        return {
+            'processed': self.processed,
+            'total': self.total,
+            'percent': round(self.progress, 2),
+            'elapsed': round(self.elapsed, 3),
+            'rps': round(self.rate, 1),
+            'eta': round(self.eta, 1),
+            **{status.lower(): count for status, count in self.counts.items()},
+        }
+
+
+def emit_metrics(event: str, record: Dict, stream: Optional[TextIO] = None) -> None:
+    """Write one JSON metrics line, for runs without a terminal."""
+    stream = stream or sys.stdout
+    stream.write(json.dumps({'ts': round(time.time(), 3), 'event': event, **record}) + "\n")
+    stream.flush()
+
+
+class ProgressCounters:
+    """Per-status totals updated once per finished result.
+
+    Counting as results arrive keeps the cost of each update constant, so a
+    redraw never has to walk the results list. Updates and snapshots take
+    the same lock, which makes each snapshot consistent.
+    """
+
+    def __init__(self, total: int = 0, preview: int = 15):
+        self.total = total
+        self.preview = preview
+        self.start_time = time.time()
+        self.counts = dict.fromkeys(PROGRESS_STATUSES, 0)
+        self.processed = 0
+        self.valid_usernames: List[str] = []
+        self._lock = threading.Lock()
+
+    def add(self, result: 'CheckResult') -> None:
+        """Count one finished result."""
+        status = _DISPLAY_STATUS.get(result.status, 'ERROR')
+        with self._lock:
+            self.counts[status] += 1
+            self.processed += 1
+            if status == 'VALID':
+                self.valid_usernames.append(result.username)
+
+    def add_many(self, results: Iterable['CheckResult']) -> None:
+        """Count several finished results."""
+        for result in results:
+            self.add(result)
+
+    def snapshot(self) -> ProgressSnapshot:
+        """Return the current totals."""
+        with self._lock:
+            return ProgressSnapshot(
+                processed=self.processed,
+                total=self.total,
+                elapsed=time.time() - self.start_time,
+                counts=dict(self.counts),
+                valid_count=len(self.valid_usernames),
+                first_valid=self.valid_usernames[:self.preview],
+                last_valid=self.valid_usernames[-self.preview:]
+            )
+
+
+class ProgressLoop:
+    """Redraw progress from a background thread on its own schedule.
+
+    The worker loop only updates counters; this thread takes a snapshot
+    every ``interval`` seconds and hands it to ``render``. ``poke`` asks for
+    an early redraw (e.g. when a valid name turns up); pokes that arrive
+    while a frame is being drawn are folded into the next one.
+    """
+
+    def __init__(self, counters: ProgressCounters, render: Callable[[ProgressSnapshot], None],
+                 interval: float = 0.5):
+        self.counters = counters
+        self.render = render
+        self.interval = interval
+        self.frames = 0
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'ProgressLoop':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Skip the last frame when interrupted, so it doesn't land on top of the goodbye message
+        self.stop(final_frame=exc_type is None)
+
+    def start(self) -> None:
+        """Start redrawing."""
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+        self._thread.start()
+
+    def poke(self) -> None:
+        """Redraw as soon as possible."""
+        self._wake.set()
+
+    def stop(self, final_frame: bool = True) -> None:
+        """Stop redrawing, optionally drawing one last up-to-date frame."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        if final_frame:
+            self._draw()
+
+    def _draw(self) -> None:
+        self.render(self.counters.snapshot())
+        self.frames += 1
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopping.is_set():
+                return
+            self._draw()
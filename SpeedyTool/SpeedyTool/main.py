@@ -11,88 +11,259 @@ Features:
 - Smart retry logic with exponential backoff
 - Memory-efficient streaming for massive username lists
 - Sub-second response time reporting with live statistics
+
+The HTTP client, rich display and system sampler are only imported once a
+run actually starts, so ``--help``, ``--dry-run`` and a missing input file
+return without loading them.
+
+With ``--source`` names come straight from the generator or standard input
+instead of a file, e.g. ``python username_generator.py ... | python main.py
+--source -`` or ``python main.py --source generate:count=50000``, and the
+first request goes out as soon as the first batch is ready.
 """
 
-import asyncio
+import argparse
 import sys
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+from candidate_source import CandidateSource, pull_async
+from checkpoint import Checkpoint
 from config import Config
-from username_checker import UltraUsernameChecker
+from result_sink import SINK_FORMATS, ResultSink
+from username_pipeline import prepare_usernames
+
+if TYPE_CHECKING:
+    from username_checker import UltraUsernameChecker
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Ultra-high-performance Roblox username checker")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run from its checkpoint instead of starting over")
+    parser.add_argument('--stream', action='store_true',
+                        help="stream the input file so memory stays flat regardless of its size")
+    parser.add_argument('--output', metavar='FILE',
+                        help="append results to FILE as they finish (default: $OUTPUT_FILE)")
+    parser.add_argument('--format', choices=sorted(SINK_FORMATS),
+                        help="output format (default: from the file extension, else csv)")
+    parser.add_argument('--headless', action='store_true',
+                        help="no live display; print a JSON metrics line every $METRICS_INTERVAL seconds")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="read, deduplicate and prefilter the input and report the counts; no requests")
+    parser.add_argument('--source', metavar='SPEC',
+                        help="check names as they are produced instead of reading $INPUT_FILE: '-' for stdin, "
+                             "'generate:count=N[,patterns=FILE][,seed=S][,state=FILE]' or a file; implies --stream")
+    return parser.parse_args(argv)
+
+
+def count_lines(file_path: str) -> int:
+    """Count lines in a file without decoding it, for progress reporting."""
+    count = 0
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            count += chunk.count(b'\n')
+    return count
+
+
+def dry_run(config: Config, source: str) -> int:
+    """Report what a run over ``source`` would send, without touching the network."""
+    from censor_filter import CensorFilter
+    from result_store import ResultStore
+    from taken_index import TakenIndex
+    
+    # Only consult a store and index that already exist; a dry run shouldn't create them
+    store = None
+    if config.result_store_path and Path(config.result_store_path).exists():
+        store = ResultStore.from_config(config)
+    taken = None
+    if config.taken_index_path and Path(config.taken_index_path).exists():
+        taken = TakenIndex.from_config(config)
+    # Not closed: nothing was saved, so the model's history must not change
+    censor = CensorFilter.from_config(config)
+    
+    try:
+        with CandidateSource(source, taken) as names:
+            batch = prepare_usernames(names, store, taken=taken, censor=censor)
+    finally:
+        if store:
+            store.close()
+        if taken is not None:
+            taken.close()
+    
+    print(f"🧪 Dry run of '{source}', no requests sent:")
+    print(f"📄 Usernames read: {batch.total_input:,}")
+    print(f"♻️ Duplicates collapsed: {batch.duplicates:,}")
+    print(f"🧹 Invalid format: {len(batch.invalid_format):,}")
+    print(f"🔒 Known taken: {len(batch.known_taken):,}")
+    if censor is not None:
+        print(f"🧠 Predicted censored: {len(batch.predicted_censored):,}")
+    print(f"💾 Answered from result store: {len(batch.cached):,}")
+    print(f"🌐 Would check: {len(batch.to_check):,}")
+    if batch.to_check:
+        print(f"⏱️ At least {len(batch.to_check) / config.max_requests_per_second:.1f}s "
+              f"at {config.max_requests_per_second:g} requests/second")
+    return 0
+
 
+async def run_streaming(checker: 'UltraUsernameChecker', config: Config) -> None:
+    """Stream the input file through the checker; results go to the checker's sink."""
+    print(f"🌊 Streaming usernames from '{config.input_file}'...")
+    total_lines = count_lines(config.input_file)
+    print(f"⚡ Starting ultra-fast processing of ~{total_lines:,} lines with up to "
+          f"{config.max_concurrent_requests} concurrent requests...")
+    print()
+    
+    await checker.process_stream(checker.stream_usernames(config.input_file), total_lines)
+
+
+async def run_source(checker: 'UltraUsernameChecker', config: Config, spec: str) -> None:
+    """Check names pulled from a candidate source as it produces them."""
+    with CandidateSource(spec, checker.flow.taken) as source:
+        checker.flow.source = source
+        print(f"🌊 Checking usernames from '{spec}' as they are produced...")
+        print(f"⚡ Starting ultra-fast processing with up to {config.max_concurrent_requests} concurrent requests...")
+        print()
+        
+        await checker.process_stream(pull_async(source, config.batch_size), source.count or 0)
 
-async def main():
+
+def print_resume_hint(args: argparse.Namespace) -> None:
+    """Tell an interrupted user how to carry on, which depends on where the names came from."""
+    if not args.source:
+        print("💾 Progress was checkpointed, run again with --resume to continue")
+    elif 'state=' in args.source:
+        print("💾 The generator's state file remembers where to carry on; run the same --source again")
+    else:
+        print("ℹ️ Names from --source aren't checkpointed; use a generator with 'state=FILE' to carry on")
+
+
+async def main(args: argparse.Namespace):
     """Main entry point for the ultra-high-performance username checker."""
     print("🚀 Ultra-High-Performance Roblox Username Checker")
     print("=" * 60)
     
     # Load configuration
     config = Config.from_env()
+    if args.output:
+        config.output_file = args.output
+    if args.format:
+        config.output_format = args.format
+    if args.headless:
+        config.headless = True
     
     # Verify input file exists
-    if not Path(config.input_file).exists():
+    if not args.source and not Path(config.input_file).exists():
         print(f"❌ Error: Input file '{config.input_file}' not found!")
         print(f"📝 Please create a file named '{config.input_file}' with usernames (one per line)")
         return 1
     
+    if args.dry_run:
+        return dry_run(config, args.source or config.input_file)
+    
+    # Loaded only now that there is real work to do
+    from username_checker import UltraUsernameChecker
+    
     start_time = time.time()
     
+    # A source has no file to checkpoint against; a generator resumes from its state file instead
+    checkpoint = None
+    if args.source:
+        if args.resume:
+            print("ℹ️ --resume has no effect with --source; a generator with 'state=FILE' "
+                  "carries on from the first name it had not finished")
+    else:
+        checkpoint = Checkpoint.open_for_run(config.input_file, args.resume, config.checkpoint_interval)
+        if checkpoint.completed:
+            print(f"⏩ Resuming: {len(checkpoint.completed):,} usernames already finished, "
+                  f"skipping the first {checkpoint.offset:,} lines")
+        elif args.resume:
+            print("ℹ️ No checkpoint found, starting from the beginning")
+    
+    # Results are appended as they finish; a resumed stream continues the
+    # previous output from the last checkpointed record
+    sink = None
+    if config.output_file:
+        resume_at = checkpoint.output_bytes if checkpoint and args.stream and checkpoint.offset else None
+        sink = ResultSink.from_config(config, config.output_file, resume_at)
+        if checkpoint:
+            checkpoint.sink = sink
+    
     try:
         # Create and run the username checker
         async with UltraUsernameChecker(config) as checker:
-            print(f"📂 Loading usernames from '{config.input_file}'...")
-            usernames = await checker.load_usernames(config.input_file)
-            
-            if not usernames:
-                print("❌ No usernames found in the input file!")
-                return 1
+            checker.flow.checkpoint = checkpoint
+            checker.flow.sink = sink
             
-            print(f"✅ Loaded {len(usernames):,} usernames")
-            print(f"⚡ Starting ultra-fast processing with up to {config.max_concurrent_requests} concurrent requests...")
-            print()
+            if args.source:
+                await run_source(checker, config, args.source)
+            elif args.stream:
+                await run_streaming(checker, config)
+            else:
+                print(f"📂 Loading usernames from '{config.input_file}'...")
+                usernames = await checker.load_usernames(config.input_file)
+                
+                if not usernames:
+                    print("❌ No usernames found in the input file!")
+                    return 1
+                
+                print(f"✅ Loaded {len(usernames):,} usernames")
+                print(f"⚡ Starting ultra-fast processing with up to {config.max_concurrent_requests} concurrent requests...")
+                print()
+                
+                # Process all usernames
+                await checker.process_usernames(usernames)
             
-            # Process all usernames
-            results = await checker.process_usernames(usernames)
-            
-            # Save results if output file is specified
-            if config.output_file:
-                print(f"\n💾 Saving results to '{config.output_file}'...")
-                await checker.save_results(config.output_file)
-                print(f"✅ Results saved to '{config.output_file}'")
+            # The monitor already logged a summary line in headless mode
+            if config.headless:
+                if checker.flow.censor is not None:
+                    print(checker.flow.censor.summary())
+                return 0
             
             # Print summary
             checker.print_summary()
             
-            # Calculate and display performance metrics
+            # Rates count requests that went out, not answers that were already known
             total_time = time.time() - start_time
-            avg_rps = len(usernames) / total_time if total_time > 0 else 0
+            sent = checker.requests_sent
+            avg_rps = sent / total_time if total_time > 0 else 0
             
             print(f"\n⚡ Performance Summary:")
             print(f"Total time: {total_time:.2f} seconds")
-            print(f"Average RPS: {avg_rps:.1f} requests/second")
-            
-            # Compare with original performance
-            original_time_estimate = len(usernames) * 0.05  # Original ~50ms per request
-            speedup = original_time_estimate / total_time if total_time > 0 else 1
-            print(f"🔥 Speedup: {speedup:.1f}x faster than original script!")
+            print(f"Requests sent: {sent:,}")
+            if sent:
+                print(f"Average RPS: {avg_rps:.1f} requests/second")
+            if checker.answered_locally:
+                print(f"Answered without a request: {checker.answered_locally:,} "
+                      f"(checkpoint, result store, taken index, censor filter)")
             
-            if total_time <= 10 and len(usernames) >= 2000:
+            if total_time <= 10 and sent >= 2000:
                 print("🎯 SUCCESS: Achieved sub-10-second processing for 2000+ usernames!")
     
     except KeyboardInterrupt:
         print("\n⏹️ Processing interrupted by user")
+        print_resume_hint(args)
         return 1
     except Exception as e:
         print(f"\n❌ An error occurred: {e}")
         return 1
+    finally:
+        if sink:
+            sink.close()
+            print(f"✅ {sink.records_written:,} results written to '{config.output_file}'")
     
     return 0
 
 
 def cli_main():
     """CLI entry point with proper error handling."""
+    args = None
     try:
+        args = parse_args()
+        import asyncio
+        
         # Optimize asyncio for performance
         if sys.platform == 'win32':
             # Use ProactorEventLoop on Windows for better performance
@@ -107,11 +278,13 @@ def cli_main():
                 pass
         
         # Run the main async function
-        exit_code = asyncio.run(main())
+        exit_code = asyncio.run(main(args))
         sys.exit(exit_code)
         
     except KeyboardInterrupt:
         print("\n⏹️ Interrupted by user")
+        if args is not None:
+            print_resume_hint(args)
         sys.exit(1)
     except Exception as e:
         print(f"💥 Fatal error: {e}")
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Local stand-in for the username validate endpoint, for benchmarks and dry runs."""
+
+import argparse
+import asyncio
+import random
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from aiohttp import web
+
+VALIDATE_PATH = "/v1/usernames/validate"
+
+MESSAGES = {
+    0: "Username is valid",
+    1: "Username is already in use",
+    2: "Username not appropriate for Roblox",
+}
+
+
+@dataclass
+class MockApiSettings:
+    """How the mock endpoint answers and misbehaves."""
+    latency: float = 0.05  # Median response time in seconds
+    latency_sigma: float = 0.5  # Log-normal spread; 0 makes every response take ``latency``
+    valid_fraction: float = 0.02  # Share of names answered as free
+    censored_fraction: float = 0.01  # Share of names answered as censored
+    blocked_fragments: Tuple[str, ...] = ()  # Names containing any of these (in any case) are censored too
+    error_rate: float = 0.0  # Share of requests answered with HTTP 500
+    rate_limit: float = 0.0  # Requests per second allowed before 429s; 0 never throttles
+    rate_burst: float = 50.0  # Requests allowed back to back
+    retry_after: float = 1.0  # Retry-After sent with 429s; 0 leaves the header out
+    seed: int = 1
+
+
+def expected_code(username: str, settings: MockApiSettings) -> int:
+    """The code the mock answers for ``username``; the same name always gets the same answer."""
+    name = username.lower()
+    if any(fragment in name for fragment in settings.blocked_fragments):
+        return 2
+    bucket = zlib.crc32(name.encode()) % 10_000 / 10_000
+    if bucket < settings.valid_fraction:
+        return 0
+    if bucket < settings.valid_fraction + settings.censored_fraction:
+        return 2
+    return 1
+
+
+@dataclass
+class MockApiStats:
+    """What the mock endpoint has answered so far."""
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    answers: Dict[int, int] = field(default_factory=lambda: dict.fromkeys(MESSAGES, 0))
+    query_formats: Dict[str, int] = field(default_factory=dict)  # e.g. {'Birthday&Username': 100}
+    first_request_at: Optional[float] = None  # time.perf_counter() when the first request arrived
+
+    def to_record(self) -> Dict:
+        """Flat counters for JSON output."""
+        return {
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'errors': self.errors,
+            'valid': self.answers[0],
+            'taken': self.answers[1],
+            'censored': self.answers[2],
+            'query_formats': dict(self.query_formats),
+        }
+
+
+class MockValidateApi:
+    """Serve ``/v1/usernames/validate`` on a local port.
+
+    Answers are a pure function of the username, so every checker can be
+    compared against the same expected results. Response times, HTTP 500s
+    and 429s come from a seeded random generator and a token bucket, which
+    keeps runs with the same settings comparable. Use ``async with`` from
+    an event loop, or ``with`` to serve from a background thread for
+    synchronous callers.
+    """
+
+    def __init__(self, settings: Optional[MockApiSettings] = None, host: str = "127.0.0.1", port: int = 0):
+        self.settings = settings or MockApiSettings()
+        self.host = host
+        self.port = port
+        self.stats = MockApiStats()
+        self._random = random.Random(self.settings.seed)
+        self._tokens = self.settings.rate_burst
+        self._refilled = time.monotonic()
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    @property
+    def url(self) -> str:
+        """Full URL of the validate endpoint, for ``Config.api_url``."""
+        return f"http://{self.host}:{self.port}{VALIDATE_PATH}"
+
+    async def __aenter__(self) -> 'MockValidateApi':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    def __enter__(self) -> 'MockValidateApi':
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve_forever, args=(ready,), name="mock-api", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join()
+        self._thread = None
+
+    async def start(self) -> None:
+        """Start serving in the running event loop."""
+        app = web.Application()
+        app.router.add_get(VALIDATE_PATH, self._validate)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port, backlog=1024)
+        await site.start()
+        # Port 0 asks the OS for a free one
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _serve_forever(self, ready: threading.Event) -> None:
+        async def serve() -> None:
+            self._loop = asyncio.get_running_loop()
+            self._stopping = asyncio.Event()
+            await self.start()
+            ready.set()
+            await self._stopping.wait()
+            await self.stop()
+
+        asyncio.run(serve())
+
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.settings.rate_burst,
+                           self._tokens + (now - self._refilled) * self.settings.rate_limit)
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _delay(self) -> float:
+        settings = self.settings
+        if settings.latency_sigma <= 0:
+            return settings.latency
+        return settings.latency * self._random.lognormvariate(0.0, settings.latency_sigma)
+
+    async def _validate(self, request: web.Request) -> web.Response:
+        if not self.stats.requests:
+            self.stats.first_request_at = time.perf_counter()
+        self.stats.requests += 1
+        query_format = '&'.join(sorted(request.query))
+        self.stats.query_formats[query_format] = self.stats.query_formats.get(query_format, 0) + 1
+        settings = self.settings
+        # Accept either capitalisation of the parameter names, like the real endpoint
+        username = request.query.get('Username') or request.query.get('username')
+        if not username:
+            return web.json_response({'code': 3, 'message': "Username is required"}, status=400)
+
+        if settings.rate_limit > 0 and not self._take_token():
+            self.stats.throttled += 1
+            headers = {'Retry-After': f"{settings.retry_after:g}"} if settings.retry_after > 0 else None
+            return web.json_response({'errors': [{'code': 0, 'message': "Too many requests"}]},
+                                     status=429, headers=headers)
+
+        await asyncio.sleep(self._delay())
+        if settings.error_rate > 0 and self._random.random() < settings.error_rate:
+            self.stats.errors += 1
+            return web.json_response({'errors': [{'code': 0, 'message': "InternalServerError"}]}, status=500)
+
+        code = expected_code(username, settings)
+        self.stats.answers[code] += 1
+        return web.json_response({'code': code, 'message': MESSAGES[code]})
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    defaults = MockApiSettings()
+    parser = argparse.ArgumentParser(description="Serve a local mock of the username validate endpoint.")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=defaults.latency, help="median response time in seconds")
+    parser.add_argument('--latency-sigma', type=float, default=defaults.latency_sigma)
+    parser.add_argument('--valid-fraction', type=float, default=defaults.valid_fraction)
+    parser.add_argument('--censored-fraction', type=float, default=defaults.censored_fraction)
+    parser.add_argument('--blocked', nargs='*', default=[], metavar='FRAGMENT',
+                        help="censor every name containing one of these fragments")
+    parser.add_argument('--error-rate', type=float, default=defaults.error_rate)
+    parser.add_argument('--rate-limit', type=float, default=defaults.rate_limit,
+                        help="requests per second before answering 429 (0 = never)")
+    parser.add_argument('--rate-burst', type=float, default=defaults.rate_burst)
+    parser.add_argument('--retry-after', type=float, default=defaults.retry_after)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    return parser.parse_args(argv)
+
+
+def settings_from_args(args: argparse.Namespace) -> MockApiSettings:
+    """Build mock settings from parsed ``parse_args``-style arguments."""
+    return MockApiSettings(
+        latency=args.latency,
+        latency_sigma=args.latency_sigma,
+        valid_fraction=args.valid_fraction,
+        censored_fraction=args.censored_fraction,
+        blocked_fragments=tuple(fragment.lower() for fragment in args.blocked),
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_burst=args.rate_burst,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Serve until interrupted."""
+    async with MockValidateApi(settings_from_args(args), args.host, args.port) as api:
+        print(f"🧪 Mock API listening on {api.url}")
+        print(f"💡 Point a checker at it with API_URL={api.url}")
+        await asyncio.Event().wait()
+
+
+def main(argv=None) -> int:
+    """Entry point."""
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        print("\n⏹️ Mock API stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,19 @@
 """Real-time performance monitoring and statistics."""
 
 import time
-import psutil
 import asyncio
-from typing import Dict, List, Optional
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional
 from dataclasses import dataclass, field
-from rich.console import Console
-from rich.progress import Progress, TaskID, TextColumn, BarColumn, TimeElapsedColumn, MofNCompleteColumn
-from rich.live import Live
-from rich.table import Table
-from rich.panel import Panel
-from rich.layout import Layout
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress, TaskID
+    from rich.live import Live
+    from rich.layout import Layout
+
+from latency_histogram import RequestLatency
+from live_progress import emit_metrics
 
 @dataclass
 class PerformanceMetrics:
@@ -50,39 +53,107 @@ class PerformanceMetrics:
             return float('inf')
         remaining = self.total_usernames - self.total_processed
         return remaining / self.avg_rps
+    
+    def to_record(self) -> Dict:
+        """Flat metrics for a headless log line."""
+        eta = self.eta_seconds
+        return {
+            'processed': self.total_processed,
+            'total': self.total_usernames,
+            'percent': round(self.completion_percentage, 2),
+            'elapsed': round(self.elapsed_time, 3),
+            'rps': round(self.current_rps, 1),
+            'avg_rps': round(self.avg_rps, 1),
+            'peak_rps': round(self.peak_rps, 1),
+            'eta': None if eta == float('inf') else round(eta, 1),
+            'concurrent': self.current_concurrent,
+            'valid': self.valid_count,
+            'taken': self.taken_count,
+            'censored': self.censored_count,
+            'errors': self.error_count,
+            'network_errors': self.network_errors,
+            'timeouts': self.timeouts,
+            'memory_mb': round(self.memory_usage_mb, 1),
+            'cpu_percent': round(self.cpu_percent, 1),
+        }
 
 class PerformanceMonitor:
-    """Real-time performance monitoring with rich display."""
+    """Real-time performance monitoring with rich display.
+    
+    In headless mode (``config.headless``) there is no live display; a JSON
+    metrics line is printed every ``config.metrics_interval`` seconds and
+    once more at the end.
+    
+    The refresh task is owned by the monitor and cancelled by ``stop``.
+    Memory and CPU are sampled by a background thread, so the event loop
+    only ever copies numbers and redraws; ``overhead`` reports the share of
+    wall time the refresh task spent on the loop. ``rich`` is only loaded
+    for the live display and ``psutil`` by the sampler thread, so neither
+    delays a headless start.
+    """
     
     def __init__(self, total_usernames: int, config):
         self.config = config
+        self.headless = config.headless
         self.metrics = PerformanceMetrics(total_usernames=total_usernames)
-        self.console = Console()
-        
-        # Rich progress components
-        self.progress = Progress(
-            TextColumn("[bold blue]{task.description}"),
-            BarColumn(bar_width=None),
-            MofNCompleteColumn(),
-            TextColumn("[progress.percentage]{task.percentage:>3.1f}%"),
-            TimeElapsedColumn(),
-            console=self.console,
-            expand=True
-        )
         
-        self.main_task: Optional[TaskID] = None
-        self.live: Optional[Live] = None
+        # Rich display components, created when the live display starts
+        self.console: Optional['Console'] = None
+        self.progress: Optional['Progress'] = None
+        self.main_task: Optional['TaskID'] = None
+        self.live: Optional['Live'] = None
+        self.layout: Optional['Layout'] = None
         
-        # Performance tracking
+        # Performance tracking; per-request latency is set by the checker
+        self.latency: Optional[RequestLatency] = None
         self.rps_history: List[float] = []
         self.last_update_time = time.time()
         self.last_processed_count = 0
         
         # System monitoring
-        self.process = psutil.Process()
+        self.system_sample_interval = 1.0
+        
+        # Refresh task and system sampler, both torn down by stop()
+        self._task: Optional[asyncio.Task] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+        self._started_at: Optional[float] = None
+        
+        # Self-measurement
+        self.loop_seconds = 0.0  # Event-loop time spent refreshing
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_error: Optional[Exception] = None
         
     async def start(self) -> None:
         """Start the performance monitor."""
+        self._started_at = time.perf_counter()
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample_system, name="monitor-sampler", daemon=True)
+        self._sampler.start()
+        
+        if not self.headless:
+            self._start_display()
+        self._task = asyncio.create_task(self._monitor_loop())
+    
+    def _start_display(self) -> None:
+        """Set up and start the rich live display."""
+        from rich.console import Console
+        from rich.progress import Progress, TextColumn, BarColumn, TimeElapsedColumn, MofNCompleteColumn
+        from rich.live import Live
+        from rich.layout import Layout
+        
+        if self.console is None:
+            self.console = Console()
+        self.progress = Progress(
+            TextColumn("[bold blue]{task.description}"),
+            BarColumn(bar_width=None),
+            MofNCompleteColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.1f}%"),
+            TimeElapsedColumn(),
+            console=self.console,
+            expand=True
+        )
         self.main_task = self.progress.add_task(
             "Processing usernames...", 
             total=self.metrics.total_usernames
@@ -98,19 +169,32 @@ class PerformanceMonitor:
         )
         
         # Start live display
+        self.layout = layout
         self.live = Live(layout, console=self.console, refresh_per_second=10)
         self.live.start()
-        
-        # Start monitoring task
-        asyncio.create_task(self._monitor_loop())
     
     async def stop(self) -> None:
         """Stop the performance monitor."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._sampler:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
         if self.live:
             self.live.stop()
+            self.live = None
         
         # Print final summary
-        await self._print_final_summary()
+        if self.headless:
+            record = self.metrics.to_record()
+            if self.latency:
+                record['latency'] = self.latency.summary()
+            emit_metrics('summary', record)
+        else:
+            await self._print_final_summary()
     
     def update_progress(self, processed: int, results: Dict[str, int]) -> None:
         """Update progress and metrics."""
@@ -119,9 +203,6 @@ class PerformanceMonitor:
         self.metrics.taken_count = results.get('taken', 0)
         self.metrics.censored_count = results.get('censored', 0)
         self.metrics.error_count = results.get('errors', 0)
-        
-        if self.main_task:
-            self.progress.update(self.main_task, completed=processed)
     
     def record_network_error(self) -> None:
         """Record a network error."""
@@ -135,20 +216,46 @@ class PerformanceMonitor:
         """Update current concurrent request count."""
         self.metrics.current_concurrent = concurrent
     
+    @property
+    def overhead(self) -> float:
+        """Fraction of wall time the refresh task has spent on the event loop."""
+        if self._started_at is None:
+            return 0.0
+        elapsed = time.perf_counter() - self._started_at
+        return self.loop_seconds / elapsed if elapsed > 0 else 0.0
+    
     async def _monitor_loop(self) -> None:
-        """Main monitoring loop."""
+        """Refresh metrics and the display until cancelled."""
+        interval = self.config.metrics_interval if self.headless else self.config.progress_update_interval
         while True:
+            began = time.perf_counter()
             try:
-                await self._update_metrics()
-                await self._update_display()
-                await asyncio.sleep(self.config.progress_update_interval)
-            except asyncio.CancelledError:
-                break
+                self._update_metrics()
+                if self.headless:
+                    emit_metrics('progress', self.metrics.to_record())
+                else:
+                    self._update_display()
             except Exception as e:
-                # Don't let monitoring errors crash the main process
-                continue
+                # Don't let monitoring errors crash the main process, and
+                # still wait out the interval so a failing step can't spin
+                self.refresh_errors += 1
+                self.last_error = e
+            self.loop_seconds += time.perf_counter() - began
+            self.refreshes += 1
+            await asyncio.sleep(interval)
+    
+    def _sample_system(self) -> None:
+        """Sample memory and CPU usage from a background thread until stopped."""
+        import psutil
+        process = psutil.Process()
+        while not self._stop_sampling.wait(self.system_sample_interval):
+            try:
+                self.metrics.memory_usage_mb = process.memory_info().rss / 1024 / 1024
+                self.metrics.cpu_percent = process.cpu_percent()
+            except psutil.Error:
+                pass
     
-    async def _update_metrics(self) -> None:
+    def _update_metrics(self) -> None:
         """Update performance metrics."""
         current_time = time.time()
         time_delta = current_time - self.last_update_time
@@ -169,22 +276,21 @@ class PerformanceMonitor:
                 self.metrics.avg_rps = sum(self.rps_history) / len(self.rps_history)
                 self.metrics.peak_rps = max(self.rps_history)
             
-            # Update system metrics
-            try:
-                self.metrics.memory_usage_mb = self.process.memory_info().rss / 1024 / 1024
-                self.metrics.cpu_percent = self.process.cpu_percent()
-            except:
-                pass
-            
             self.last_update_time = current_time
             self.last_processed_count = self.metrics.total_processed
     
-    async def _update_display(self) -> None:
+    def _update_display(self) -> None:
         """Update the live display."""
         if not self.live:
             return
+        from rich.panel import Panel
+        from rich.table import Table
+        
+        if self.main_task is not None:
+            self.progress.update(self.main_task, completed=self.metrics.total_processed)
         
-        layout = self.live.renderable
+        # Newer rich versions wrap Live.renderable in a Group, so keep our own handle
+        layout = self.layout
         
         # Header
         layout["header"].update(
@@ -248,6 +354,8 @@ class PerformanceMonitor:
     
     async def _print_final_summary(self) -> None:
         """Print final performance summary."""
+        from rich.table import Table
+        
         elapsed = self.metrics.elapsed_time
         
         summary_table = Table(title="🎯 Final Performance Summary", show_header=True, header_style="bold green")
@@ -264,11 +372,21 @@ class PerformanceMonitor:
         summary_table.add_row("Total Errors", f"{self.metrics.error_count:,}")
         summary_table.add_row("Success Rate", f"{((self.metrics.total_processed - self.metrics.error_count) / max(1, self.metrics.total_processed) * 100):.1f}%")
         
-        # Performance comparison
-        old_time_estimate = self.metrics.total_processed * 0.05  # Old script ~50ms per request
-        speedup = old_time_estimate / elapsed if elapsed > 0 else 1
-        summary_table.add_row("Speedup vs Original", f"{speedup:.1f}x faster")
-        
         self.console.print("\n")
         self.console.print(summary_table)
-        self.console.print(f"\n🎉 [bold green]Processing completed! Achieved {speedup:.1f}x speedup over the original tool.[/bold green]")
+        
+        if self.latency and self.latency.total.count:
+            latency_table = Table(title="⏱️ Request Latency (ms)", show_header=True, header_style="bold cyan")
+            latency_table.add_column("Phase", style="white")
+            for column in ("Count", "p50", "p90", "p99", "p99.9", "Max"):
+                latency_table.add_column(column, style="green", justify="right")
+            for phase, histogram in (("Connect", self.latency.connect), ("First byte", self.latency.ttfb),
+                                     ("Total", self.latency.total)):
+                p = histogram.percentiles()
+                latency_table.add_row(
+                    phase, f"{histogram.count:,}",
+                    *(f"{p[percent] * 1000:.1f}" for percent in (50.0, 90.0, 99.0, 99.9)),
+                    f"{histogram.max * 1000:.1f}"
+                )
+            self.console.print(latency_table)
+        self.console.print(f"\n🎉 [bold green]Processing completed at {self.metrics.avg_rps:.1f} usernames/second.[/bold green]")
@@ -2,9 +2,13 @@
 
 import asyncio
 import time
-from typing import Dict, List
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Callable, Deque, Mapping, Optional
 from dataclasses import dataclass
 
+from latency_histogram import LatencyHistogram
+
 @dataclass
 class RateLimitStats:
     """Statistics for rate limiting decisions."""
@@ -13,17 +17,285 @@ class RateLimitStats:
     error_rate: float = 0.0
     requests_per_second: float = 0.0
 
+class ConcurrencyLimiter:
+    """Counting limiter whose limit can be changed while permits are held.
+    
+    A permit is counted in ``in_flight`` from the moment it is granted until
+    it is released, so the count is always exact. Waiters are served first
+    come, first served. Raising the limit wakes waiters right away; lowering
+    it never revokes a held permit, but no new ones are granted until
+    ``in_flight`` has dropped below the new limit.
+    """
+    
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self._limit = limit
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.peak_in_flight = 0
+    
+    @property
+    def limit(self) -> int:
+        """Maximum number of permits granted at once."""
+        return self._limit
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of permits currently held."""
+        return self._in_flight
+    
+    @property
+    def waiting(self) -> int:
+        """Number of callers waiting for a permit."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+    
+    async def acquire(self) -> None:
+        """Wait for a permit."""
+        if self._in_flight < self._limit and not self._waiters:
+            self._grant()
+            return
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        # Waiters ahead of us may all have been cancelled already
+        self._wake()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The permit was handed over just before the cancellation
+                self.release()
+            raise
+    
+    def release(self) -> None:
+        """Return a permit."""
+        if self._in_flight <= 0:
+            raise RuntimeError("release() called without a held permit")
+        self._in_flight -= 1
+        self._wake()
+    
+    def resize(self, limit: int) -> None:
+        """Change the limit; takes effect for the next permit granted."""
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self._limit = limit
+        self._wake()
+    
+    async def __aenter__(self) -> 'ConcurrencyLimiter':
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+    
+    def _grant(self) -> None:
+        self._in_flight += 1
+        if self._in_flight > self.peak_in_flight:
+            self.peak_in_flight = self._in_flight
+    
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self._limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue  # Cancelled while waiting
+            self._grant()
+            waiter.set_result(None)
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Return the seconds to wait from a ``Retry-After`` header (delta or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - (now or time.time()))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucketPacer:
+    """Token bucket that spaces requests out to stay under the API's rate limit.
+    
+    Tokens refill at ``rate`` per second up to ``burst``; each request takes
+    one, waiting for it if the bucket is empty. The rate starts at the
+    configured ceiling and is steered by what the API says:
+    
+    - a 429 pauses every caller for ``Retry-After`` seconds, or one token
+      interval without it, and cuts the rate by ``BACKOFF``; the rest of
+      that window's 429s were sent at the same rate, so they don't cut it
+      again;
+    - ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` spread the remaining
+      quota over the rest of the window and pause when it is used up;
+    - otherwise the rate climbs back linearly, within ``RECOVERY_SECONDS``
+      to the last rate that held, then slowly past it.
+    
+    The rate that held is the one the headers allow or, after a 429, the
+    rate that drew it times the share of that window's responses that
+    weren't 429: requests were going out that fast, and the API let that
+    share of them through. Climbing back to it rather than to the ceiling
+    lets a run settle just under the limit instead of bouncing off it.
+    """
+    
+    BACKOFF = 0.5
+    RECOVERY_SECONDS = 1.0
+    PROBE_SECONDS = 600.0  # To double the rate that held
+    MIN_SAMPLE = 10  # Responses a window needs before its share says anything
+    
+    def __init__(self, max_rate: float, burst: float = 1.0, min_rate: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_rate <= 0 or min_rate <= 0:
+            raise ValueError("rates must be positive")
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.burst = max(1.0, burst)
+        self.clock = clock
+        
+        self.rate = max_rate
+        self.tokens = self.burst
+        self.paused_until = 0.0
+        self.limited_rate: Optional[float] = None  # Rate that last drew a 429
+        self.held_rate: Optional[float] = None
+        self._updated = clock()
+        self._raised = self._updated  # When _speed_up last ran
+        self._window_end = 0.0  # 429s until then belong to the last back-off
+        self._window_answered = 0
+        self._window_throttled = 0
+        
+        # Statistics
+        self.throttled = 0
+        self.waited = 0.0
+    
+    def _refill(self, now: float) -> None:
+        start = max(self._updated, self.paused_until)
+        if now > start:
+            self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+        self._updated = max(self._updated, now)
+    
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it.
+        
+        The bucket may go negative, which queues callers behind each other
+        at exactly ``rate`` without a lock.
+        """
+        now = self.clock()
+        self._refill(now)
+        self.tokens -= 1.0
+        delay = max(0.0, self.paused_until - now)
+        if self.tokens < 0:
+            delay += -self.tokens / self.rate
+        return delay
+    
+    async def wait(self) -> None:
+        """Wait until the next request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            self.waited += delay
+            await asyncio.sleep(delay)
+    
+    def observe(self, status: int, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Adjust the pace from an API response's status and rate-limit headers."""
+        headers = headers or {}
+        now = self.clock()
+        
+        if status == 429:
+            self.throttled += 1
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            self._back_off(now, retry_after)
+            return
+        
+        remaining = self._header_number(headers, 'X-RateLimit-Remaining')
+        reset = self._header_number(headers, 'X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            if reset > 1e9:
+                reset -= time.time()  # An epoch timestamp rather than a delta
+            reset = max(reset, 0.0)
+            if remaining < 1:
+                self._pause(now, reset)
+                return
+            if reset > 0:
+                self.held_rate = max(self.min_rate, min(self.max_rate, remaining / reset))
+                self._set_rate(now, self.held_rate)
+                return
+        
+        self._speed_up(now)
+    
+    def _back_off(self, now: float, retry_after: Optional[float]) -> None:
+        window = retry_after if retry_after is not None else 1.0 / self.rate
+        # Everything in flight when the limit was hit comes back together; it is one signal
+        if now >= self._window_end:
+            self.limited_rate = self.rate
+            self._set_rate(now, max(self.min_rate, self.rate * self.BACKOFF))
+            self._window_end = now + window
+            self._window_answered = self._window_throttled = 0
+        self._window_throttled += 1
+        self._pause(now, window)
+        self._raised = self.paused_until
+    
+    def _set_rate(self, now: float, rate: float) -> None:
+        # Callers already queued wait out their delays at the old rate; rescaling
+        # the debt keeps new ones behind them instead of overtaking in a burst
+        self._refill(now)
+        if self.tokens < 0:
+            self.tokens *= rate / self.rate
+        self.rate = rate
+    
+    def _pause(self, now: float, seconds: float) -> None:
+        self._refill(now)
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = min(self.tokens, 0.0)
+    
+    def _speed_up(self, now: float) -> None:
+        if now < self._window_end:
+            self._window_answered += 1
+        if self.rate >= self.max_rate or now < self.paused_until:
+            return
+        if self._window_throttled:
+            self._learn_held_rate(now)
+        elapsed, self._raised = now - self._raised, now
+        
+        # Additive steps: quickly back to what held, then carefully past it
+        held = self.held_rate or self.rate
+        if self.rate < held:
+            self._set_rate(now, min(held, self.rate + elapsed * held / self.RECOVERY_SECONDS))
+        else:
+            self._set_rate(now, min(self.max_rate, self.rate + elapsed * held / self.PROBE_SECONDS))
+    
+    def _learn_held_rate(self, now: float) -> None:
+        answered, throttled = self._window_answered, self._window_throttled
+        self._window_answered = self._window_throttled = 0
+        if answered + throttled >= self.MIN_SAMPLE:
+            share = answered / (answered + throttled)
+            self.held_rate = max(self.min_rate, self.limited_rate * share)
+            self._set_rate(now, min(self.rate, self.held_rate))  # Half the rate that drew it may still be too fast
+        elif self.held_rate is not None and self.limited_rate <= self.held_rate:
+            self.held_rate = None  # Drew a 429 itself, so it no longer holds
+    
+    @staticmethod
+    def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+        value = headers.get(name)
+        if value is None:
+            return None
+        try:
+            # Some APIs send several windows, e.g. "100, 100;w=60"; the first one binds
+            return float(str(value).split(',')[0].split(';')[0])
+        except ValueError:
+            return None
+
 class AdaptiveRateLimiter:
     """Intelligent rate limiter that adapts to API performance."""
     
     def __init__(self, config):
         self.config = config
-        self.semaphore = asyncio.Semaphore(config.initial_concurrent_requests)
-        self.current_delay = config.base_delay
+        self.limiter = ConcurrencyLimiter(config.initial_concurrent_requests)
+        self.pacer = TokenBucketPacer(config.max_requests_per_second, config.pacer_burst,
+                                      config.min_requests_per_second)
         self.current_concurrent = config.initial_concurrent_requests
         
         # Performance tracking
-        self.response_times: List[float] = []
+        self.response_times = LatencyHistogram()
+        self.recent_response_time: Optional[float] = None  # Moving average over roughly the last 10
         self.error_count = 0
         self.success_count = 0
         self.last_stats_time = time.time()
@@ -35,26 +307,34 @@ class AdaptiveRateLimiter:
         
     async def acquire(self) -> None:
         """Acquire permission to make a request."""
-        await self.semaphore.acquire()
+        await self.limiter.acquire()
         
-        # Apply dynamic delay
-        if self.current_delay > 0:
-            await asyncio.sleep(self.current_delay)
+        # Stay under the API's rate limit
+        try:
+            await self.pacer.wait()
+        except BaseException:
+            self.limiter.release()
+            raise
     
     def release(self) -> None:
-        """Release the semaphore."""
-        self.semaphore.release()
+        """Release the permit taken by ``acquire``."""
+        self.limiter.release()
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding a permit."""
+        return self.limiter.in_flight
     
     def record_success(self, response_time: float) -> None:
         """Record a successful request."""
         self.success_count += 1
         self.consecutive_successes += 1
         self.consecutive_errors = 0
-        self.response_times.append(response_time)
-        
-        # Keep only recent response times
-        if len(self.response_times) > 100:
-            self.response_times = self.response_times[-50:]
+        self.response_times.record(response_time)
+        if self.recent_response_time is None:
+            self.recent_response_time = response_time
+        else:
+            self.recent_response_time += 0.2 * (response_time - self.recent_response_time)
         
         # Adapt rate limiting based on success
         self._adapt_on_success()
@@ -72,8 +352,8 @@ class AdaptiveRateLimiter:
         """Adapt rate limiting after successful requests."""
         # If we have consistent successes and good response times, increase throughput
         if (self.consecutive_successes >= 10 and 
-            self.response_times and 
-            sum(self.response_times[-10:]) / min(10, len(self.response_times)) < 0.5):
+            self.recent_response_time is not None and 
+            self.recent_response_time < 0.5):
             
             # Increase concurrency if below max
             if self.current_concurrent < self.config.max_concurrent_requests:
@@ -84,53 +364,24 @@ class AdaptiveRateLimiter:
                 )
                 if self.current_concurrent != old_concurrent:
                     self._update_semaphore()
-            
-            # Decrease delay
-            self.current_delay = max(
-                self.config.base_delay,
-                self.current_delay * 0.9
-            )
     
     def _adapt_on_error(self, error_type: str) -> None:
         """Adapt rate limiting after errors."""
-        # Different strategies for different error types
+        # Rate limits are the pacer's job: it sees the 429 and its headers and
+        # slows the request rate instead of idling concurrency slots
         if "429" in error_type or "rate" in error_type.lower():
-            # Rate limit hit - be more aggressive in backing off
-            self.current_delay = min(
-                self.config.max_delay,
-                self.current_delay * self.config.backoff_factor * 2
-            )
-            # Reduce concurrency more aggressively
-            self.current_concurrent = max(
-                self.config.min_concurrent_requests,
-                int(self.current_concurrent * 0.5)
-            )
-        else:
-            # General error - moderate backoff
-            self.current_delay = min(
-                self.config.max_delay,
-                self.current_delay * self.config.backoff_factor
-            )
-            # Slight reduction in concurrency
-            self.current_concurrent = max(
-                self.config.min_concurrent_requests,
-                int(self.current_concurrent * 0.8)
-            )
+            return
         
+        # General error - slight reduction in concurrency
+        self.current_concurrent = max(
+            self.config.min_concurrent_requests,
+            int(self.current_concurrent * 0.8)
+        )
         self._update_semaphore()
     
     def _update_semaphore(self) -> None:
-        """Update semaphore with new concurrency limit."""
-        # Create new semaphore with updated limit
-        current_value = self.semaphore._value
-        self.semaphore = asyncio.Semaphore(self.current_concurrent)
-        # Try to preserve some of the current permits
-        if current_value > 0:
-            for _ in range(min(current_value, self.current_concurrent)):
-                try:
-                    self.semaphore._value -= 1
-                except:
-                    break
+        """Apply the new concurrency limit to the shared limiter."""
+        self.limiter.resize(self.current_concurrent)
     
     def get_stats(self) -> RateLimitStats:
         """Get current rate limiting statistics."""
@@ -142,9 +393,7 @@ class AdaptiveRateLimiter:
         success_rate = self.success_count / total_requests
         error_rate = self.error_count / total_requests
         
-        avg_response_time = 0.0
-        if self.response_times:
-            avg_response_time = sum(self.response_times) / len(self.response_times)
+        avg_response_time = self.response_times.mean
         
         # Calculate requests per second
         current_time = time.time()
@@ -164,5 +413,5 @@ class AdaptiveRateLimiter:
         """Reset statistics for new measurement period."""
         self.success_count = 0
         self.error_count = 0
-        self.response_times.clear()
+        self.response_times.reset()
         self.last_stats_time = time.time()
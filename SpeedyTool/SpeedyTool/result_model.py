@@ -0,0 +1,98 @@
+"""Compact in-memory results, shared by the async and threaded checkers."""
+
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Every status a result can end up with; anything else is stored as 'error'
+RESULT_STATUSES = ('valid', 'taken', 'censored', 'invalid_format', 'error')
+_STATUS_INDEX = {status: index for index, status in enumerate(RESULT_STATUSES)}
+_ERROR_INDEX = _STATUS_INDEX['error']
+_NO_CODE = -0x8000
+
+
+def normalize_status(status: str) -> str:
+    """Map any status spelling onto one of ``RESULT_STATUSES``."""
+    status = status.lower()
+    return status if status in _STATUS_INDEX else 'error'
+
+
+@dataclass(slots=True)
+class CheckResult:
+    """Result of a username check."""
+    username: str
+    status: str  # 'valid', 'taken', 'censored', 'invalid_format', 'error'
+    code: Optional[int] = None
+    error_message: Optional[str] = None
+    response_time: float = 0.0
+
+
+class ResultTable:
+    """Append-only, column-per-field store for a run's results.
+
+    A list of result objects costs a Python object, a float and usually a
+    dict or instance ``__dict__`` per name. Here each result is one
+    username reference plus a status byte, a 16-bit code and a 32-bit
+    response time in flat arrays; error messages are kept sparsely, since
+    most results don't have one. Iterating or indexing hands out
+    ``CheckResult`` rows built on the fly.
+    """
+
+    __slots__ = ('usernames', 'statuses', 'codes', 'response_times', 'errors')
+
+    def __init__(self, results: Iterable[CheckResult] = ()):
+        self.usernames: List[str] = []
+        self.statuses = bytearray()
+        self.codes = array('h')
+        self.response_times = array('f')
+        self.errors: Dict[int, str] = {}
+        self.extend(results)
+
+    def append(self, result: CheckResult) -> None:
+        """Store one result."""
+        if result.error_message:
+            self.errors[len(self.usernames)] = result.error_message
+        self.usernames.append(result.username)
+        self.statuses.append(_STATUS_INDEX.get(result.status, _ERROR_INDEX))
+        code = result.code
+        self.codes.append(code if code is not None and -0x8000 < code < 0x8000 else _NO_CODE)
+        self.response_times.append(result.response_time)
+
+    def extend(self, results: Iterable[CheckResult]) -> None:
+        """Store several results."""
+        for result in results:
+            self.append(result)
+
+    def __len__(self) -> int:
+        return len(self.usernames)
+
+    def __getitem__(self, index: int) -> CheckResult:
+        if index < 0:
+            index += len(self.usernames)
+        code = self.codes[index]
+        return CheckResult(
+            username=self.usernames[index],
+            status=RESULT_STATUSES[self.statuses[index]],
+            code=None if code == _NO_CODE else code,
+            error_message=self.errors.get(index),
+            response_time=self.response_times[index]
+        )
+
+    def __iter__(self) -> Iterator[CheckResult]:
+        for index in range(len(self.usernames)):
+            yield self[index]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of results per status."""
+        return {status: self.statuses.count(index) for index, status in enumerate(RESULT_STATUSES)}
+
+    def usernames_with(self, status: str) -> List[str]:
+        """Usernames whose result has ``status``, in the order they finished."""
+        wanted = _STATUS_INDEX[status]
+        usernames = self.usernames
+        found = []
+        start = self.statuses.find(wanted)
+        while start != -1:
+            found.append(usernames[start])
+            start = self.statuses.find(wanted, start + 1)
+        return found
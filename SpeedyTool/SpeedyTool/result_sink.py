@@ -0,0 +1,270 @@
+"""Buffered, append-only result writers that run alongside the checkers."""
+
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Iterator, List, NamedTuple, Optional
+
+# Statuses stored as a single byte in the binary format; anything else
+# (e.g. 'UNKNOWN_7', 'HTTP_429') is written out in full after the record
+BINARY_STATUSES = ('valid', 'taken', 'censored', 'invalid_format', 'error')
+BINARY_MAGIC = b'USRB\x01\n'
+_CUSTOM_STATUS = 0xFF
+_NO_CODE = -0x8000
+# status index, code, response time, username length, error length
+_RECORD = struct.Struct('<BhfHH')
+
+
+class SinkRecord(NamedTuple):
+    """One finished username as written to an output file."""
+    username: str
+    status: str
+    code: Optional[int]
+    response_time: float = 0.0
+    error: Optional[str] = None
+
+
+class ResultSink(ABC):
+    """Append results to a file as they finish, without blocking the caller.
+
+    Encoded records collect in an in-memory buffer that a background writer
+    thread drains once it holds ``flush_bytes`` bytes or ``flush_interval``
+    seconds have passed, so disk I/O overlaps with network work. Records are
+    only ever written whole and each flush is fsynced; ``sync`` returns the
+    durable file size. The checkpoint notes ``tell()`` whenever it advances
+    and syncs before saving it, so a resumed run can cut the file back to
+    exactly the records its offset covers.
+    """
+
+    extension = ''
+    header = b''
+
+    def __init__(self, path: str, resume_at: Optional[int] = None,
+                 flush_bytes: int = 256 * 1024, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.records_written = 0
+
+        if resume_at is not None and os.path.exists(path):
+            self._file = open(path, 'r+b')
+            self._file.truncate(max(resume_at, len(self.header)))
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(self.header)
+        self._position = self._file.tell()
+        self._end = self._position
+
+        self._lock = threading.Lock()
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue()  # None = flush, Event = flush and signal, False = stop
+        self._writer = threading.Thread(target=self._run_writer, name=f"sink-{os.path.basename(path)}",
+                                        daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def from_config(config, path: str, resume_at: Optional[int] = None) -> 'ResultSink':
+        """Open a sink at ``path`` using the output settings in ``config``."""
+        return open_sink(path, config.output_format, resume_at,
+                         config.output_flush_bytes, config.output_flush_interval)
+
+    def __enter__(self) -> 'ResultSink':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @abstractmethod
+    def encode(self, record: SinkRecord) -> bytes:
+        """Serialize one record, including its terminator."""
+
+    def write(self, username: str, status: str, code: Optional[int] = None,
+              response_time: float = 0.0, error: Optional[str] = None) -> None:
+        """Buffer one result; it reaches the disk on the next flush."""
+        self.write_records([SinkRecord(username, status, code, response_time, error)])
+
+    def write_records(self, records: List[SinkRecord]) -> None:
+        """Buffer several results at once."""
+        if self._error is not None:
+            raise self._error
+        data = b''.join(self.encode(record) for record in records)
+        with self._lock:
+            self._buffer.append(data)
+            self._buffered += len(data)
+            self._end += len(data)
+            self.records_written += len(records)
+            due = (self._buffered >= self.flush_bytes
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self._queue.put(None)
+
+    def tell(self) -> int:
+        """Return the file size once everything written so far is flushed."""
+        with self._lock:
+            return self._end
+
+    def sync(self) -> int:
+        """Write and fsync everything buffered so far; returns the file size."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._position
+
+    def reset(self) -> None:
+        """Drop everything written so far and start the file over."""
+        with self._lock:
+            self._buffer, self._buffered = [], 0
+            self.records_written = 0
+        self.sync()
+        self._file.truncate(len(self.header))
+        self._file.seek(0, os.SEEK_END)
+        self._position = self._end = self._file.tell()
+
+    def close(self) -> None:
+        """Flush everything and stop the writer thread."""
+        if self._file.closed:
+            return
+        try:
+            self.sync()
+        finally:
+            self._queue.put(False)
+            self._writer.join()
+            self._file.close()
+
+    def _run_writer(self) -> None:
+        while True:
+            try:
+                request = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                request = None  # Time-based flush while the caller is busy elsewhere
+            if request is False:
+                return
+
+            try:
+                self._drain()
+            except BaseException as e:
+                self._error = e
+            if request is not None:
+                request.set()
+
+    def _drain(self) -> None:
+        with self._lock:
+            data, self._buffer, self._buffered = self._buffer, [], 0
+            self._last_flush = time.monotonic()
+        if not data:
+            return
+        self._file.write(b''.join(data))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._position = self._file.tell()
+
+
+class CsvSink(ResultSink):
+    """Comma-separated rows, one result per line."""
+
+    extension = '.csv'
+    header = b'Username,Status,Code,ResponseTime,ErrorMessage\n'
+
+    def encode(self, record: SinkRecord) -> bytes:
+        code = '' if record.code is None else record.code
+        error = (record.error or '').replace(',', ';').replace('\n', ' ')
+        return f"{record.username},{record.status},{code},{record.response_time:.3f},{error}\n".encode('utf-8')
+
+
+class JsonlSink(ResultSink):
+    """One JSON object per line."""
+
+    extension = '.jsonl'
+
+    def encode(self, record: SinkRecord) -> bytes:
+        data = {'username': record.username, 'status': record.status, 'code': record.code}
+        if record.response_time:
+            data['response_time'] = round(record.response_time, 4)
+        if record.error:
+            data['error'] = record.error
+        return (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+class BinarySink(ResultSink):
+    """Fixed-size record headers followed by UTF-8 strings; read back with ``read_binary_results``."""
+
+    extension = '.bin'
+    header = BINARY_MAGIC
+
+    def encode(self, record: SinkRecord) -> bytes:
+        username = record.username.encode('utf-8')
+        error = (record.error or '').encode('utf-8')[:0xFFFF]
+        status = record.status.lower()
+        code = _NO_CODE if record.code is None else record.code
+
+        if status in BINARY_STATUSES:
+            return (_RECORD.pack(BINARY_STATUSES.index(status), code, record.response_time,
+                                 len(username), len(error)) + username + error)
+
+        custom = record.status.encode('utf-8')
+        return (_RECORD.pack(_CUSTOM_STATUS, code, record.response_time, len(username), len(error))
+                + username + error + bytes([len(custom)]) + custom)
+
+
+SINK_FORMATS = {
+    'csv': CsvSink,
+    'jsonl': JsonlSink,
+    'binary': BinarySink,
+}
+
+
+def sink_format_for(path: str, default: str = 'csv') -> str:
+    """Pick the output format from a file name's extension."""
+    extension = os.path.splitext(path)[1].lower()
+    for name, sink_class in SINK_FORMATS.items():
+        if sink_class.extension == extension:
+            return name
+    return default
+
+
+def open_sink(path: str, output_format: Optional[str] = None, resume_at: Optional[int] = None,
+              flush_bytes: int = 256 * 1024, flush_interval: float = 1.0) -> ResultSink:
+    """Open a result sink; the format defaults to the one implied by ``path``."""
+    output_format = output_format or sink_format_for(path)
+    if output_format not in SINK_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {', '.join(SINK_FORMATS)}")
+    return SINK_FORMATS[output_format](path, resume_at, flush_bytes, flush_interval)
+
+
+def read_binary_results(path: str) -> Iterator[SinkRecord]:
+    """Yield the records of a binary result file, stopping at a torn tail."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(BINARY_MAGIC):
+        raise ValueError(f"{path} is not a binary result file")
+
+    pos = len(BINARY_MAGIC)
+    while pos + _RECORD.size <= len(data):
+        index, code, response_time, username_len, error_len = _RECORD.unpack_from(data, pos)
+        pos += _RECORD.size
+        end = pos + username_len + error_len
+        if end > len(data):
+            return
+        username = data[pos:pos + username_len].decode('utf-8')
+        error = data[pos + username_len:end].decode('utf-8', 'replace') or None
+        pos = end
+
+        if index == _CUSTOM_STATUS:
+            if pos >= len(data) or pos + 1 + data[pos] > len(data):
+                return
+            status = data[pos + 1:pos + 1 + data[pos]].decode('utf-8')
+            pos += 1 + data[pos]
+        else:
+            status = BINARY_STATUSES[index]
+
+        yield SinkRecord(username, status, None if code == _NO_CODE else code, response_time, error)
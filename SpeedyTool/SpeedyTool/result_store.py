@@ -0,0 +1,140 @@
+"""Persistent on-disk store of previous check results."""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from username_pipeline import canonical_username
+
+# Only definitive API answers are worth remembering; errors are always retried
+STORABLE_STATUSES = ('valid', 'taken', 'censored')
+
+
+@dataclass
+class StoredResult:
+    """A previous answer for a username, as kept in the store."""
+    username: str  # canonical (casefolded) form
+    status: str  # 'valid', 'taken', 'censored'
+    code: Optional[int]
+    checked_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since this result was fetched from the API."""
+        return time.time() - self.checked_at
+
+
+class ResultStore:
+    """SQLite-backed result store keyed by canonical username with per-status TTLs."""
+
+    def __init__(self, path: str, ttls: Dict[str, float], flush_every: int = 500):
+        self.path = path
+        self.ttls = ttls
+        self.flush_every = flush_every
+        self.lock = threading.Lock()
+        self.pending: List[Tuple[str, str, Optional[int], float]] = []
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " username TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " code INTEGER,"
+            " checked_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.connection.commit()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config) -> Optional['ResultStore']:
+        """Open the store configured in ``config``, or None if it is disabled."""
+        if not config.result_store_path:
+            return None
+        return cls(config.result_store_path, {
+            'valid': config.store_ttl_valid,
+            'taken': config.store_ttl_taken,
+            'censored': config.store_ttl_censored,
+        })
+
+    def is_fresh(self, status: str, checked_at: float, now: Optional[float] = None) -> bool:
+        """Return True if a result with this status and age is still trustworthy."""
+        ttl = self.ttls.get(status)
+        if ttl is None:
+            return False
+        return (now or time.time()) - checked_at < ttl
+
+    def lookup_many(self, usernames: Iterable[str]) -> Dict[str, StoredResult]:
+        """Return fresh stored results, keyed by the username spelling passed in."""
+        by_key: Dict[str, List[str]] = {}
+        for username in usernames:
+            by_key.setdefault(canonical_username(username), []).append(username)
+
+        found: Dict[str, StoredResult] = {}
+        keys = list(by_key)
+        now = time.time()
+
+        with self.lock:
+            self._flush_locked()
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    f"SELECT username, status, code, checked_at FROM results WHERE username IN ({placeholders})",
+                    chunk
+                )
+                for key, status, code, checked_at in rows:
+                    if self.is_fresh(status, checked_at, now):
+                        for username in by_key[key]:
+                            found[username] = StoredResult(key, status, code, checked_at)
+
+        self.hits += len(found)
+        self.misses += sum(len(names) for names in by_key.values()) - len(found)
+        return found
+
+    def usernames_with(self, status: str) -> List[str]:
+        """Canonical usernames whose stored answer is ``status``, however old."""
+        with self.lock:
+            self._flush_locked()
+            rows = self.connection.execute("SELECT username FROM results WHERE status = ?", (status,))
+            return [username for username, in rows]
+
+    def record(self, username: str, status: str, code: Optional[int]) -> None:
+        """Queue a result for writing; non-definitive statuses are ignored."""
+        status = status.lower()
+        if status not in STORABLE_STATUSES:
+            return
+
+        with self.lock:
+            self.pending.append((canonical_username(username), status, code, time.time()))
+            if len(self.pending) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write queued results to disk."""
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self.pending:
+            return
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO results (username, status, code, checked_at) VALUES (?, ?, ?, ?)",
+            self.pending
+        )
+        self.connection.commit()
+        self.pending.clear()
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        with self.lock:
+            self._flush_locked()
+            self.connection.close()
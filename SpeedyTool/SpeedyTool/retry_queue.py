@@ -0,0 +1,63 @@
+"""Delayed retries kept off the workers, released in due-time order."""
+
+import heapq
+import itertools
+import time
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class RetryQueue(Generic[T]):
+    """Heap of items waiting out a backoff delay.
+
+    A failed item parked here holds no worker while it waits; whoever owns
+    the queue takes it back with ``pop_due`` once its delay has passed.
+    The queue is bounded twice: by ``max_size`` items, and by ``budget``,
+    the longest an item may keep retrying after its first failure. An item
+    that would break either bound is refused, so retries can never pile up
+    or stretch a run out long after its last fresh name.
+    """
+
+    def __init__(self, max_size: int = 10000, budget: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.budget = budget
+        self.clock = clock
+        self._heap: List[Tuple[float, int, T]] = []
+        self._order = itertools.count()  # Keeps equal due times first-in, first-out
+
+        # Statistics
+        self.scheduled = 0
+        self.refused = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def admits(self, delay: float, first_failure: float) -> bool:
+        """Whether an item that first failed at ``first_failure`` may wait ``delay`` more seconds."""
+        if len(self._heap) >= self.max_size or self.clock() + delay - first_failure > self.budget:
+            self.refused += 1
+            return False
+        return True
+
+    def push(self, item: T, delay: float) -> None:
+        """Park ``item`` until ``delay`` seconds from now."""
+        heapq.heappush(self._heap, (self.clock() + delay, next(self._order), item))
+        self.scheduled += 1
+
+    def time_to_next(self) -> Optional[float]:
+        """Seconds until the next item is due (0 if one already is), or None when empty."""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self.clock())
+
+    def pop_due(self) -> List[T]:
+        """Remove and return every item whose delay has passed, earliest first."""
+        now = self.clock()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
@@ -4,223 +4,110 @@ Simple, Fast Roblox Username Checker
 Compatible with Python 3.13+ and all environments
 """
 
-import requests
+import argparse
 import time
-import threading
-import queue
-import json
-import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Tuple
-import sys
-from pathlib import Path
+from typing import List
 from colorama import init, Fore, Back, Style
 
+from config import Config
+from result_sink import SINK_FORMATS
+from result_model import ResultTable
+from live_progress import ProgressSnapshot, emit_metrics
+from terminal_renderer import TerminalRenderer
+from threaded_checker import ThreadedChecker
+from candidate_source import CandidateSource
+
 # Initialize colorama for cross-platform color support
 init(autoreset=True)
 
-class SimpleUsernameChecker:
+class SimpleUsernameChecker(ThreadedChecker):
     """Simple but fast username checker using threads."""
     
-    def __init__(self, max_workers: int = 50):
-        self.max_workers = max_workers
-        self.session = requests.Session()
-        
-        # Configure session for better performance
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
-        
-        # Performance tracking
-        self.results = []
-        self.processed = 0
-        self.start_time = None
-        self.valid_usernames = []
-        self.lock = threading.Lock()
-        
-        # Progress display settings
-        self.last_progress_update = 0
-        self.progress_update_interval = 0.5  # Update every 0.5 seconds
-        
-    def check_username(self, username: str) -> Dict:
-        """Check a single username."""
-        url = f"https://auth.roblox.com/v1/usernames/validate?Username={username}&Birthday=2000-01-01"
-        
-        try:
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                code = data.get("code")
-                
-                if code == 0:
-                    status = "VALID"
-                    color = "🟢"
-                elif code == 1:
-                    status = "TAKEN"
-                    color = "🔴"
-                elif code == 2:
-                    status = "CENSORED"
-                    color = "🟡"
-                else:
-                    status = f"UNKNOWN({code})"
-                    color = "⚪"
-                    
-                return {
-                    'username': username,
-                    'status': status,
-                    'code': code,
-                    'color': color,
-                    'error': None
-                }
-            else:
-                return {
-                    'username': username,
-                    'status': 'ERROR',
-                    'code': None,
-                    'color': '❌',
-                    'error': f'HTTP {response.status_code}'
-                }
-                
-        except Exception as e:
-            return {
-                'username': username,
-                'status': 'ERROR',
-                'code': None,
-                'color': '❌',
-                'error': str(e)
-            }
+    preview = 10
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.renderer = TerminalRenderer(max_fps=10)
+    
+    def notify(self, style: str, message: str) -> None:
+        """Print a message, coloured only when it is good or bad news."""
+        print({'success': Fore.GREEN, 'warning': Fore.YELLOW}.get(style, '') + message)
+    
+    def count_down(self) -> None:
+        """Give the user time to read before the live display takes over."""
+        if not self.headless:
+            time.sleep(2)
     
     def clear_console(self):
         """Clear console screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.renderer.clear()
     
-    def display_progress(self, results: List[Dict], total: int, elapsed: float):
+    def display_progress(self, snapshot: ProgressSnapshot):
         """Display clean progress information."""
-        self.clear_console()
-        
-        progress = (len(results) / total) * 100
-        rps = len(results) / elapsed if elapsed > 0 else 0
-        
-        # Count results
-        counts = {'VALID': 0, 'TAKEN': 0, 'CENSORED': 0, 'ERROR': 0}
-        for result in results:
-            status = result['status']
-            if status in counts:
-                counts[status] += 1
-            elif status.startswith('UNKNOWN'):
-                counts['ERROR'] += 1
+        progress = snapshot.progress
+        counts = snapshot.counts
+        lines = []
         
-        print(Fore.CYAN + Style.BRIGHT + "=" * 80)
-        print(Fore.YELLOW + Style.BRIGHT + "🚀 ROBLOX USERNAME CHECKER - LIVE PROGRESS")
-        print(Fore.CYAN + Style.BRIGHT + "=" * 80)
-        print()
+        lines.append(Fore.CYAN + Style.BRIGHT + "=" * 80)
+        lines.append(Fore.YELLOW + Style.BRIGHT + "🚀 ROBLOX USERNAME CHECKER - LIVE PROGRESS")
+        lines.append(Fore.CYAN + Style.BRIGHT + "=" * 80)
+        lines.append("")
         
         # Colorful progress bar
         bar_length = 50
         filled_length = int(bar_length * progress / 100)
         bar = Fore.GREEN + "█" * filled_length + Fore.LIGHTBLACK_EX + "░" * (bar_length - filled_length)
-        print(f"{Fore.BLUE}Progress: [{bar}{Fore.BLUE}] {Fore.MAGENTA + Style.BRIGHT}{progress:.1f}%")
-        print()
+        lines.append(f"{Fore.BLUE}Progress: [{bar}{Fore.BLUE}] {Fore.MAGENTA + Style.BRIGHT}{progress:.1f}%")
+        lines.append("")
         
         # Statistics in colorful format
-        print(f"{Fore.CYAN + Style.BRIGHT}📊 STATISTICS:")
-        print(f"{Fore.WHITE}   Processed:     {Fore.GREEN}{len(results):,}{Fore.WHITE} / {Fore.CYAN}{total:,}")
-        print(f"{Fore.WHITE}   Speed:         {Fore.YELLOW}{rps:.1f}{Fore.WHITE} usernames/second")
-        print(f"{Fore.WHITE}   Time elapsed:  {Fore.BLUE}{elapsed:.1f}{Fore.WHITE} seconds")
-        print(f"{Fore.WHITE}   ETA:           {Fore.MAGENTA}{((total - len(results)) / rps) if rps > 0 else 0:.1f}{Fore.WHITE} seconds")
-        print()
+        lines.append(f"{Fore.CYAN + Style.BRIGHT}📊 STATISTICS:")
+        lines.append(f"{Fore.WHITE}   Processed:     {Fore.GREEN}{snapshot.processed:,}{Fore.WHITE} / {Fore.CYAN}{snapshot.total:,}")
+        lines.append(f"{Fore.WHITE}   Speed:         {Fore.YELLOW}{snapshot.rate:.1f}{Fore.WHITE} usernames/second")
+        lines.append(f"{Fore.WHITE}   Time elapsed:  {Fore.BLUE}{snapshot.elapsed:.1f}{Fore.WHITE} seconds")
+        lines.append(f"{Fore.WHITE}   ETA:           {Fore.MAGENTA}{snapshot.eta:.1f}{Fore.WHITE} seconds")
+        lines.append("")
         
         # Colorful results breakdown
-        print(f"{Fore.CYAN + Style.BRIGHT}🔍 RESULTS BREAKDOWN:")
-        print(f"{Fore.GREEN}   🟢 Valid:      {counts['VALID']:,}")
-        print(f"{Fore.RED}   🔴 Taken:      {counts['TAKEN']:,}")
-        print(f"{Fore.YELLOW}   🟡 Censored:   {counts['CENSORED']:,}")
-        print(f"{Fore.LIGHTRED_EX}   ❌ Errors:     {counts['ERROR']:,}")
-        print()
+        lines.append(f"{Fore.CYAN + Style.BRIGHT}🔍 RESULTS BREAKDOWN:")
+        lines.append(f"{Fore.GREEN}   🟢 Valid:      {counts['VALID']:,}")
+        lines.append(f"{Fore.RED}   🔴 Taken:      {counts['TAKEN']:,}")
+        lines.append(f"{Fore.YELLOW}   🟡 Censored:   {counts['CENSORED']:,}")
+        lines.append(f"{Fore.LIGHTBLACK_EX}   🧹 Invalid:    {counts['INVALID_FORMAT']:,}")
+        lines.append(f"{Fore.LIGHTRED_EX}   ❌ Errors:     {counts['ERROR']:,}")
+        lines.append("")
         
         # Show valid usernames found with colors
-        if self.valid_usernames:
-            print(f"{Fore.GREEN + Style.BRIGHT}🎉 VALID USERNAMES FOUND ({len(self.valid_usernames)}):")
-            for i, username in enumerate(self.valid_usernames[-10:]):  # Show last 10
+        if snapshot.valid_count:
+            lines.append(f"{Fore.GREEN + Style.BRIGHT}🎉 VALID USERNAMES FOUND ({snapshot.valid_count}):")
+            for i, username in enumerate(snapshot.last_valid):  # Show last 10
                 colors = [Fore.GREEN, Fore.CYAN, Fore.YELLOW, Fore.MAGENTA, Fore.BLUE]
                 color = colors[i % len(colors)]
-                print(f"{color}   ✓ {username}")
-            if len(self.valid_usernames) > 10:
-                print(f"{Fore.CYAN}   ... and {len(self.valid_usernames) - 10} more!")
-            print()
-        
-        print(f"{Back.YELLOW + Fore.BLACK + Style.BRIGHT}💡 Press Ctrl+C to stop early{Style.RESET_ALL}")
-        print(Fore.CYAN + Style.BRIGHT + "=" * 80)
-    
-    def process_usernames(self, usernames: List[str]) -> List[Dict]:
-        """Process usernames with threading for speed."""
-        print(f"🚀 Starting to check {len(usernames):,} usernames with {self.max_workers} threads...")
-        print("💡 Use Ctrl+C to stop early and see results")
-        time.sleep(2)  # Give user time to read
-        
-        self.start_time = time.time()
-        results = []
+                lines.append(f"{color}   ✓ {username}")
+            if snapshot.valid_count > 10:
+                lines.append(f"{Fore.CYAN}   ... and {snapshot.valid_count - 10} more!")
+            lines.append("")
         
-        try:
-            # Use ThreadPoolExecutor for concurrent processing
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_username = {
-                    executor.submit(self.check_username, username): username 
-                    for username in usernames
-                }
-                
-                # Process completed tasks
-                for future in as_completed(future_to_username):
-                    result = future.result()
-                    
-                    with self.lock:
-                        results.append(result)
-                        self.processed += 1
-                        
-                        # Track valid usernames
-                        if result['status'] == 'VALID':
-                            self.valid_usernames.append(result['username'])
-                    
-                    # Update display every 0.5 seconds or for valid usernames
-                    current_time = time.time()
-                    if (current_time - self.last_progress_update > self.progress_update_interval or 
-                        result['status'] == 'VALID'):
-                        
-                        elapsed = current_time - self.start_time
-                        self.display_progress(results, len(usernames), elapsed)
-                        self.last_progress_update = current_time
-            
-        except KeyboardInterrupt:
-            print("\n\n⏹️ Stopping early... Preparing results...")
-            time.sleep(1)
+        lines.append(f"{Back.YELLOW + Fore.BLACK + Style.BRIGHT}💡 Press Ctrl+C to stop early{Style.RESET_ALL}")
+        lines.append(Fore.CYAN + Style.BRIGHT + "=" * 80)
         
-        return results
+        # Only changed lines are redrawn; the finished frame always makes it out
+        self.renderer.draw(lines, force=snapshot.processed >= snapshot.total)
     
-    def print_summary(self, results: List[Dict]) -> None:
+    def print_summary(self, results: ResultTable) -> None:
         """Print clean, well-formatted summary of results."""
+        if self.headless:
+            emit_metrics('summary', self.counters.snapshot().to_record())
+            return
+        
         self.clear_console()
         
         total_time = time.time() - self.start_time
         avg_rps = len(results) / total_time if total_time > 0 else 0
         
         # Count results
-        counts = {'VALID': 0, 'TAKEN': 0, 'CENSORED': 0, 'ERROR': 0}
-        valid_usernames = []
-        
-        for result in results:
-            status = result['status']
-            if status in counts:
-                counts[status] += 1
-            elif status.startswith('UNKNOWN'):
-                counts['ERROR'] += 1
-            
-            if status == 'VALID':
-                valid_usernames.append(result['username'])
+        counts = {status.upper(): count for status, count in results.counts().items()}
+        valid_usernames = results.usernames_with('valid')
         
         print(Fore.CYAN + Style.BRIGHT + "=" * 80)
         print(Fore.YELLOW + Style.BRIGHT + "🎯 FINAL RESULTS - COLORFUL ROBLOX USERNAME CHECKER")
@@ -232,11 +119,6 @@ class SimpleUsernameChecker:
         print(f"{Fore.WHITE}   Total Processed:    {Fore.GREEN + Style.BRIGHT}{len(results):,}{Fore.WHITE} usernames")
         print(f"{Fore.WHITE}   Processing Time:    {Fore.BLUE + Style.BRIGHT}{total_time:.2f}{Fore.WHITE} seconds")
         print(f"{Fore.WHITE}   Average Speed:      {Fore.YELLOW + Style.BRIGHT}{avg_rps:.1f}{Fore.WHITE} usernames/second")
-        
-        # Performance comparison
-        original_time_estimate = len(results) * 0.05  # Original ~50ms per request
-        speedup = original_time_estimate / total_time if total_time > 0 else 1
-        print(f"{Fore.WHITE}   Speedup Factor:     {Fore.MAGENTA + Style.BRIGHT}{speedup:.1f}x{Fore.WHITE} faster than basic script")
         print()
         
         # Colorful results breakdown
@@ -247,6 +129,7 @@ class SimpleUsernameChecker:
         print(f"{Fore.GREEN}   🟢 Valid Usernames:     {counts['VALID']:,}")
         print(f"{Fore.RED}   🔴 Taken Usernames:     {counts['TAKEN']:,}")
         print(f"{Fore.YELLOW}   🟡 Censored Usernames:  {counts['CENSORED']:,}")
+        print(f"{Fore.LIGHTBLACK_EX}   🧹 Invalid Format:      {counts['INVALID_FORMAT']:,}")
         print(f"{Fore.LIGHTRED_EX}   ❌ Errors/Timeouts:     {counts['ERROR']:,}")
         print(f"{Fore.CYAN}   ✅ Success Rate:        {Fore.GREEN + Style.BRIGHT}{success_rate:.1f}%")
         print()
@@ -288,16 +171,11 @@ class SimpleUsernameChecker:
         
         print(Fore.CYAN + Style.BRIGHT + "=" * 80)
     
-    def save_results(self, results: List[Dict], base_filename: str = "username_results") -> None:
-        """Save results to multiple easy-to-read formats."""
+    def save_results(self, results: ResultTable, base_filename: str = "username_results") -> None:
+        """Save an easy-to-read summary next to the results streamed to the sink."""
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         
         try:
-            # Save detailed JSON
-            json_filename = f"{base_filename}_{timestamp}.json"
-            with open(json_filename, 'w') as f:
-                json.dump(results, f, indent=2)
-            
             # Save clean text summary
             txt_filename = f"{base_filename}_{timestamp}.txt"
             with open(txt_filename, 'w') as f:
@@ -305,18 +183,8 @@ class SimpleUsernameChecker:
                 f.write("=" * 50 + "\n\n")
                 
                 # Count results
-                counts = {'VALID': 0, 'TAKEN': 0, 'CENSORED': 0, 'ERROR': 0}
-                valid_usernames = []
-                
-                for result in results:
-                    status = result['status']
-                    if status in counts:
-                        counts[status] += 1
-                    elif status.startswith('UNKNOWN'):
-                        counts['ERROR'] += 1
-                    
-                    if status == 'VALID':
-                        valid_usernames.append(result['username'])
+                counts = {status.upper(): count for status, count in results.counts().items()}
+                valid_usernames = results.usernames_with('valid')
                 
                 # Write summary
                 total_time = time.time() - self.start_time
@@ -331,6 +199,7 @@ class SimpleUsernameChecker:
                 f.write(f"Valid usernames: {counts['VALID']:,}\n")
                 f.write(f"Taken usernames: {counts['TAKEN']:,}\n")
                 f.write(f"Censored usernames: {counts['CENSORED']:,}\n")
+                f.write(f"Invalid format: {counts['INVALID_FORMAT']:,}\n")
                 f.write(f"Errors: {counts['ERROR']:,}\n\n")
                 
                 # Write valid usernames
@@ -342,18 +211,10 @@ class SimpleUsernameChecker:
                 else:
                     f.write("No valid usernames found.\n")
             
-            # Save CSV for easy analysis
-            csv_filename = f"{base_filename}_{timestamp}.csv"
-            with open(csv_filename, 'w') as f:
-                f.write("Username,Status,Code,Error\n")
-                for result in results:
-                    error = result.get('error', '').replace(',', ';') if result.get('error') else ''
-                    f.write(f"{result['username']},{result['status']},{result.get('code', '')},{error}\n")
-            
             print(f"\n{Fore.GREEN + Style.BRIGHT}💾 COLORFUL RESULTS SAVED:")
             print(f"{Fore.CYAN}   📄 Summary: {Fore.YELLOW}{txt_filename}")
-            print(f"{Fore.CYAN}   📊 Spreadsheet: {Fore.MAGENTA}{csv_filename}")
-            print(f"{Fore.CYAN}   📋 Raw data: {Fore.BLUE}{json_filename}")
+            if self.flow.sink:
+                print(f"{Fore.CYAN}   📋 Raw data: {Fore.BLUE}{self.flow.sink.path}")
             
         except Exception as e:
             print(f"{Fore.RED}❌ Error saving results: {e}")
@@ -372,8 +233,25 @@ def load_usernames(filename: str = "usernames.txt") -> List[str]:
         print(f"❌ Error reading file: {e}")
         return []
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run from its checkpoint instead of starting over")
+    parser.add_argument('--format', choices=sorted(SINK_FORMATS), default='jsonl',
+                        help="format of the raw results file written while checking (default: jsonl)")
+    parser.add_argument('--threads', type=int,
+                        help="number of worker threads (asked for interactively when omitted)")
+    parser.add_argument('--headless', action='store_true',
+                        help="no live display or prompts; print a JSON metrics line every $METRICS_INTERVAL seconds")
+    parser.add_argument('--source', metavar='SPEC',
+                        help="check names as they are produced instead of loading usernames.txt: '-' for stdin, "
+                             "'generate:count=N[,patterns=FILE][,seed=S][,state=FILE]' or a file")
+    return parser.parse_args(argv)
+
 def main():
     """Main function with colorful interface."""
+    args = parse_args()
     init()  # Initialize colorama
     
     # Colorful welcome
@@ -383,35 +261,64 @@ def main():
     print(Fore.CYAN + Style.BRIGHT + "🌈" * 60)
     print()
     
-    # Load usernames
-    usernames = load_usernames()
-    if not usernames:
-        return
-    
-    print(f"{Fore.GREEN + Style.BRIGHT}📂 Loaded {len(usernames):,} usernames")
+    # Load usernames, unless they are pulled from a source while checking
+    source = None
+    usernames: List[str] = []
+    if args.source:
+        try:
+            source = CandidateSource(args.source)
+        except (OSError, ValueError) as e:
+            print(f"{Fore.RED}❌ Error: {e}")
+            return
+        print(f"{Fore.GREEN + Style.BRIGHT}🌊 Checking usernames from '{args.source}' as they are produced")
+    else:
+        usernames = load_usernames()
+        if not usernames:
+            return
+        
+        print(f"{Fore.GREEN + Style.BRIGHT}📂 Loaded {len(usernames):,} usernames")
     
-    # Ask user for number of threads with colorful input
-    print(f"\n{Fore.CYAN + Style.BRIGHT}🔧 How many threads do you want to use?")
-    print(f"{Fore.YELLOW}💡 Recommended: 30-50 (more = faster, but may hit rate limits)")
+    config = Config.from_env()
+    # Names piped in on stdin leave nothing to answer prompts with
+    headless = args.headless or config.headless or (source is not None and source.uses_stdin)
     
-    try:
-        max_workers = int(input(f"{Fore.MAGENTA}Enter threads (default 50, max 100): ") or "50")
-        max_workers = min(max_workers, 100)  # Limit to prevent overwhelming
-    except ValueError:
+    if args.threads:
+        max_workers = min(args.threads, 100)
+    elif headless:
         max_workers = 50
-        print(f"{Fore.YELLOW}Using default: 50 threads")
+    else:
+        # Ask user for number of threads with colorful input
+        print(f"\n{Fore.CYAN + Style.BRIGHT}🔧 How many threads do you want to use?")
+        print(f"{Fore.YELLOW}💡 Recommended: 30-50 (more = faster, but may hit rate limits)")
+        
+        try:
+            max_workers = int(input(f"{Fore.MAGENTA}Enter threads (default 50, max 100): ") or "50")
+            max_workers = min(max_workers, 100)  # Limit to prevent overwhelming
+        except ValueError:
+            max_workers = 50
+            print(f"{Fore.YELLOW}Using default: 50 threads")
     
     # Create checker and process
     print(f"\n{Fore.GREEN + Style.BRIGHT}🚀 Initializing colorful checker with {max_workers} threads...")
     
-    checker = SimpleUsernameChecker(max_workers=max_workers)
-    results = checker.process_usernames(usernames)
+    checker = SimpleUsernameChecker(max_workers=max_workers, headless=headless,
+                                    metrics_interval=config.metrics_interval, api_url=config.api_url)
+    # Raw results are appended to this file while checking, not dumped at the end
+    config.output_format = args.format
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    results = checker.run(config, f"username_results_{timestamp}{SINK_FORMATS[args.format].extension}",
+                          usernames=usernames, source=source, resume=args.resume)
     
     # Show summary
     checker.print_summary(results)
+    if checker.flow.censor is not None:
+        print(checker.flow.censor.summary())
+    print(f"\n{Fore.CYAN}📋 Raw results were written to {Fore.BLUE}{checker.flow.sink.path}")
+    if headless:
+        return
     
     # Ask if user wants to save results
-    save = input(f"\n{Fore.CYAN}Save results to file? (y/n): ").lower().strip()
+    save = input(f"\n{Fore.CYAN}Save a summary to file? (y/n): ").lower().strip()
     if save in ['y', 'yes']:
         checker.save_results(results)
     
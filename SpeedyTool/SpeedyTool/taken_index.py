@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Names known to be taken, remembered across runs in one compact, copyable file.
+
+A name that came back taken almost never frees up, so unlike the result
+store's answers these never expire. The file holds a Bloom filter over
+every name, followed by the names themselves, casefolded and sorted, in one
+section per length. Each section is a run of fixed-width records, so an
+exact lookup only has to search one small block of the memory-mapped file:
+opening an index reads the header, the filter and every ``FENCE_EVERY``-th
+name, which say which block a name would be in. Most names that aren't in
+the index are turned away by the filter without touching the sections.
+
+Names added during a run are held in memory until ``save`` merges them into
+the file, which is replaced atomically: a copy taken at any moment is a
+complete index that another machine can use as-is or merge into its own.
+Names another run saved in the meantime are merged in first, so runs
+sharing one index don't drop each other's names.
+"""
+
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from username_pipeline import canonical_username
+from username_rules import MAX_LENGTH
+
+MAGIC = b'TAKENIX1'
+BITS_PER_NAME = 10  # With HASHES probes, about 1% of unknown names get past the filter
+HASHES = 7
+FENCE_EVERY = 64  # Names per block; the first of each block is kept in memory
+
+# Magic, probes per name, filter size in bytes, then the number of names of each length 1..MAX_LENGTH
+_HEADER = struct.Struct(f'<8sII{MAX_LENGTH}I')
+
+
+def _probes(key: bytes, hashes: int, bits: int) -> Iterator[int]:
+    """Filter bit positions for ``key``, double hashing two checksums.
+
+    CRC-32 and Adler-32 run in C and never change between Python versions
+    or machines, which a shared file needs; spreading Adler-32 with a
+    multiplicative hash makes it a good enough step for a Bloom filter.
+    """
+    position = zlib.crc32(key)
+    step = (zlib.adler32(key) * 0x9E3779B1 & 0xFFFFFFFF) | 1
+    for _ in range(hashes):
+        yield position % bits
+        position += step
+
+
+def _umask() -> int:
+    """The process umask, which can only be read by setting it."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _key(username: str) -> Optional[bytes]:
+    """The stored form of a username, or None if it could never be a Roblox name."""
+    key = canonical_username(username)
+    if not 0 < len(key) <= MAX_LENGTH or not key.isascii():
+        return None
+    return key.encode('ascii')
+
+
+class TakenIndex:
+    """Set of taken usernames backed by a Bloom filter and a sorted on-disk set."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.added: Set[bytes] = set()  # Names not in the file yet
+        self.hashes = HASHES
+        self.counts = [0] * MAX_LENGTH
+        self._starts = [0] * MAX_LENGTH
+        self._fences: List[List[bytes]] = [[] for _ in range(MAX_LENGTH)]
+        self._filter = b''
+        self._bits = 0
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._identity: Optional[Tuple[int, int, int]] = None  # The file as it was when opened
+        if path and os.path.exists(path):
+            self._open(path)
+
+    @classmethod
+    def from_config(cls, config) -> Optional['TakenIndex']:
+        """Open the index configured in ``config``, or None if it is disabled."""
+        if not config.taken_index_path:
+            return None
+        try:
+            return cls(config.taken_index_path)
+        except ValueError as e:
+            # Not worth stopping a run for: the names are only a shortcut
+            print(f"⚠️ {e}; starting with an empty one, which replaces it on save", file=sys.stderr)
+            index = cls()
+            index.path = config.taken_index_path
+            return index
+
+    def _open(self, path: str) -> None:
+        self._file = open(path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if not stat.st_size:
+            # Empty, e.g. created by hand or by a run killed mid-save; mmap can't map it
+            self._file.close()
+            self._file = None
+            return
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_layout(path)
+        except ValueError:
+            self._close_file()
+            raise
+
+    def _read_layout(self, path: str) -> None:
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"'{path}' is not a taken-name index")
+        magic, self.hashes, filter_size, *counts = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a taken-name index")
+
+        self.counts = counts
+        self._filter = self._map[_HEADER.size:_HEADER.size + filter_size]
+        self._bits = filter_size * 8
+        offset = _HEADER.size + filter_size
+        for length, count in enumerate(counts, 1):
+            self._starts[length - 1] = offset
+            offset += length * count
+        if offset != len(self._map):
+            raise ValueError(f"'{path}' is truncated or corrupt")
+        for length, count in enumerate(counts, 1):
+            start, block = self._starts[length - 1], FENCE_EVERY * length
+            self._fences[length - 1] = [self._map[at:at + length]
+                                        for at in range(start, start + count * length, block)]
+
+    def __len__(self) -> int:
+        return sum(self.counts) + len(self.added)
+
+    def __contains__(self, username: str) -> bool:
+        key = _key(username)
+        return key is not None and (key in self.added or self._stored(key))
+
+    def _stored(self, key: bytes) -> bool:
+        """Whether ``key`` is in the file: the filter first, then a search of the one block it could be in."""
+        if not self._bits:
+            return False
+        bits, bloom = self._bits, self._filter
+        for bit in _probes(key, self.hashes, bits):
+            if not bloom[bit >> 3] >> (bit & 7) & 1:
+                return False
+
+        length = len(key)
+        block = bisect_right(self._fences[length - 1], key) - 1
+        if block < 0:
+            return False
+        section = self._starts[length - 1]
+        start = section + block * FENCE_EVERY * length
+        end = min(start + FENCE_EVERY * length, section + self.counts[length - 1] * length)
+        # Records have no separators, so only a match on a record boundary counts
+        at = self._map.find(key, start, end)
+        while at != -1 and (at - start) % length:
+            at = self._map.find(key, at + 1, end)
+        return at != -1
+
+    def partition(self, usernames: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Split usernames into (not known, known taken) lists."""
+        unknown = []
+        taken = []
+        for username in usernames:
+            (taken if username in self else unknown).append(username)
+        return unknown, taken
+
+    def add(self, username: str) -> None:
+        """Remember ``username`` as taken; it reaches the file on the next ``save``."""
+        key = _key(username)
+        if key is not None and key not in self.added and not self._stored(key):
+            self.added.add(key)
+
+    def record(self, username: str, status: str) -> None:
+        """Add ``username`` if ``status`` says it is taken; other answers are ignored."""
+        if status.lower() == 'taken':
+            self.add(username)
+
+    def update(self, other: 'TakenIndex') -> None:
+        """Add every name in ``other``, e.g. an index copied from another machine."""
+        for length in range(1, MAX_LENGTH + 1):
+            for key in other._sorted_keys(length):
+                if key not in self.added and not self._stored(key):
+                    self.added.add(key)
+
+    def _section(self, length: int) -> Iterator[bytes]:
+        start = self._starts[length - 1]
+        for at in range(start, start + self.counts[length - 1] * length, length):
+            yield self._map[at:at + length]
+
+    def _sorted_keys(self, length: int) -> Iterator[bytes]:
+        """Every name of ``length``, from the file and from memory, in sorted order."""
+        added = sorted(key for key in self.added if len(key) == length)
+        return heapq.merge(self._section(length), added) if self.counts[length - 1] else iter(added)
+
+    def __iter__(self) -> Iterator[str]:
+        for length in range(1, MAX_LENGTH + 1):
+            for key in self._sorted_keys(length):
+                yield key.decode('ascii')
+
+    def _merge_saved(self) -> None:
+        """Add names another run saved to this index's file since it was opened."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if (stat.st_ino, stat.st_size, stat.st_mtime_ns) == self._identity:
+            return
+        try:
+            with TakenIndex(self.path) as saved:
+                self.update(saved)
+        except ValueError as e:
+            print(f"⚠️ {e}; replacing it", file=sys.stderr)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the whole index to ``path`` (default: its own file) in one atomic replace."""
+        path = path or self.path
+        if not path:
+            raise ValueError("The index has no file to save to")
+        if path == self.path:
+            self._merge_saved()
+
+        # Sized for every name before the merge; names are never in both places, so it's exact
+        total = len(self)
+        filter_size = max(8, -(-total * BITS_PER_NAME // 8))
+        bloom = bytearray(filter_size)
+        counts = [0] * MAX_LENGTH
+
+        # A name of its own, so runs saving the same index at once don't write into each other's file
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                        dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            self._write(os.fdopen(fd, 'wb'), filter_size, bloom, counts)
+            # mkstemp makes the file private; the index is meant to be copied and shared
+            os.chmod(tmp_path, 0o666 & ~_umask())
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        if path != self.path:
+            os.replace(tmp_path, path)
+            return
+        # The old file must be unmapped before it can be replaced on every platform
+        self._close_file()
+        os.replace(tmp_path, path)
+        self.added.clear()
+        self._open(path)
+
+    def _write(self, f, filter_size: int, bloom: bytearray, counts: List[int]) -> None:
+        """Write the sections, then the header and the filter they filled in, to ``f``."""
+        bits = filter_size * 8
+        with f:
+            f.seek(_HEADER.size + filter_size)
+            for length in range(1, MAX_LENGTH + 1):
+                chunk = []
+                for key in self._sorted_keys(length):
+                    for bit in _probes(key, HASHES, bits):
+                        bloom[bit >> 3] |= 1 << (bit & 7)
+                    chunk.append(key)
+                    if len(chunk) >= 4096:
+                        f.write(b''.join(chunk))
+                        counts[length - 1] += len(chunk)
+                        chunk = []
+                f.write(b''.join(chunk))
+                counts[length - 1] += len(chunk)
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, HASHES, filter_size, *counts))
+            f.write(bloom)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _close_file(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+        self._identity = None
+        self.counts = [0] * MAX_LENGTH
+        self._fences = [[] for _ in range(MAX_LENGTH)]
+        self._filter = b''
+        self._bits = 0
+
+    def close(self) -> None:
+        """Save names added since the last save, then release the file."""
+        if self.added and self.path:
+            self.save()
+        self._close_file()
+
+    def __enter__(self) -> 'TakenIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Inspect, fill and share the index of known-taken usernames.")
+    parser.add_argument('--index', metavar='FILE', default=os.getenv('TAKEN_INDEX') or 'taken.idx',
+                        help="the index to work on (default: $TAKEN_INDEX, else taken.idx)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help="show how many names the index holds and its size on disk")
+    check_parser = commands.add_parser('check', help="tell whether names are known to be taken")
+    check_parser.add_argument('usernames', nargs='+')
+    merge_parser = commands.add_parser('merge', help="add the names of other index files, e.g. from another machine")
+    merge_parser.add_argument('files', nargs='+')
+    export_parser = commands.add_parser('export', help="write the index to a single file to copy elsewhere")
+    export_parser.add_argument('destination')
+    store_parser = commands.add_parser('from-store', help="add every name the result store has seen taken, however old")
+    store_parser.add_argument('--store', metavar='FILE', default=os.getenv('RESULT_STORE') or 'results.db')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Entry point."""
+    args = parse_args(argv)
+    try:
+        index = TakenIndex(args.index)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    with index:
+        if args.command == 'check':
+            for username in args.usernames:
+                print(f"{username}: {'taken' if username in index else 'not known'}")
+        elif args.command == 'merge':
+            for path in args.files:
+                before = len(index)
+                with TakenIndex(path) as other:
+                    index.update(other)
+                print(f"📥 {path}: {len(index) - before:,} new names")
+        elif args.command == 'export':
+            index.save(args.destination)
+            print(f"📤 {len(index):,} names written to {args.destination}")
+        elif args.command == 'from-store':
+            from result_store import ResultStore
+
+            if not os.path.exists(args.store):
+                print(f"❌ Error: result store '{args.store}' not found")
+                return 1
+            store = ResultStore(args.store, {})
+            try:
+                before = len(index)
+                for username in store.usernames_with('taken'):
+                    index.add(username)
+            finally:
+                store.close()
+            print(f"📥 {len(index) - before:,} new names from {args.store}")
+
+        if index.added:
+            index.save()
+        if args.command != 'check':
+            size = os.path.getsize(args.index) if os.path.exists(args.index) else 0
+            print(f"📊 {args.index}: {len(index):,} taken names in {size / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""In-process terminal redraws for the live progress screens."""
+
+import sys
+import time
+from typing import List, Optional, TextIO
+
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_LINE = "\x1b[K"
+
+
+def move_to(row: int) -> str:
+    """ANSI sequence that puts the cursor at the start of ``row`` (1-based)."""
+    return f"\x1b[{row};1H"
+
+
+class TerminalRenderer:
+    """Draw full-screen frames by rewriting only the lines that changed.
+
+    The first frame clears the screen; after that each frame is compared
+    with the previous one line by line and only the differences are sent,
+    positioned with ANSI cursor moves, in a single write. Frames arriving
+    faster than ``max_fps`` are dropped unless forced. When the stream is
+    not a terminal (a pipe, a log file, cron) nothing is drawn at all.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, max_fps: float = 10.0,
+                 enabled: Optional[bool] = None):
+        self.stream = stream or sys.stdout
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        if enabled is None:
+            enabled = self.stream.isatty()
+        self.enabled = enabled
+        self.frames = 0
+        self.dropped = 0
+        self._previous: Optional[List[str]] = None
+        self._last_draw = 0.0
+
+    def draw(self, lines: List[str], force: bool = False) -> bool:
+        """Show ``lines`` as the whole screen; returns False if the frame was skipped."""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_draw < self.min_interval:
+            self.dropped += 1
+            return False
+        self._last_draw = now
+
+        previous = self._previous
+        if previous is None:
+            out = [CLEAR_SCREEN, "\n".join(lines)]
+        else:
+            out = []
+            for row, line in enumerate(lines):
+                if row >= len(previous) or previous[row] != line:
+                    out.append(move_to(row + 1) + line + CLEAR_LINE)
+            # Blank out rows left over from a longer previous frame
+            for row in range(len(lines), len(previous)):
+                out.append(move_to(row + 1) + CLEAR_LINE)
+        out.append(move_to(len(lines) + 1))
+
+        self.stream.write("".join(out))
+        self.stream.flush()
+        self._previous = list(lines)
+        self.frames += 1
+        return True
+
+    def clear(self) -> None:
+        """Clear the screen; the next frame is drawn in full."""
+        self._previous = None
+        if self.enabled:
+            self.stream.write(CLEAR_SCREEN)
+            self.stream.flush()
@@ -0,0 +1,48 @@
+"""Shared fixtures; the modules under test live flat in the directory above."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_api import MockApiSettings, MockValidateApi  # noqa: E402
+
+
+@pytest.fixture
+def mock_api():
+    """A fast local validate endpoint that always answers the same name the same way."""
+    with MockValidateApi(MockApiSettings(latency=0.001, latency_sigma=0.0)) as api:
+        yield api
+
+
+@pytest.fixture
+def run_checker():
+    """Check names with one of the front-ends ('ultra', 'simple' or 'colorful') against ``url``.
+
+    Nothing is remembered between runs and nothing is drawn, so every name
+    goes to the API; returns the checker's results.
+    """
+    def run(front_end, url, names):
+        if front_end == 'ultra':
+            from config import Config
+            from username_checker import UltraUsernameChecker
+
+            config = Config(result_store_path=None, taken_index_path=None, censor_model_path=None,
+                            headless=True, metrics_interval=3600.0, api_url=url)
+
+            async def check():
+                async with UltraUsernameChecker(config) as checker:
+                    return await checker.process_usernames(names)
+            return asyncio.run(check())
+
+        if front_end == 'simple':
+            from simple_checker import SimpleUsernameChecker as checker_class
+        else:
+            from colorful_checker import ColorfulUsernameChecker as checker_class
+        checker = checker_class(max_workers=8, headless=True, metrics_interval=3600.0, api_url=url)
+        return checker.process_usernames(names)
+
+    return run
@@ -0,0 +1,67 @@
+"""A generator source saves the offset of the first name it has not finished."""
+
+from itertools import islice
+
+from candidate_source import CandidateSource
+
+
+def _source(tmp_path, count=100):
+    return CandidateSource(f"generate:count={count},seed=7,state={tmp_path / 'gen.state'}")
+
+
+def test_offset_waits_for_the_oldest_unfinished_name(tmp_path):
+    source = _source(tmp_path)
+    names = list(islice(iter(source), 10))
+    assert source.offset == 0
+
+    # Finished out of order: everything from the oldest gap on is generated again
+    source.finished(names[:3] + names[5:])
+    again = CandidateSource(f"generate:count=7,seed=7,offset={source.offset}")
+    assert list(again) == names[3:]
+
+    source.finished(names[3:5])
+    after = CandidateSource(f"generate:count=1,seed=7,offset={source.offset}")
+    assert list(after) == list(islice(iter(source), 1))
+
+
+def test_interrupted_run_carries_on_without_skipping(tmp_path):
+    with _source(tmp_path) as source:
+        pulled = list(islice(iter(source), 20))
+        source.finished(pulled[:8])
+
+    with _source(tmp_path) as source:
+        resumed = list(iter(source))
+    assert resumed[:12] == pulled[8:]
+    assert len(resumed) == 100
+    assert len(set(resumed)) == 100
+
+
+def test_errored_names_finish_and_bookkeeping_stays_small(tmp_path):
+    from result_model import CheckResult
+    from username_pipeline import CheckFlow, UsernameBatch
+
+    source = _source(tmp_path, count=5000)
+    flow = CheckFlow()
+    flow.source = source
+    names = list(iter(source))
+
+    # Retries used up: the error is as final as any other answer
+    flow.write(UsernameBatch(), [CheckResult(names[0], 'error', error_message='HTTP 500')])
+    flow.write(UsernameBatch(), [CheckResult(name, 'taken', 1) for name in names[1:]])
+    assert source.offset == source._next
+    assert not source._pulled and not source._done and not source._in_flight
+
+
+def test_offset_trails_by_at_most_max_lag(tmp_path):
+    source = _source(tmp_path, count=5000)
+    source.max_lag = 100
+    names = iter(source)
+    # The first name never finishes; the rest do as they are checked
+    next(names)
+    for name in names:
+        source.finished([name])
+
+    assert source.abandoned == 1
+    assert len(source._pulled) == len(source._done) == len(source._in_flight) == 0
+    resumed = CandidateSource(f"generate:count=1,seed=7,offset={source.offset}")
+    assert list(resumed) == list(islice(iter(source), 1))
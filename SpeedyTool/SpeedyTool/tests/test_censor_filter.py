@@ -0,0 +1,68 @@
+"""Mined fragment rules predict censored names, keep their score, and survive a save."""
+
+import pytest
+
+from censor_filter import CensorFilter, FragmentMatcher, FragmentRule, mine_rules
+
+CENSORED = ['xbadx1', 'badguy', 'verybad', 'bad123', 'nastyone', 'nasty99', 'ohnasty']
+ACCEPTED = ['goodguy', 'player1', 'shadow', 'nastur', 'builder', 'gamer42']
+
+
+def test_mining_keeps_the_shortest_confident_fragment():
+    rules = {rule.fragment: rule for rule in mine_rules(CENSORED, ACCEPTED, min_support=3, threshold=0.8)}
+
+    # 'sty' catches every name 'nasty' would; 'nas' is in an accepted name too, so isn't sure enough
+    assert set(rules) == {'bad', 'sty'}
+    assert rules['bad'] == FragmentRule('bad', 4, 0)
+    assert rules['sty'] == FragmentRule('sty', 3, 0)
+
+
+def test_matcher_finds_the_most_confident_rule_anywhere_in_a_name():
+    strong, weak = FragmentRule('bad', 9, 0), FragmentRule('adg', 1, 1)
+    matcher = FragmentMatcher([weak, strong])
+
+    assert matcher.match('xxBADGUY') == strong
+    assert matcher.match('adgood') == weak
+    assert matcher.match('baxad') is None
+
+
+def test_audited_share_is_still_checked_and_scored():
+    censor = CensorFilter([FragmentRule('bad', 99, 0)], threshold=0.9, audit_rate=0.25)
+    names = [f"bad{i}" for i in range(400)] + ['fine1']
+    to_check, skipped = censor.partition(names)
+
+    assert 'fine1' in to_check
+    assert len(skipped) + len(to_check) == len(names)
+    assert 60 < len(to_check) - 1 < 140  # About a quarter of the predicted names
+    # The same names are picked every time, so runs and the generator agree
+    assert censor.partition(names) == (to_check, skipped)
+
+    censor.record(to_check[0], 'taken')
+    censor.record('fine1', 'censored')
+    censor.record(to_check[1], 'censored')
+    assert (censor.audited, censor.wrong, censor.missed) == (2, 1, 1)
+    assert '1 of 2 audited predictions wrong' in censor.summary()
+
+
+def test_rules_below_the_threshold_are_kept_but_unused():
+    censor = CensorFilter([FragmentRule('bad', 9, 0), FragmentRule('meh', 1, 1)], threshold=0.9, audit_rate=0.0)
+    assert 'badname' in censor
+    assert 'mehname' not in censor
+
+
+def test_close_saves_the_run_into_the_model_history(tmp_path):
+    path = str(tmp_path / 'censor.json')
+    CensorFilter([FragmentRule('bad', 9, 0)], threshold=0.9, audit_rate=0.0, path=path).save()
+
+    with CensorFilter.load(path, audit_rate=0.0) as censor:
+        censor.partition(['badone', 'badtwo', 'fine1'])
+    reloaded = CensorFilter.load(path)
+    assert reloaded.rules == [FragmentRule('bad', 9, 0)]
+    assert reloaded.history['skipped'] == 2
+
+
+def test_unknown_model_version_is_rejected(tmp_path):
+    path = tmp_path / 'censor.json'
+    path.write_text('{"version": 999, "threshold": 0.9, "rules": []}')
+    with pytest.raises(ValueError, match='censor model'):
+        CensorFilter.load(str(path))
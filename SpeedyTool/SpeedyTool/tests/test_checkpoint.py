@@ -0,0 +1,98 @@
+"""Resuming an interrupted run writes exactly what an uninterrupted run would."""
+
+import asyncio
+import csv
+
+import pytest
+
+from checkpoint import Checkpoint
+from config import Config
+from result_sink import open_sink
+
+# Two spellings of one name both fall inside the finished prefix
+NAMES = ['1gjCe', 'abcde', 'Other1', '1GJcE', 'zzzzz', 'ABCDE'] + [f"name{i:04d}" for i in range(200)]
+FINISHED = ['1gjCe', 'abcde', 'Other1']
+
+
+def _interrupted_run(input_file: str) -> None:
+    checkpoint = Checkpoint.open_for_run(input_file, resume=False)
+    checkpoint.begin(NAMES)
+    for username in FINISHED:
+        checkpoint.record(username, 'taken', 1)
+    checkpoint.close()
+
+
+def _resume(checker_name: str, url: str, input_file: str, output_file: str) -> None:
+    checkpoint = Checkpoint.open_for_run(input_file, resume=True)
+    sink = open_sink(output_file)
+    try:
+        if checker_name == 'ultra':
+            from username_checker import UltraUsernameChecker
+
+            config = Config(result_store_path=None, taken_index_path=None, censor_model_path=None,
+                            headless=True, metrics_interval=3600.0, api_url=url)
+
+            async def run() -> None:
+                async with UltraUsernameChecker(config) as checker:
+                    checker.flow.checkpoint, checker.flow.sink = checkpoint, sink
+                    await checker.process_usernames(NAMES)
+
+            asyncio.run(run())
+        else:
+            if checker_name == 'simple':
+                from simple_checker import SimpleUsernameChecker as checker_class
+            else:
+                from colorful_checker import ColorfulUsernameChecker as checker_class
+            checker = checker_class(max_workers=8, headless=True, metrics_interval=3600.0, api_url=url)
+            checker.flow.checkpoint, checker.flow.sink = checkpoint, sink
+            checker.process_usernames(NAMES)
+    finally:
+        sink.close()
+
+
+def test_begin_restores_every_spelling_of_the_prefix(tmp_path):
+    input_file = str(tmp_path / 'usernames.txt')
+    _interrupted_run(input_file)
+
+    checkpoint = Checkpoint.open_for_run(input_file, resume=True)
+    remaining, restored = checkpoint.begin(NAMES)
+    checkpoint.close()
+
+    assert checkpoint.offset == 4
+    assert remaining == NAMES[4:]
+    assert [entry.username for entry in restored] == NAMES[:4]
+
+
+@pytest.mark.parametrize('checker_name', ['ultra', 'simple', 'colorful'])
+def test_resumed_output_has_one_row_per_input_line(tmp_path, mock_api, checker_name):
+    input_file = str(tmp_path / 'usernames.txt')
+    output_file = str(tmp_path / 'out.csv')
+    _interrupted_run(input_file)
+
+    _resume(checker_name, mock_api.url, input_file, output_file)
+
+    with open(output_file, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(NAMES)
+    assert sorted(row['Username'] for row in rows) == sorted(NAMES)
+    # The prefix came from the checkpoint, not the API
+    assert mock_api.stats.requests == len(NAMES) - 5
+
+
+def test_errors_are_checked_again_on_resume(tmp_path):
+    input_file = str(tmp_path / 'usernames.txt')
+    checkpoint = Checkpoint.open_for_run(input_file, resume=False)
+    checkpoint.begin(NAMES)
+    checkpoint.record('1gjCe', 'taken', 1)
+    checkpoint.record('abcde', 'error', None)
+    checkpoint.record('Other1', 'valid', 0)
+    checkpoint.close()
+
+    checkpoint = Checkpoint.open_for_run(input_file, resume=True)
+    remaining, restored = checkpoint.begin(NAMES)
+    checkpoint.close()
+
+    # The offset stops at the error; later names come back from the log, the error doesn't
+    assert [entry.username for entry in restored] == ['1gjCe']
+    assert remaining == NAMES[1:]
+    assert list(checkpoint.lookup_many(remaining)) == ['Other1', '1GJcE']
@@ -0,0 +1,21 @@
+"""Every front-end sends the same request and reaches the mock's answers, retrying failures."""
+
+import pytest
+
+from mock_api import MockApiSettings, MockValidateApi, expected_code
+
+NAMES = [f"parity{i:03d}" for i in range(120)]
+
+
+@pytest.mark.parametrize('front_end', ['ultra', 'simple', 'colorful'])
+def test_front_ends_agree_with_the_mock(front_end, run_checker):
+    # HTTP 500s on some requests, so each front-end has to retry its way to the answers
+    settings = MockApiSettings(latency=0.001, latency_sigma=0.0, error_rate=0.05)
+    with MockValidateApi(settings) as api:
+        results = run_checker(front_end, api.url, NAMES)
+
+    assert list(api.stats.query_formats) == ['Birthday&Username']
+    assert api.stats.errors > 0
+    assert sorted(result.username for result in results) == NAMES
+    assert all(result.status != 'error' for result in results)
+    assert all(result.code == expected_code(result.username, settings) for result in results)
@@ -0,0 +1,32 @@
+"""The sampler walks every name once, in about as many offsets as there are names."""
+
+from keyspace_sampler import SCHEDULE_SLOTS, KeyspaceSampler
+from username_patterns import compile_pattern
+
+# A tiny pattern with almost all the weight next to a large one with almost none
+SKEWED = [compile_pattern('d{2}', 1000), compile_pattern('l{3}', 1), compile_pattern('[a-e]d{2}', 5)]
+TOTAL = 100 + 26 ** 3 + 5 * 100
+
+
+def test_skewed_weights_waste_no_rounds_once_a_pattern_runs_out():
+    sampler = KeyspaceSampler(SKEWED, seed=3)
+    names = [name for _, name in sampler.iter_names()]
+
+    assert len(names) == TOTAL
+    assert len({name.lower() for name in names}) == TOTAL
+    # At most one part-used round each time a pattern runs out
+    assert sampler.end <= TOTAL + len(SKEWED) * SCHEDULE_SLOTS
+
+
+def test_samples_continue_where_the_last_one_stopped():
+    sampler = KeyspaceSampler(SKEWED, seed=3)
+    everything = [name for _, name in sampler.iter_names()]
+
+    names, offset = [], 0
+    while True:
+        batch, offset = sampler.sample(997, offset)
+        if not batch:
+            break
+        names.extend(batch)
+    assert names == everything
+    assert [name for _, name in KeyspaceSampler(SKEWED, seed=3).iter_names()] == everything
@@ -0,0 +1,53 @@
+"""Latency histogram percentiles stay within the documented precision."""
+
+import random
+
+import pytest
+
+from latency_histogram import REPORTED_PERCENTILES, LatencyHistogram
+
+
+def _exact(samples, percent):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def test_percentiles_within_one_percent_of_exact():
+    rng = random.Random(1)
+    # Log-normal around 50 ms with a long tail, like real API latencies
+    samples = [rng.lognormvariate(-3.0, 1.0) for _ in range(50_000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+
+    percentiles = histogram.percentiles()
+    assert list(percentiles) == list(REPORTED_PERCENTILES)
+    for percent, value in percentiles.items():
+        assert value == pytest.approx(_exact(samples, percent), rel=0.01)
+    assert histogram.count == len(samples)
+    assert histogram.max == pytest.approx(max(samples), abs=1e-6)
+
+
+def test_merge_matches_recording_everything_in_one():
+    rng = random.Random(2)
+    samples = [rng.uniform(0.001, 2.0) for _ in range(10_000)]
+    whole, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for number, sample in enumerate(samples):
+        whole.record(sample)
+        (first if number % 2 else second).record(sample)
+
+    first.merge(second)
+    assert first.summary() == whole.summary()
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(sub_bucket_bits=6))
+
+
+def test_empty_and_clamped_values():
+    histogram = LatencyHistogram(highest=1.0)
+    assert histogram.percentiles() == dict.fromkeys(REPORTED_PERCENTILES, 0.0)
+
+    histogram.record(5.0)
+    histogram.record(-1.0)
+    assert histogram.max == 1.0
+    assert histogram.min == 0.0
+    assert histogram.percentile(100.0) == 1.0
@@ -0,0 +1,113 @@
+"""The monitor tears down everything it started and costs the event loop next to nothing."""
+
+import asyncio
+import io
+import sys
+import time
+
+import pytest
+import rich.panel  # noqa: F401  Imported by the first redraw; a one-off cost, not the monitor's overhead
+import rich.table  # noqa: F401
+from rich.console import Console
+
+from config import Config
+from performance_monitor import PerformanceMonitor
+
+BUDGET = 0.01  # Share of the event loop the monitor may use, as in ``benchmark.py monitor``
+
+
+def _monitor(headless=False):
+    monitor = PerformanceMonitor(1_000_000, Config(headless=headless, metrics_interval=0.1))
+    monitor.console = Console(file=io.StringIO(), force_terminal=True, width=120)
+    return monitor
+
+
+async def _drive(monitor, seconds):
+    """Report a result about every millisecond, as a busy run does."""
+    counts = {'valid': 0, 'taken': 0, 'censored': 0, 'errors': 0}
+    began = time.perf_counter()
+    processed = 0
+    while time.perf_counter() - began < seconds:
+        processed += 1
+        counts['taken'] += 1
+        monitor.update_progress(processed, counts)
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.parametrize('headless', [False, True])
+def test_stop_cancels_the_refresh_task_and_joins_the_sampler(headless, capsys):
+    async def run():
+        monitor = _monitor(headless)
+        monitor.system_sample_interval = 60.0  # stop() must not wait out a sample
+        await monitor.start()
+        task, sampler = monitor._task, monitor._sampler
+        await _drive(monitor, 0.2)
+
+        began = time.perf_counter()
+        await monitor.stop()
+        assert time.perf_counter() - began < 1.0
+        assert task.cancelled()
+        assert not sampler.is_alive()
+        assert monitor._task is None and monitor._sampler is None
+        assert [other for other in asyncio.all_tasks() if other is not asyncio.current_task()] == []
+
+    asyncio.run(run())
+
+
+def test_idle_monitor_only_wakes_once_per_interval():
+    async def run():
+        monitor = _monitor()
+        await monitor.start()
+        await asyncio.sleep(0.5)
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(run())
+    assert 1 <= monitor.refreshes <= 0.5 / monitor.config.progress_update_interval + 2
+
+
+def test_failing_refresh_still_waits_out_its_interval():
+    async def run():
+        monitor = _monitor()
+
+        def broken():
+            raise RuntimeError("display failed")
+        monitor._update_display = broken
+        await monitor.start()
+        await asyncio.sleep(0.5)
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(run())
+    assert monitor.refresh_errors == monitor.refreshes
+    assert monitor.refreshes <= 0.5 / monitor.config.progress_update_interval + 2
+    assert isinstance(monitor.last_error, RuntimeError)
+
+
+@pytest.fixture
+def quick_thread_switches():
+    """Make threads hand the GIL back sooner.
+
+    rich redraws the live display from its own thread, which can hold the
+    GIL for a whole switch interval (5 ms) in the middle of a refresh; that
+    would be counted against the monitor, though it is rich's time.
+    """
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(0.0005)
+    yield
+    sys.setswitchinterval(previous)
+
+
+@pytest.mark.parametrize('headless', [False, True])
+def test_overhead_stays_under_budget(headless, capsys, quick_thread_switches):
+    async def run():
+        monitor = _monitor(headless)
+        await monitor.start()
+        await _drive(monitor, 1.0)
+        overhead = monitor.overhead
+        await monitor.stop()
+        return monitor, overhead
+
+    monitor, overhead = asyncio.run(run())
+    assert monitor.refreshes > 1
+    assert overhead < BUDGET
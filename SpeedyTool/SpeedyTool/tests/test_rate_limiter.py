@@ -0,0 +1,128 @@
+"""The concurrency limiter holds its cap through resizes and cancellations; the pacer finds the API's rate."""
+
+import asyncio
+import random
+
+import pytest
+
+from rate_limiter import ConcurrencyLimiter, TokenBucketPacer
+
+
+def test_cap_holds_under_a_resize_storm():
+    async def run() -> None:
+        rng = random.Random(1)
+        limiter = ConcurrencyLimiter(8)
+        holding = 0
+        stopping = False
+        # Collected rather than raised, as a cancelled client's exception is never awaited
+        violations = []
+
+        def check_cap(before: int) -> None:
+            # New permits only go out below the limit; shrinking never takes held ones back
+            if limiter.in_flight > max(limiter.limit, before) or limiter.in_flight < holding:
+                violations.append((before, limiter.limit, limiter.in_flight, holding))
+
+        async def client() -> None:
+            nonlocal holding
+            while not stopping:
+                await limiter.acquire()
+                holding += 1
+                try:
+                    await asyncio.sleep(rng.random() * 0.002)
+                finally:
+                    holding -= 1
+                    before = limiter.in_flight - 1
+                    limiter.release()
+                    check_cap(before)
+
+        clients = [asyncio.create_task(client()) for _ in range(40)]
+        for _ in range(300):
+            before = limiter.in_flight
+            limiter.resize(rng.randint(1, 8))
+            check_cap(before)
+            # Replace a client at random, so permits get handed to cancelled waiters
+            index = rng.randrange(len(clients))
+            clients[index].cancel()
+            clients[index] = asyncio.create_task(client())
+            await asyncio.sleep(rng.random() * 0.001)
+
+        stopping = True
+        await asyncio.wait_for(asyncio.gather(*clients), timeout=5.0)
+        assert violations == []
+        assert limiter.peak_in_flight == 8
+        assert limiter.in_flight == 0
+        assert limiter.waiting == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_leaks_no_permit():
+    async def run() -> ConcurrencyLimiter:
+        limiter = ConcurrencyLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        # Handed the permit and cancelled in the same step, before it could run
+        limiter.release()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert limiter.in_flight == 0
+        await asyncio.wait_for(limiter.acquire(), timeout=1.0)
+        return limiter
+
+    assert asyncio.run(run()).in_flight == 1
+
+
+def test_shrinking_waits_for_holders_to_drain():
+    async def run() -> None:
+        limiter = ConcurrencyLimiter(3)
+        for _ in range(3):
+            await limiter.acquire()
+        limiter.resize(1)
+        waiter = asyncio.create_task(limiter.acquire())
+        limiter.release()
+        limiter.release()
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        limiter.release()
+        await asyncio.wait_for(waiter, timeout=1.0)
+        assert limiter.in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_pacer_backs_off_once_per_window_and_climbs_back_to_what_held():
+    now = [0.0]
+    pacer = TokenBucketPacer(1000.0, clock=lambda: now[0])
+    # Nine in ten of the requests in flight at 1000/s got through
+    for _ in range(2):
+        pacer.observe(429, {'Retry-After': '1'})
+    for _ in range(18):
+        pacer.observe(200)
+    assert pacer.rate == 500
+    assert pacer.paused_until == 1.0
+
+    now[0] = 1.1
+    pacer.observe(200)
+    assert pacer.held_rate == pytest.approx(900)
+    assert pacer.rate == pytest.approx(590)
+    now[0] = 3.0
+    pacer.observe(200)
+    assert pacer.rate == pytest.approx(900)
+    now[0] = 13.0
+    pacer.observe(200)
+    assert pacer.rate == pytest.approx(915)
+
+
+def test_pacer_comes_down_at_once_to_a_rate_that_held_below_the_cut():
+    now = [0.0]
+    pacer = TokenBucketPacer(1000.0, clock=lambda: now[0])
+    for _ in range(15):
+        pacer.observe(429, {'Retry-After': '1'})
+    for _ in range(5):
+        pacer.observe(200)
+
+    now[0] = 1.0
+    pacer.observe(200)
+    assert pacer.held_rate == pytest.approx(250)
+    assert pacer.rate == pytest.approx(250)
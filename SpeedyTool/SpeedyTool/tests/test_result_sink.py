@@ -0,0 +1,62 @@
+"""Result sinks write whole records, read back intact, and resume at a checkpointed size."""
+
+import json
+
+import pytest
+
+from result_sink import ResultSink, SinkRecord, open_sink, read_binary_results
+
+RECORDS = [
+    SinkRecord('first', 'valid', 0, 0.25),
+    SinkRecord('second', 'taken', 1, 0.5),
+    SinkRecord('third', 'HTTP_429', None, 0.0, 'Too many requests'),
+]
+
+
+def test_base_without_an_encoding_cannot_be_created(tmp_path):
+    with pytest.raises(TypeError, match='encode'):
+        ResultSink(str(tmp_path / 'out'))
+
+
+def test_format_follows_the_extension(tmp_path):
+    with open_sink(str(tmp_path / 'out.jsonl')) as sink:
+        sink.write_records(RECORDS)
+    lines = (tmp_path / 'out.jsonl').read_text().splitlines()
+    assert [json.loads(line)['username'] for line in lines] == ['first', 'second', 'third']
+    assert json.loads(lines[2])['error'] == 'Too many requests'
+
+
+def test_binary_records_read_back_with_custom_statuses(tmp_path):
+    path = str(tmp_path / 'out.bin')
+    with open_sink(path) as sink:
+        sink.write_records(RECORDS)
+        assert sink.records_written == len(RECORDS)
+    assert list(read_binary_results(path)) == RECORDS
+
+
+def test_binary_reader_stops_at_a_torn_tail(tmp_path):
+    path = tmp_path / 'out.bin'
+    with open_sink(str(path)) as sink:
+        sink.write_records(RECORDS)
+    path.write_bytes(path.read_bytes()[:-3])
+    assert list(read_binary_results(str(path))) == RECORDS[:2]
+
+
+def test_resume_cuts_the_file_back_to_the_synced_size(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    with open_sink(path) as sink:
+        sink.write_records(RECORDS[:1])
+        size = sink.sync()
+        sink.write_records(RECORDS[1:])
+
+    with open_sink(path, resume_at=size) as sink:
+        sink.write_records(RECORDS[2:])
+    with open(path) as f:
+        rows = f.read().splitlines()
+    assert rows[0].startswith('Username,')
+    assert [row.split(',')[0] for row in rows[1:]] == ['first', 'third']
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Unknown output format'):
+        open_sink(str(tmp_path / 'out'), 'xml')
@@ -0,0 +1,56 @@
+"""The taken-name index survives empty or broken files and runs saving at once."""
+
+import os
+from types import SimpleNamespace
+
+from taken_index import TakenIndex
+
+
+def _config(path):
+    return SimpleNamespace(taken_index_path=str(path))
+
+
+def test_empty_file_opens_as_an_empty_index(tmp_path):
+    path = tmp_path / 'taken.idx'
+    path.touch()
+    with TakenIndex.from_config(_config(path)) as index:
+        assert len(index) == 0
+        assert 'someone' not in index
+        index.add('someone')
+    assert 'someone' in TakenIndex(str(path))
+
+
+def test_corrupt_file_warns_and_starts_empty(tmp_path, capsys):
+    path = tmp_path / 'taken.idx'
+    path.write_bytes(b'not an index at all' * 10)
+    with TakenIndex.from_config(_config(path)) as index:
+        assert len(index) == 0
+        index.add('someone')
+    assert 'taken-name index' in capsys.readouterr().err
+    assert list(TakenIndex(str(path))) == ['someone']
+
+
+def test_runs_saving_one_index_keep_each_others_names(tmp_path):
+    path = str(tmp_path / 'taken.idx')
+    with TakenIndex(path) as index:
+        index.add('shared')
+
+    first, second = TakenIndex(path), TakenIndex(path)
+    first.add('first1')
+    second.add('second1')
+    first.close()
+    second.close()
+
+    assert list(TakenIndex(path)) == ['first1', 'shared', 'second1']
+    assert os.listdir(tmp_path) == ['taken.idx']
+
+
+def test_saved_index_is_readable_by_others(tmp_path):
+    path = str(tmp_path / 'taken.idx')
+    previous = os.umask(0o022)
+    try:
+        with TakenIndex(path) as index:
+            index.add('someone')
+    finally:
+        os.umask(previous)
+    assert os.stat(path).st_mode & 0o777 == 0o644
@@ -0,0 +1,63 @@
+"""The renderer sends only changed lines, drops frames over its rate, and stays off pipes."""
+
+import io
+
+from terminal_renderer import CLEAR_LINE, CLEAR_SCREEN, TerminalRenderer, move_to
+
+
+def _renderer(**kwargs):
+    stream = io.StringIO()
+    kwargs.setdefault('max_fps', 0)
+    kwargs.setdefault('enabled', True)
+    return TerminalRenderer(stream, **kwargs), stream
+
+
+def _written(stream):
+    text = stream.getvalue()
+    stream.seek(0)
+    stream.truncate()
+    return text
+
+
+def test_first_frame_clears_then_only_changes_are_sent():
+    renderer, stream = _renderer()
+    renderer.draw(['title', 'count: 1', 'footer'])
+    assert _written(stream) == CLEAR_SCREEN + 'title\ncount: 1\nfooter' + move_to(4)
+
+    renderer.draw(['title', 'count: 2', 'footer'])
+    assert _written(stream) == move_to(2) + 'count: 2' + CLEAR_LINE + move_to(4)
+    assert renderer.frames == 2
+
+
+def test_rows_left_over_from_a_longer_frame_are_blanked():
+    renderer, stream = _renderer()
+    renderer.draw(['one', 'two', 'three'])
+    _written(stream)
+    renderer.draw(['one'])
+    assert _written(stream) == move_to(2) + CLEAR_LINE + move_to(3) + CLEAR_LINE + move_to(2)
+
+
+def test_frames_over_the_rate_are_dropped_unless_forced():
+    renderer, _ = _renderer(max_fps=1.0)
+    assert renderer.draw(['a'])
+    assert not renderer.draw(['b'])
+    assert renderer.draw(['c'], force=True)
+    assert (renderer.frames, renderer.dropped) == (2, 1)
+
+
+def test_clear_makes_the_next_frame_full():
+    renderer, stream = _renderer()
+    renderer.draw(['same'])
+    renderer.clear()
+    _written(stream)
+    renderer.draw(['same'])
+    assert _written(stream).startswith(CLEAR_SCREEN + 'same')
+
+
+def test_nothing_is_drawn_when_the_stream_is_not_a_terminal():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(stream)
+    assert not renderer.enabled
+    assert not renderer.draw(['a'], force=True)
+    renderer.clear()
+    assert stream.getvalue() == ''
@@ -0,0 +1,10 @@
+"""The thread-pool base can't be used without a way to draw its progress."""
+
+import pytest
+
+from threaded_checker import ThreadedChecker
+
+
+def test_base_without_a_display_cannot_be_created():
+    with pytest.raises(TypeError, match='display_progress'):
+        ThreadedChecker()
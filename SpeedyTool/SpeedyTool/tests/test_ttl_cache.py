@@ -0,0 +1,65 @@
+"""The response cache evicts the least recently used entry and expires entries lazily."""
+
+import pytest
+
+from ttl_cache import TTLCache
+
+
+def _cache(max_size=3, ttl=10.0):
+    now = [0.0]
+    return TTLCache(max_size, ttl, clock=lambda: now[0]), now
+
+
+def test_overflow_evicts_the_least_recently_used_entry():
+    cache, _ = _cache()
+    for key in 'abc':
+        cache.put(key, key.upper())
+    assert cache.get('a') == 'A'  # Now the most recently used
+    cache.put('d', 'D')
+
+    assert len(cache) == 3
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in 'acd'] == ['A', 'C', 'D']
+    assert cache.stats.evictions == 1
+
+
+def test_entries_expire_on_lookup_and_count_as_misses():
+    cache, now = _cache()
+    cache.put('a', 'A')
+    now[0] = 9.9
+    assert cache.get('a') == 'A'
+    now[0] = 10.0
+    assert cache.get('a', 'gone') == 'gone'
+
+    assert len(cache) == 0
+    assert cache.stats.expirations == 1
+    assert cache.get_stats()['cache_hit_ratio'] == pytest.approx(0.5)
+
+
+def test_putting_again_refreshes_the_expiry_and_recency():
+    cache, now = _cache()
+    for key in 'abc':
+        cache.put(key, key)
+    now[0] = 8.0
+    cache.put('a', 'again')
+    cache.put('d', 'd')
+
+    assert cache.get('b') is None
+    now[0] = 15.0
+    assert cache.get('a') == 'again'
+    assert cache.get('c') is None
+
+
+def test_an_expired_entry_pushed_out_counts_as_expired():
+    cache, now = _cache(max_size=1)
+    cache.put('a', 'A')
+    now[0] = 20.0
+    cache.put('b', 'B')
+
+    assert cache.stats.expirations == 1
+    assert cache.stats.evictions == 0
+
+
+def test_size_must_be_positive():
+    with pytest.raises(ValueError):
+        TTLCache(0, 1.0)
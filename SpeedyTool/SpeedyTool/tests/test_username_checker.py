@@ -0,0 +1,37 @@
+"""The async checker's monitor counts every name it writes, however it was answered."""
+
+import asyncio
+
+from config import Config
+from username_checker import UltraUsernameChecker
+
+# Too short or with characters Roblox never allows: answered without a request
+INVALID = ['ab', 'x', 'bad name', 'no!', '__edge__']
+
+
+def _run(url: str, names):
+    config = Config(result_store_path=None, taken_index_path=None, censor_model_path=None,
+                    headless=True, metrics_interval=3600.0, api_url=url)
+
+    async def run():
+        async with UltraUsernameChecker(config) as checker:
+            results = await checker.process_usernames(names)
+        return checker, results
+
+    return asyncio.run(run())
+
+
+def test_locally_answered_names_count_as_processed(mock_api):
+    checker, results = _run(mock_api.url, INVALID)
+
+    assert mock_api.stats.requests == 0
+    assert len(results) == len(INVALID)
+    assert checker.monitor.metrics.total_processed == len(INVALID)
+
+
+def test_monitor_total_matches_rows_written(mock_api):
+    names = INVALID + [f"check{i:03d}" for i in range(50)]
+    checker, results = _run(mock_api.url, names)
+
+    assert mock_api.stats.requests == 50
+    assert checker.monitor.metrics.total_processed == len(results) == len(names)
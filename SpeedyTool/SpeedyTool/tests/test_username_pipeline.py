@@ -0,0 +1,40 @@
+"""Spellings of one name cost a single request, and its answer reaches every spelling."""
+
+from result_model import CheckResult
+from username_pipeline import canonical_username, prepare_usernames
+
+
+def _rebind(result, username):
+    return CheckResult(username, result.status, result.code)
+
+
+def test_spellings_collapse_to_the_first_one_seen():
+    batch = prepare_usernames(['Alpha', ' alpha ', 'ALPHA', 'beta', 'Alpha', '', '  ', 'Beta'])
+
+    assert batch.to_check == ['Alpha', 'beta']
+    assert batch.total_input == 6
+    assert batch.duplicates == 4
+    assert batch.spellings == {'alpha': ['Alpha', 'alpha', 'ALPHA'], 'beta': ['beta', 'Beta']}
+
+
+def test_one_answer_fans_out_to_every_spelling():
+    batch = prepare_usernames(['Alpha', 'ALPHA', 'beta'])
+    results = [CheckResult('Alpha', 'taken', 1), CheckResult('beta', 'valid', 0)]
+
+    expanded = batch.fan_out(results, lambda result: result.username, _rebind)
+    assert [(result.username, result.status) for result in expanded] == [
+        ('Alpha', 'taken'), ('ALPHA', 'taken'), ('beta', 'valid')]
+
+
+def test_absorbed_spellings_fan_out_and_unseen_names_are_returned():
+    batch = prepare_usernames(['Alpha'])
+    unseen = batch.absorb([CheckResult('aLPHA', 'taken', 1), CheckResult('gamma', 'valid', 0)],
+                          lambda result: result.username)
+
+    assert [result.username for result in unseen] == ['gamma']
+    expanded = batch.fan_out([CheckResult('Alpha', 'taken', 1)], lambda result: result.username, _rebind)
+    assert [result.username for result in expanded] == ['Alpha', 'aLPHA']
+
+
+def test_canonical_form_ignores_case_and_surrounding_space():
+    assert canonical_username('  StraSSe\n') == canonical_username('strasse')
@@ -0,0 +1,34 @@
+"""Names that break Roblox's username rules are caught locally, in bulk and one at a time."""
+
+import pytest
+
+from username_rules import is_valid_format, partition_usernames
+
+VALID = ['abc', 'Player_One', 'a' * 20, '123', 'x_9']
+INVALID = ['ab', 'a' * 21, '_lead', 'trail_', 'two__under', 'one_two_three', 'space here', 'émile', 'dash-ed', '']
+
+
+@pytest.mark.parametrize('username', VALID)
+def test_valid_names_pass(username):
+    assert is_valid_format(username)
+
+
+@pytest.mark.parametrize('username', INVALID)
+def test_invalid_names_fail(username):
+    assert not is_valid_format(username)
+
+
+def test_partition_matches_the_single_name_check_and_keeps_order():
+    names = [name for pair in zip(VALID, INVALID) for name in pair]
+    possible, invalid = partition_usernames(names)
+
+    assert possible == VALID
+    assert invalid == INVALID[:len(VALID)]
+    assert partition_usernames([]) == ([], [])
+
+
+def test_embedded_newline_never_passes_as_a_fragment():
+    possible, invalid = partition_usernames(['good1', 'bad\nname', 'bad'])
+    assert possible == ['good1', 'bad']
+    assert invalid == ['bad\nname']
+    assert not is_valid_format('good1\n')
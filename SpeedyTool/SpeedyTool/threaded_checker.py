@@ -0,0 +1,213 @@
+"""The thread-pool run behind the simple and colorful checkers, which only draw it."""
+
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, List, Optional, Tuple
+
+from candidate_source import CandidateSource, check_batches
+from check_engine import SyncCheckEngine, create_requests_session
+from checkpoint import Checkpoint
+from config import Config
+from live_progress import ProgressCounters, ProgressLoop, ProgressSnapshot, emit_metrics
+from result_model import CheckResult, ResultTable
+from result_sink import ResultSink
+from username_pipeline import CheckFlow, UsernameBatch
+
+
+class ThreadedChecker(ABC):
+    """Check usernames on a thread pool; subclasses draw the progress and the summary.
+
+    Subclasses implement ``display_progress`` and may override ``notify`` to
+    style messages, ``start_display`` to draw a header and ``count_down`` to
+    give the user a moment before the first request.
+    """
+
+    progress_update_interval = 0.5  # Seconds between redraws of the live display
+    preview = 15  # Most recent valid names kept for the live display
+    stopping_message = "\n\n⏹️ Stopping early... Preparing results..."
+
+    def __init__(self, max_workers: int = 50, flow: Optional[CheckFlow] = None,
+                 headless: bool = False, metrics_interval: float = 5.0, api_url: Optional[str] = None):
+        self.max_workers = max_workers
+        self.api_url = api_url or Config.api_url
+        self.flow = flow or CheckFlow()
+        self.headless = headless
+        self.metrics_interval = metrics_interval
+        self.session = create_requests_session(pool_size=max_workers)
+        self.engine = SyncCheckEngine(self.session, self.api_url, Config.birthday)
+
+        # Performance tracking
+        self.start_time = None
+        self.counters = ProgressCounters(preview=self.preview)
+        self.batch = UsernameBatch()
+
+    def check_username(self, username: str) -> CheckResult:
+        """Check a single username."""
+        outcome = self.engine.check(username)
+        return CheckResult(username, outcome.status, outcome.code, outcome.error, outcome.response_time)
+
+    def notify(self, style: str, message: str) -> None:
+        """Show a message; ``style`` is 'accent', 'info', 'success' or 'warning'."""
+        print(message)
+
+    def start_display(self) -> None:
+        """Called before anything else is shown for a run."""
+
+    def count_down(self) -> None:
+        """Called once the run has been described, just before the first request."""
+
+    @abstractmethod
+    def display_progress(self, snapshot: ProgressSnapshot) -> None:
+        """Draw the live progress display."""
+
+    def log_progress(self, snapshot: ProgressSnapshot) -> None:
+        """Print progress as a JSON metrics line (headless mode)."""
+        emit_metrics('progress', snapshot.to_record())
+
+    def _progress_loop(self) -> ProgressLoop:
+        if self.headless:
+            return ProgressLoop(self.counters, self.log_progress, self.metrics_interval)
+        return ProgressLoop(self.counters, self.display_progress, self.progress_update_interval)
+
+    def _count(self, result: CheckResult, progress: ProgressLoop) -> None:
+        self.counters.add(result)
+        # Valid usernames show up straight away instead of on the next redraw
+        if result.status == 'valid' and not self.headless:
+            progress.poke()
+
+    def _describe(self, batch: UsernameBatch, restored: int) -> None:
+        """Tell the user which names won't cost a request, and why."""
+        notices: List[Tuple[bool, str, str]] = [
+            (batch.duplicates, 'warning', f"♻️ Skipping {batch.duplicates:,} case-insensitive duplicates"),
+            (batch.invalid_format, 'warning',
+             f"🧹 Skipping {len(batch.invalid_format):,} names that break Roblox username rules"),
+            (batch.known_taken, 'warning', f"🔒 Skipping {len(batch.known_taken):,} names earlier runs saw taken"),
+            (batch.predicted_censored, 'warning',
+             f"🧠 Skipping {len(batch.predicted_censored):,} names the censor filter predicts censored"),
+            (batch.cached, 'success', f"💾 Reusing {len(batch.cached):,} fresh answers from the result store"),
+            (restored, 'success', f"⏩ Restoring {restored:,} usernames finished before the interruption"),
+        ]
+        for shown, style, message in notices:
+            if shown:
+                self.notify(style, message)
+
+    def process_usernames(self, usernames: List[str]) -> ResultTable:
+        """Check a list of usernames, skipping every name that can be answered without a request."""
+        # Skip the finished prefix and collapse case-insensitive duplicates,
+        # so each distinct name costs at most one request
+        self.batch, restored = self.flow.begin(usernames)
+        usernames = self.batch.to_check
+
+        self.start_display()
+        self.notify('accent', f"🚀 Starting to check {len(usernames):,} usernames with {self.max_workers} threads...")
+        self._describe(self.batch, len(restored) + len(self.batch.resumed))
+        self.notify('info', "💡 Use Ctrl+C to stop early and see results")
+        self.count_down()
+
+        self.start_time = time.time()
+        resumed, decided = self.flow.decided(self.batch)
+        self.flow.checkpoint_results(decided)
+        known = restored + resumed + decided
+        results = ResultTable(self.flow.write(self.batch, known))
+
+        self.counters = ProgressCounters(len(usernames) + len(known), preview=self.preview)
+        self.counters.add_many(known)
+
+        finished = False
+        try:
+            with self._progress_loop() as progress:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = [executor.submit(self.check_username, username) for username in usernames]
+                    for future in as_completed(futures):
+                        result = future.result()
+                        self.flow.remember(result)
+                        results.extend(self.flow.write(self.batch, [result]))
+                        self.flow.checkpoint_results([result])
+                        self._count(result, progress)
+            finished = True
+        except KeyboardInterrupt:
+            self.notify('warning', self.stopping_message)
+            time.sleep(1)
+        finally:
+            self.flow.finish(finished)
+
+        return results
+
+    def process_stream(self, names: Iterable[str], total_hint: int = 0) -> ResultTable:
+        """Check names pulled lazily from ``names``, such as a candidate source.
+
+        Names are pulled, deduplicated and prefiltered one batch at a time,
+        and only while fewer than two checks per thread are waiting, so the
+        first request goes out as soon as the first batch is ready however
+        long the input is. Duplicates are collapsed within a batch; across
+        batches the result store answers names that were already checked.
+        """
+        self.start_display()
+        self.notify('accent', f"🚀 Checking usernames as they arrive with {self.max_workers} threads...")
+        self.notify('info', "💡 Use Ctrl+C to stop early and see results")
+
+        self.start_time = time.time()
+        results = ResultTable()
+        self.counters = ProgressCounters(total_hint, preview=self.preview)
+        pulled = 0
+
+        def prepare(lines: List[str]) -> Tuple[List[str], UsernameBatch]:
+            nonlocal pulled
+            batch = self.flow.prepare(lines)
+            resumed, decided = self.flow.decided(batch)
+            decided.extend(resumed)
+
+            # The total grows as names arrive, unless the source knew its size up front
+            pulled += len(batch.to_check) + len(decided)
+            self.counters.total = max(total_hint, pulled)
+            results.extend(self.flow.write(batch, decided))
+            self.counters.add_many(decided)
+            return batch.to_check, batch
+
+        def on_done(result: CheckResult, batch: UsernameBatch) -> None:
+            self.flow.remember(result)
+            results.extend(self.flow.write(batch, [result]))
+            self._count(result, progress)
+
+        try:
+            with self._progress_loop() as progress:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    check_batches(executor, names, self.check_username, prepare, on_done,
+                                  window=2 * self.max_workers)
+        except KeyboardInterrupt:
+            self.notify('warning', self.stopping_message)
+            time.sleep(1)
+
+        return results
+
+    def run(self, config: Config, output_path: str, usernames: Optional[List[str]] = None,
+            source: Optional[CandidateSource] = None, input_file: str = "usernames.txt",
+            resume: bool = False) -> ResultTable:
+        """Check ``usernames`` (or names from ``source``) with everything ``config`` asks for.
+
+        Opens the result store, taken index and censor model, a checkpoint
+        for ``input_file`` when checking a list, and a sink at
+        ``output_path``; all of them are closed again before returning.
+        """
+        self.flow = CheckFlow.from_config(config)
+        if source is None:
+            self.flow.checkpoint = Checkpoint.open_for_run(input_file, resume, config.checkpoint_interval)
+            if self.flow.checkpoint.completed:
+                self.notify('success', f"⏩ Resuming: {len(self.flow.checkpoint.completed):,} usernames already finished")
+            elif resume:
+                self.notify('warning', "ℹ️ No checkpoint found, starting from the beginning")
+
+        # Raw results are appended to this file while checking, not dumped at the end
+        self.flow.sink = ResultSink.from_config(config, output_path)
+        try:
+            if source is None:
+                return self.process_usernames(usernames or [])
+            # The generator passes over names already known to be taken
+            source.taken = self.flow.taken
+            self.flow.source = source
+            with source:
+                return self.process_stream(source, source.count or 0)
+        finally:
+            self.flow.sink.close()
+            self.flow.close()
@@ -0,0 +1,92 @@
+"""Bounded LRU cache with lazy TTL expiry and O(1) get/put."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar('V')
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how a cache has been used."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups that were answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(Generic[V]):
+    """LRU cache whose entries also expire ``ttl`` seconds after being stored.
+
+    Entries live in an ``OrderedDict`` in least-recently-used order, so a hit
+    is a ``move_to_end`` and an overflow evicts exactly one entry with
+    ``popitem(last=False)``. Expired entries are dropped lazily when they are
+    looked up or reach the LRU end, so no operation ever scans the cache.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: 'OrderedDict[Hashable, Tuple[V, float]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[V]:
+        """Return the cached value for ``key`` or ``default`` if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Store ``value``, evicting the least recently used entry if full."""
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+        entries[key] = (value, self.clock() + self.ttl)
+
+        if len(entries) > self.max_size:
+            _, (_, expires_at) = entries.popitem(last=False)
+            if expires_at <= self.clock():
+                self.stats.expirations += 1
+            else:
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Return counters in the same shape as the optimizer statistics."""
+        return {
+            'cache_size': len(self._entries),
+            'cache_hits': self.stats.hits,
+            'cache_misses': self.stats.misses,
+            'cache_evictions': self.stats.evictions,
+            'cache_expirations': self.stats.expirations,
+            'cache_hit_ratio': self.stats.hit_ratio,
+        }
@@ -1,27 +1,35 @@
 """Ultra-high-performance async username checker with intelligent optimizations."""
 
 import asyncio
-import aiohttp
 import aiofiles
-import time
-import ujson
-from typing import List, Dict, Optional, Tuple, AsyncGenerator
+from contextlib import aclosing
+from collections import deque
+from typing import List, Dict, NamedTuple, Optional, Tuple, AsyncGenerator, AsyncIterator, Callable, Deque
 from dataclasses import dataclass
-from pathlib import Path
 
 from config import Config
 from rate_limiter import AdaptiveRateLimiter
 from performance_monitor import PerformanceMonitor
-from advanced_optimizations import AdvancedRequestOptimizer, UltraFastBatchProcessor
+from advanced_optimizations import AdvancedRequestOptimizer
+from check_engine import AsyncCheckEngine, CheckOutcome
+from username_pipeline import CheckFlow, UsernameBatch
+from worker_pool import RetryLater, WorkerPool
+from retry_queue import RetryQueue
+from result_model import CheckResult, ResultTable
 
 @dataclass
-class CheckResult:
-    """Result of a username check."""
+class PendingBatch:
+    """A streamed batch whose network checks are still running."""
+    lines: List[str]
+    batch: UsernameBatch
+    results: List[CheckResult]
+    remaining: int
+
+class CheckJob(NamedTuple):
+    """One username on its way through the worker pool."""
     username: str
-    status: str  # 'valid', 'taken', 'censored', 'error'
-    code: Optional[int] = None
-    error_message: Optional[str] = None
-    response_time: float = 0.0
+    attempt: int = 0
+    first_failure: float = 0.0  # When its first attempt failed; 0 until then
 
 class UltraUsernameChecker:
     """Ultra-high-performance async username checker."""
@@ -30,81 +38,56 @@ class UltraUsernameChecker:
         self.config = config
         self.rate_limiter = AdaptiveRateLimiter(config)
         self.monitor: Optional[PerformanceMonitor] = None
-        self.session: Optional[aiohttp.ClientSession] = None
         
-        # Advanced optimizations
+        # Advanced optimizations; requests go through the shared check engine
         self.optimizer = AdvancedRequestOptimizer(config)
-        self.batch_processor: Optional[UltraFastBatchProcessor] = None
+        self.engine: Optional[AsyncCheckEngine] = None
+        
+        # Failed checks wait out their backoff here instead of inside a worker
+        self.retries: RetryQueue[Tuple[CheckJob, Callable]] = RetryQueue(config.retry_queue_size, config.retry_budget)
+        
+        # Answers remembered from previous runs; the caller adds the checkpoint and the sink
+        self.flow = CheckFlow.from_config(config)
+        
+        # Run-wide totals, kept up to date in both list and streaming mode
+        self.processed_count = 0
+        self.cached_count = 0
+        self.known_taken_count = 0
+        self.predicted_censored_count = 0
+        self.duplicate_count = 0
+        self.resumed_count = 0
+        self.valid_usernames: List[str] = []
         
         # Results tracking
-        self.results: List[CheckResult] = []
+        self.results = ResultTable()
+        self.batch: Optional[UsernameBatch] = None
         self.result_counts = {
-            'valid': 0, 'taken': 0, 'censored': 0, 'errors': 0
+            'valid': 0, 'taken': 0, 'censored': 0, 'invalid_format': 0, 'errors': 0
         }
         
     async def __aenter__(self):
         """Async context manager entry."""
-        await self._create_session()
         await self.optimizer.create_session_pool(pool_size=5)  # Create session pool
-        self.batch_processor = UltraFastBatchProcessor(self.optimizer, self.rate_limiter)
+        self.engine = AsyncCheckEngine(
+            self.config,
+            self.rate_limiter,
+            self.optimizer.get_next_session,
+            latency=self.optimizer.latency,
+            cache=self.optimizer.response_cache
+        )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        await self._close_session()
         await self.optimizer.close_session_pool()
-    
-    async def _create_session(self) -> None:
-        """Create optimized aiohttp session."""
-        # Ultra-optimized connector settings for maximum performance
-        connector = aiohttp.TCPConnector(
-            limit=1000,  # Total connection pool size
-            limit_per_host=400,  # Connections per host
-            ttl_dns_cache=600,  # DNS cache TTL (10 minutes)
-            use_dns_cache=True,
-            keepalive_timeout=60,  # Longer keepalive
-            enable_cleanup_closed=True,
-            force_close=False,
-        )
-        
-        # Optimized timeout settings
-        timeout = aiohttp.ClientTimeout(
-            total=self.config.total_timeout,
-            connect=self.config.connect_timeout,
-            sock_read=self.config.read_timeout
-        )
-        
-        # Custom headers to optimize requests
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Cache-Control': 'no-cache',
-            'Connection': 'keep-alive',
-        }
-        
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            headers=headers,
-            json_serialize=ujson.dumps,  # Use ultra-fast JSON
-        )
-    
-    async def _close_session(self) -> None:
-        """Close the aiohttp session."""
-        if self.session:
-            await self.session.close()
+        self.flow.close()
     
     async def load_usernames(self, file_path: str) -> List[str]:
         """Load usernames from file with streaming for memory efficiency."""
         usernames = []
         try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as file:
-                async for line in file:
-                    username = line.strip()
-                    if username:  # Skip empty lines
-                        usernames.append(username)
+            async for username in self._read_lines(file_path):
+                usernames.append(username)
         except FileNotFoundError:
             raise FileNotFoundError(f"Username file not found: {file_path}")
         except Exception as e:
@@ -112,233 +95,299 @@ class UltraUsernameChecker:
         
         return usernames
     
-    async def check_username_batch(self, usernames: List[str]) -> List[CheckResult]:
-        """Check a batch of usernames with ultra-fast processing."""
-        if self.batch_processor:
-            # Use the advanced batch processor
-            raw_results = await self.batch_processor.process_batch_ultra_fast(usernames)
-            
-            # Convert raw results to CheckResult objects
-            batch_results = []
-            for i, result in enumerate(raw_results):
-                username = usernames[i]
-                
-                if 'error' in result:
-                    check_result = CheckResult(
-                        username=username,
-                        status='error',
-                        error_message=result['error']
-                    )
-                    self.result_counts['errors'] += 1
-                else:
-                    code = result.get('code')
-                    if code == 0:
-                        status = 'valid'
-                    elif code == 1:
-                        status = 'taken'
-                    elif code == 2:
-                        status = 'censored'
-                    else:
-                        status = 'error'
-                    
-                    check_result = CheckResult(
-                        username=username,
-                        status=status,
-                        code=code
-                    )
-                    self.result_counts[status] += 1
-                
-                batch_results.append(check_result)
-            
-            return batch_results
+    async def check_username(self, username: str) -> CheckResult:
+        """Check a single username through the shared check engine."""
+        if self.engine is None:
+            raise RuntimeError("Checker not started; use 'async with'")
+        
+        return self._outcome_result(username, await self.engine.check(username))
+    
+    def _outcome_result(self, username: str, outcome: CheckOutcome) -> CheckResult:
+        """Build and count the result of a final answer from the engine."""
+        self.result_counts['errors' if outcome.status == 'error' else outcome.status] += 1
+        return CheckResult(
+            username=username,
+            status=outcome.status,
+            code=outcome.code,
+            error_message=outcome.error,
+            response_time=outcome.response_time
+        )
+    
+    @property
+    def requests_sent(self) -> int:
+        """API requests made so far, retries included; answers found locally don't count."""
+        return self.optimizer.latency.total.count
+    
+    @property
+    def answered_locally(self) -> int:
+        """Names answered by the checkpoint, the result store, the taken index or the censor filter."""
+        return self.resumed_count + self.cached_count + self.known_taken_count + self.predicted_censored_count
+    
+    def _count(self, results: List[CheckResult]) -> List[CheckResult]:
+        """Count results that were decided without a request."""
+        for result in results:
+            self.result_counts['errors' if result.status == 'error' else result.status] += 1
+        return results
+    
+    def _decided_results(self, batch: UsernameBatch) -> Tuple[List[CheckResult], List[CheckResult]]:
+        """Return (resumed, decided) results for names in ``batch`` that need no request."""
+        resumed, decided = self.flow.decided(batch)
+        return self._count(resumed), self._count(decided)
+    
+    def _account(self, batch: UsernameBatch, results) -> None:
+        """Update run-wide totals with a finished, fanned-out batch (a list or a ``ResultTable``)."""
+        self.processed_count += len(results)
+        self.cached_count += len(batch.cached)
+        self.known_taken_count += len(batch.known_taken)
+        self.predicted_censored_count += len(batch.predicted_censored)
+        self.duplicate_count += batch.duplicates
+        self.resumed_count += len(batch.resumed)
+        if isinstance(results, ResultTable):
+            self.valid_usernames.extend(results.usernames_with('valid'))
         else:
-            # Fallback to original method
-            return await self._check_username_batch_fallback(usernames)
+            self.valid_usernames.extend(result.username for result in results if result.status == 'valid')
     
-    async def _check_username_batch_fallback(self, usernames: List[str]) -> List[CheckResult]:
-        """Fallback batch processing method."""
-        tasks = []
-        for username in usernames:
-            task = asyncio.create_task(self._check_single_username(username))
-            tasks.append(task)
+    async def _check_one(self, job: CheckJob) -> CheckResult:
+        """Try one username once and remember the answer.
         
-        # Execute all tasks concurrently and gather results
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results and handle exceptions
-        batch_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                # Handle exceptions
-                error_result = CheckResult(
-                    username=usernames[i],
-                    status='error',
-                    error_message=str(result)
-                )
-                batch_results.append(error_result)
-                self.result_counts['errors'] += 1
-            else:
-                batch_results.append(result)
-                self.result_counts[result.status] += 1
+        A transient failure is handed back to the pool as ``RetryLater`` while
+        the retry queue still has room and time for it, so the worker moves on
+        to the next name instead of sleeping through the backoff.
+        """
+        outcome, delay = await self.engine.attempt(job.username, job.attempt)
+        if delay is not None:
+            first_failure = job.first_failure or self.retries.clock()
+            if self.retries.admits(delay, first_failure):
+                raise RetryLater(job._replace(attempt=job.attempt + 1, first_failure=first_failure), delay)
         
-        return batch_results
+        result = self._outcome_result(job.username, outcome)
+        self.flow.remember(result)
+        return result
     
-    async def _check_single_username(self, username: str) -> CheckResult:
-        """Check a single username with rate limiting and retry logic."""
-        start_time = time.time()
-        
-        for attempt in range(self.config.max_retries + 1):
-            try:
-                # Apply rate limiting
-                await self.rate_limiter.acquire()
-                
-                try:
-                    # Make the API request
-                    url = f"{self.config.api_url}?Username={username}&Birthday={self.config.birthday}"
-                    
-                    async with self.session.get(url) as response:
-                        response_time = time.time() - start_time
-                        
-                        if response.status == 200:
-                            try:
-                                data = await response.json(loads=ujson.loads)
-                                code = data.get("code")
-                                
-                                # Record success
-                                self.rate_limiter.record_success(response_time)
-                                
-                                # Determine status based on code
-                                if code == 0:
-                                    status = 'valid'
-                                elif code == 1:
-                                    status = 'taken'
-                                elif code == 2:
-                                    status = 'censored'
-                                else:
-                                    status = 'error'
-                                
-                                return CheckResult(
-                                    username=username,
-                                    status=status,
-                                    code=code,
-                                    response_time=response_time
-                                )
-                            
-                            except (ValueError, KeyError) as e:
-                                # JSON parsing error
-                                self.rate_limiter.record_error("json_error")
-                                if attempt < self.config.max_retries:
-                                    await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
-                                    continue
-                                
-                                return CheckResult(
-                                    username=username,
-                                    status='error',
-                                    error_message=f"JSON parsing error: {e}",
-                                    response_time=response_time
-                                )
-                        
-                        elif response.status == 429:
-                            # Rate limited
-                            self.rate_limiter.record_error("429_rate_limit")
-                            if self.monitor:
-                                self.monitor.record_network_error()
-                            
-                            if attempt < self.config.max_retries:
-                                await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
-                                continue
-                        
-                        else:
-                            # Other HTTP error
-                            self.rate_limiter.record_error(f"http_{response.status}")
-                            if self.monitor:
-                                self.monitor.record_network_error()
-                            
-                            if attempt < self.config.max_retries:
-                                await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
-                                continue
-                
-                finally:
-                    self.rate_limiter.release()
-            
-            except asyncio.TimeoutError:
-                self.rate_limiter.record_error("timeout")
-                if self.monitor:
-                    self.monitor.record_timeout()
-                
-                if attempt < self.config.max_retries:
-                    await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
-                    continue
-            
-            except aiohttp.ClientError as e:
-                self.rate_limiter.record_error("client_error")
-                if self.monitor:
-                    self.monitor.record_network_error()
-                
-                if attempt < self.config.max_retries:
-                    await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
-                    continue
+    def _worker_pool(self) -> WorkerPool[CheckJob, CheckResult]:
+        """Create the pool that runs every network check.
         
-        # All retries exhausted
-        return CheckResult(
-            username=username,
-            status='error',
-            error_message="Max retries exhausted",
-            response_time=time.time() - start_time
-        )
+        There is one worker per request the rate limiter could ever allow;
+        how many are actually in flight is decided by the limiter itself.
+        """
+        return WorkerPool(self._check_one, self.config.max_concurrent_requests, retries=self.retries)
+    
+    def _update_progress(self, done: int) -> None:
+        self.monitor.update_concurrent(self.rate_limiter.in_flight)
+        self.monitor.update_progress(done, self.result_counts)
     
-    async def process_usernames(self, usernames: List[str]) -> List[CheckResult]:
+    async def process_usernames(self, usernames: List[str]) -> ResultTable:
         """Process all usernames with batching and performance monitoring."""
-        total_usernames = len(usernames)
+        # Skip the finished prefix and collapse case-insensitive duplicates,
+        # so each distinct name costs at most one request
+        self.batch, restored = self.flow.begin(usernames)
+        usernames = self.batch.to_check
+        total_usernames = (len(usernames) + len(self.batch.invalid_format) + len(self.batch.known_taken)
+                           + len(self.batch.predicted_censored) + len(self.batch.cached) + len(self.batch.resumed) + len(restored))
         
         # Initialize performance monitor
         self.monitor = PerformanceMonitor(total_usernames, self.config)
+        self.monitor.latency = self.optimizer.latency
+        self.engine.monitor = self.monitor
         await self.monitor.start()
         
+        finished = False
         try:
-            all_results = []
+            self.resumed_count += len(self._count(restored))
             
-            # Process usernames in chunks for memory efficiency
-            for i in range(0, total_usernames, self.config.chunk_size):
-                chunk = usernames[i:i + self.config.chunk_size]
-                
-                # Process chunk in smaller batches for optimal concurrency
-                for j in range(0, len(chunk), self.config.batch_size):
-                    batch = chunk[j:j + self.config.batch_size]
-                    
-                    # Update monitor with current concurrency
-                    self.monitor.update_concurrent(self.rate_limiter.current_concurrent)
-                    
-                    # Process batch
-                    batch_results = await self.check_username_batch(batch)
-                    all_results.extend(batch_results)
-                    
-                    # Update progress
-                    self.monitor.update_progress(len(all_results), self.result_counts)
+            resumed, decided = self._decided_results(self.batch)
+            self.flow.checkpoint_results(decided)
+            known = restored + resumed + decided
+            all_results = ResultTable(self.flow.write(self.batch, known))
+            done = len(known)
+            # Names answered locally count as processed even if no request ever finishes
+            self._update_progress(done)
+            
+            def on_done(result: CheckResult) -> None:
+                nonlocal done
+                all_results.extend(self.flow.write(self.batch, [result]))
+                self.flow.checkpoint_results([result])
+                done += 1
+                self._update_progress(done)
+            
+            # Workers pull names one at a time, so a slow request never stalls the rest
+            async with self._worker_pool() as pool:
+                for username in usernames:
+                    await pool.submit(CheckJob(username), on_done)
+                await pool.join()
             
             self.results = all_results
-            return all_results
+            self._account(self.batch, self.results)
+            finished = True
+            return self.results
         
         finally:
+            self.flow.finish(finished)
             await self.monitor.stop()
     
-    async def save_results(self, output_file: str) -> None:
-        """Save results to file asynchronously."""
+    async def stream_usernames(self, file_path: str) -> AsyncGenerator[str, None]:
+        """Yield non-blank usernames from a file without loading it into memory.
+        
+        With a checkpoint set, the finished prefix of the file is skipped; if
+        it no longer matches what the checkpoint saw, the stream starts over.
+        """
+        checkpoint = self.flow.checkpoint
+        skip = checkpoint.begin_stream() if checkpoint else 0
+        
+        while True:
+            restart = False
+            async with aclosing(self._read_lines(file_path)) as lines:
+                async for username in lines:
+                    if skip:
+                        checkpoint.skip_line(username)
+                        skip -= 1
+                        if not skip and not checkpoint.prefix_matches():
+                            restart = True
+                            break
+                        continue
+                    yield username
+            
+            # A file shorter than the checkpointed prefix can't be the same input
+            if skip and not checkpoint.prefix_matches():
+                restart = True
+            if not restart:
+                return
+            
+            print("⚠️ Input file changed since the checkpoint, starting from the beginning")
+            skip = 0
+    
+    async def _read_lines(self, file_path: str, chunk_size: int = 1 << 20) -> AsyncGenerator[str, None]:
+        """Yield stripped, non-blank lines, reading the file in large chunks."""
         try:
-            async with aiofiles.open(output_file, 'w', encoding='utf-8') as file:
-                await file.write("Username,Status,Code,ResponseTime,ErrorMessage\n")
+            async with aiofiles.open(file_path, 'r', encoding='utf-8') as file:
+                remainder = ''
+                while True:
+                    chunk = await file.read(chunk_size)
+                    if not chunk:
+                        break
+                    lines = (remainder + chunk).split('\n')
+                    remainder = lines.pop()
+                    for line in lines:
+                        username = line.strip()
+                        if username:
+                            yield username
+                
+                username = remainder.strip()
+                if username:
+                    yield username
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Username file not found: {file_path}")
+    
+    async def process_stream(self, source: AsyncIterator[str], total_hint: int = 0,
+                             on_results: Optional[Callable[[List[CheckResult]], None]] = None) -> Dict[str, int]:
+        """Check a stream of usernames with memory bounded by the queue depth.
+        
+        A reader task pulls names from ``source``, prepares them one batch at
+        a time and feeds a bounded queue, so reading and normalization overlap
+        with network work. Names are checked by the worker pool as they
+        arrive; each batch is written to the sink in input order once all of
+        its names are done, handed to ``on_results`` and then dropped. Only
+        counters and the (rare) valid names are kept.
+        Duplicates are collapsed within a batch, and across batches the
+        persistent result store answers names that were already checked.
+        """
+        self.monitor = PerformanceMonitor(total_hint, self.config)
+        self.monitor.latency = self.optimizer.latency
+        self.engine.monitor = self.monitor
+        await self.monitor.start()
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.stream_queue_depth)
+        
+        async def reader() -> None:
+            cancelled = False
+            try:
+                lines: List[str] = []
+                async for username in source:
+                    lines.append(username)
+                    if len(lines) >= self.config.batch_size:
+                        await queue.put((lines, self.flow.prepare(lines)))
+                        lines = []
+                if lines:
+                    await queue.put((lines, self.flow.prepare(lines)))
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Close the source here rather than leaving it to the event loop's shutdown
+                if hasattr(source, 'aclose'):
+                    await source.aclose()
+                # Wake the consumer; a reader error is re-raised by awaiting the task
+                if not cancelled:
+                    await queue.put(None)
+        
+        reader_task = asyncio.create_task(reader())
+        inflight: Deque[PendingBatch] = deque()
+        window = asyncio.Semaphore(self.config.stream_max_pending_batches)
+        lines_done = 0
+        
+        def finish_ready() -> None:
+            # Batches are written and checkpointed strictly in input order
+            nonlocal lines_done
+            while inflight and not inflight[0].remaining:
+                pending = inflight.popleft()
+                results = self.flow.write(pending.batch, pending.results)
+                self._account(pending.batch, results)
+                if on_results:
+                    on_results(results)
+                
+                if self.flow.checkpoint:
+                    self.flow.checkpoint.advance(pending.lines)
+                    self.flow.checkpoint.maybe_flush()
                 
-                for result in self.results:
-                    line = f"{result.username},{result.status},{result.code or ''},"
-                    line += f"{result.response_time:.3f},{result.error_message or ''}\n"
-                    await file.write(line)
+                lines_done += len(pending.lines)
+                self._update_progress(lines_done)
+                window.release()
+        
+        finished = False
+        try:
+            async with self._worker_pool() as pool:
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    lines, batch = item
                     
-        except Exception as e:
-            print(f"Error saving results: {e}")
+                    resumed, results = self._decided_results(batch)
+                    results.extend(resumed)
+                    
+                    # A slow batch at the head holds back output, so cap how far ahead we get
+                    await window.acquire()
+                    pending = PendingBatch(lines, batch, results, len(batch.to_check))
+                    inflight.append(pending)
+                    if not pending.remaining:
+                        finish_ready()
+                        continue
+                    
+                    def on_done(result: CheckResult, pending: PendingBatch = pending) -> None:
+                        pending.results.append(result)
+                        pending.remaining -= 1
+                        if not pending.remaining:
+                            finish_ready()
+                    
+                    for username in batch.to_check:
+                        await pool.submit(CheckJob(username), on_done)
+                
+                await pool.join()
+            
+            await reader_task
+            finished = True
+            return self.result_counts
+        
+        finally:
+            if not reader_task.done():
+                reader_task.cancel()
+                await asyncio.gather(reader_task, return_exceptions=True)
+            self.flow.finish(finished)
+            await self.monitor.stop()
     
     def print_summary(self) -> None:
         """Print a summary of results to console."""
-        total = len(self.results)
+        total = self.processed_count
         if total == 0:
             print("No usernames processed.")
             return
@@ -348,10 +397,35 @@ class UltraUsernameChecker:
         print(f"✅ Valid: {self.result_counts['valid']:,}")
         print(f"❌ Taken: {self.result_counts['taken']:,}")
         print(f"🚫 Censored: {self.result_counts['censored']:,}")
+        print(f"🧹 Invalid format: {self.result_counts['invalid_format']:,}")
         print(f"⚠️ Errors: {self.result_counts['errors']:,}")
+        if self.resumed_count:
+            print(f"⏩ Restored from checkpoint: {self.resumed_count:,}")
+        if self.known_taken_count:
+            print(f"🔒 Known taken from earlier runs: {self.known_taken_count:,}")
+        if self.flow.censor is not None:
+            print(self.flow.censor.summary())
+        if self.cached_count:
+            print(f"💾 Answered from result store: {self.cached_count:,}")
+        if self.duplicate_count:
+            print(f"♻️ Duplicates skipped: {self.duplicate_count:,}")
+        if self.retries.scheduled:
+            print(f"🔁 Retries scheduled: {self.retries.scheduled:,} (refused: {self.retries.refused:,})")
+        
+        # Tails matter more than means when tuning timeouts
+        latency = self.optimizer.latency
+        if latency.total.count:
+            print(f"\n⏱️ Request latency (ms):")
+            for phase, histogram in (('connect', latency.connect), ('first byte', latency.ttfb),
+                                     ('total', latency.total)):
+                if not histogram.count:
+                    continue
+                p = histogram.percentiles()
+                print(f"{phase:>10}: p50 {p[50.0] * 1000:.1f}  p90 {p[90.0] * 1000:.1f}  "
+                      f"p99 {p[99.0] * 1000:.1f}  p99.9 {p[99.9] * 1000:.1f}  max {histogram.max * 1000:.1f}")
         
         # Print some valid usernames if found
-        valid_usernames = [r.username for r in self.results if r.status == 'valid']
+        valid_usernames = self.valid_usernames
         if valid_usernames:
             print(f"\n🎉 Found {len(valid_usernames)} valid usernames!")
             if len(valid_usernames) <= 10:
@@ -1,90 +1,114 @@
 #!/usr/bin/env python3
 """Generate random usernames for testing."""
 
+import argparse
+import os
 import random
-import string
+import sys
+from typing import List, Optional
 
-def generate_username():
-    """Generate a random 5-character username."""
-    patterns = [
-        # Pure 5-character patterns (heavy weight)
-        lambda: ''.join(random.choices(string.ascii_letters, k=5)),
-        lambda: ''.join(random.choices(string.ascii_letters, k=5)),
-        lambda: ''.join(random.choices(string.ascii_letters, k=5)),
-        lambda: ''.join(random.choices(string.ascii_lowercase, k=5)),
-        lambda: ''.join(random.choices(string.ascii_lowercase, k=5)),
-        lambda: ''.join(random.choices(string.ascii_uppercase, k=5)),
-        
-        # 5-character with mixed case
-        lambda: random.choice(string.ascii_uppercase) + ''.join(random.choices(string.ascii_lowercase, k=4)),
-        lambda: random.choice(string.ascii_uppercase) + ''.join(random.choices(string.ascii_lowercase, k=4)),
-        lambda: ''.join(random.choices(string.ascii_lowercase, k=2)) + random.choice(string.ascii_uppercase) + ''.join(random.choices(string.ascii_lowercase, k=2)),
-        lambda: ''.join(random.choices(string.ascii_uppercase, k=2)) + ''.join(random.choices(string.ascii_lowercase, k=3)),
-        lambda: ''.join(random.choices(string.ascii_lowercase, k=3)) + ''.join(random.choices(string.ascii_uppercase, k=2)),
-        
-        # 5-character with numbers
-        lambda: ''.join(random.choices(string.ascii_lowercase, k=4)) + random.choice(string.digits),
-        lambda: ''.join(random.choices(string.ascii_lowercase, k=3)) + ''.join(random.choices(string.digits, k=2)),
-        lambda: ''.join(random.choices(string.ascii_letters, k=2)) + ''.join(random.choices(string.digits, k=3)),
-        lambda: random.choice(string.ascii_uppercase) + ''.join(random.choices(string.ascii_lowercase, k=2)) + ''.join(random.choices(string.digits, k=2)),
-        lambda: ''.join(random.choices(string.ascii_uppercase, k=2)) + ''.join(random.choices(string.ascii_lowercase, k=2)) + random.choice(string.digits),
-        lambda: random.choice(string.digits) + ''.join(random.choices(string.ascii_letters, k=4)),
-        lambda: ''.join(random.choices(string.ascii_letters, k=3)) + ''.join(random.choices(string.digits, k=2)),
-        lambda: random.choice(string.digits) + ''.join(random.choices(string.ascii_lowercase, k=3)) + random.choice(string.digits),
-        
-        # Advanced 5-character patterns
-        lambda: ''.join(random.choices(string.ascii_letters + string.digits, k=5)),
-        lambda: random.choice('ABCDEFG') + ''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k=4)),
-        lambda: ''.join(random.choices('abcdefghijklmnopqr', k=3)) + ''.join(random.choices('0123456789', k=2)),
-        lambda: ''.join(random.choices('ABCDEFGHIJK', k=2)) + ''.join(random.choices('abcdefghijklm', k=3)),
-        lambda: random.choice('123456789') + ''.join(random.choices('ABCDEFGHIJabcdefghij', k=4)),
-        lambda: ''.join(random.choices('abcdefghijk', k=2)) + random.choice('0123456789') + ''.join(random.choices('lmnopqrstuvwxyz', k=2)),
-    ]
-    
-    pattern = random.choice(patterns)
-    return pattern()
+from censor_filter import CensorFilter
+from keyspace_sampler import KeyspaceSampler, load_state, save_state
+from taken_index import TakenIndex
+from username_patterns import PatternGenerator, UsernamePattern, default_patterns, load_patterns
+
+_default_generator: Optional[PatternGenerator] = None
+
+def generate_username() -> str:
+    """Generate a random 5-character username from the built-in patterns."""
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = PatternGenerator(default_patterns())
+    return _default_generator.generate(1)[0]
 
-def generate_usernames(count: int) -> list:
-    """Generate a list of unique 5-character usernames."""
-    usernames = set()
-    attempts = 0
-    max_attempts = count * 5  # More attempts for larger generation
+def generate_usernames(count: int, patterns: Optional[List[UsernamePattern]] = None, seed: Optional[int] = None,
+                       offset: int = 0, taken: Optional[TakenIndex] = None,
+                       censor: Optional[CensorFilter] = None) -> List[str]:
+    """Generate a list of unique usernames.
     
-    print(f"🔄 Generating {count:,} unique 5-character usernames...")
+    Uniqueness is case-insensitive, matching how Roblox compares names.
+    Names come from a walk over the patterns' keyspace, so there is no
+    retrying on collisions; fewer than ``count`` names only come back when
+    the patterns have no more to give. Names in ``taken`` are never returned,
+    nor are names ``censor`` predicts censored, apart from the ones it audits.
+    """
+    sampler = KeyspaceSampler(patterns or default_patterns(), random.randrange(1 << 32) if seed is None else seed)
+    usernames, _ = sampler.sample(count, offset, [skip for skip in (taken, censor) if skip is not None])
+    return usernames
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate unique random usernames from patterns.")
+    parser.add_argument('--count', type=int, default=22000, help="usernames to generate")
+    parser.add_argument('--patterns', metavar='FILE',
+                        help="one 'pattern [weight]' per line, e.g. 'Lllldd 2' (default: the built-in 5-character mix)")
+    parser.add_argument('--output', default="usernames.txt")
+    parser.add_argument('--seed', type=int, help="make the output reproducible (default: from --state, else random)")
+    parser.add_argument('--offset', type=int,
+                        help="start this far into the keyspace walk; disjoint ranges give disjoint names")
+    parser.add_argument('--state', metavar='FILE',
+                        help="continue from the seed and offset saved here by the previous run, then update it")
+    parser.add_argument('--taken-index', metavar='FILE', default=os.getenv('TAKEN_INDEX', 'taken.idx'),
+                        help="leave out names this index knows are taken (default: $TAKEN_INDEX, else taken.idx; "
+                             "'' to keep them)")
+    parser.add_argument('--censor-model', metavar='FILE', default=os.getenv('CENSOR_MODEL', 'censor_model.json'),
+                        help="leave out names this model predicts censored (default: $CENSOR_MODEL, else "
+                             "censor_model.json; '' to keep them)")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    """Entry point."""
+    args = parse_args(argv)
+    try:
+        patterns = load_patterns(args.patterns) if args.patterns else default_patterns()
+        state = load_state(args.state, patterns) if args.state else None
+        taken = TakenIndex(args.taken_index) if args.taken_index and os.path.exists(args.taken_index) else None
+        censor = CensorFilter.load(args.censor_model) if args.censor_model and os.path.exists(args.censor_model) else None
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
     
-    while len(usernames) < count and attempts < max_attempts:
-        username = generate_username()
-        # Only accept exactly 5-character usernames
-        if len(username) == 5:
-            usernames.add(username)
-        attempts += 1
-        
-        # Progress indicator
-        if attempts % 5000 == 0:
-            print(f"   Progress: {len(usernames):,} unique usernames generated ({attempts:,} attempts)")
+    seed = args.seed if args.seed is not None else state['seed'] if state else random.randrange(1 << 32)
+    offset = args.offset if args.offset is not None else state['offset'] if state else 0
+    if state and (seed, offset) != (state['seed'], state['offset']):
+        print("⚠️ --seed/--offset differ from the state file; names from earlier runs may repeat")
+    sampler = KeyspaceSampler(patterns, seed)
     
-    return list(usernames)
-
-if __name__ == "__main__":
-    print("🎯 MASSIVE USERNAME GENERATION - 20,000+ 5-CHARACTER USERNAMES")
+    print("🎯 USERNAME GENERATION")
     print("=" * 60)
+    for keyspace in sampler.keyspaces:
+        print(f"   • {keyspace.pattern.source:<24} weight {keyspace.weight:g}, {keyspace.size:,} possible names")
+    for pattern in sampler.duplicates:
+        print(f"   • {pattern.source:<24} same names as an earlier pattern, weight added to it")
+    print(f"🔄 Generating {args.count:,} unique usernames (seed {seed}, offset {offset:,})...")
     
-    # Generate 20,000+ usernames
-    target_count = 22000  # Generate extra to ensure 20,000+
-    usernames = generate_usernames(target_count)
-    
-    # Verify all are 5 characters
-    five_char_only = [u for u in usernames if len(u) == 5]
+    if taken is not None:
+        print(f"🔒 Leaving out {len(taken):,} names known to be taken ({args.taken_index})")
+    if censor is not None:
+        print(f"🧠 Leaving out names the censor model predicts censored ({args.censor_model})")
+    usernames, next_offset = sampler.sample(args.count, offset, [skip for skip in (taken, censor) if skip is not None])
+    if taken is not None:
+        taken.close()
     
-    with open("usernames.txt", "w") as f:
-        for username in five_char_only:
-            f.write(username + "\n")
+    with open(args.output, "w") as f:
+        size = f.write("".join(username + "\n" for username in usernames))
+    if args.state:
+        save_state(args.state, patterns, seed, next_offset)
     
+    lengths = sorted({len(username) for username in usernames})
     print("=" * 60)
-    print(f"✅ SUCCESS! Generated {len(five_char_only):,} unique 5-character usernames")
-    print(f"📁 Saved to: usernames.txt")
+    if len(usernames) < args.count:
+        print(f"⚠️ The patterns ran out after {len(usernames):,} unique usernames")
+    else:
+        print(f"✅ SUCCESS! Generated {len(usernames):,} unique usernames")
+    print(f"📁 Saved to: {args.output}")
     print(f"📊 Statistics:")
-    print(f"   • Total unique usernames: {len(five_char_only):,}")
-    print(f"   • All are exactly 5 characters: 100%")
-    print(f"   • File size: ~{len(five_char_only) * 6 / 1024:.1f} KB")
-    print("🎉 Ready for ultra-fast username checking!")
\ No newline at end of file
+    print(f"   • Total unique usernames: {len(usernames):,}")
+    print(f"   • Lengths: {', '.join(map(str, lengths))}")
+    print(f"   • File size: {size / 1024:.1f} KB")
+    print(f"   • Next offset: {next_offset:,}" + (f" (saved to {args.state})" if args.state else ""))
+    print("🎉 Ready for ultra-fast username checking!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
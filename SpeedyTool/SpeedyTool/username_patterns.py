@@ -0,0 +1,248 @@
+"""A small pattern language for usernames, compiled into a bulk generator.
+
+A pattern describes one username character by character:
+
+- ``L`` an uppercase letter, ``l`` a lowercase letter, ``a`` any letter,
+  ``d`` a digit, ``x`` any letter or digit;
+- ``[...]`` one character from a set, with ranges: ``[a-k]``, ``[A-Ja-j_]``;
+- ``\\c`` the character ``c`` itself, e.g. ``\\_`` or ``\\B``;
+- any other non-alphanumeric character stands for itself, e.g. ``_``;
+- ``{n}`` after any of the above repeats it ``n`` times: ``l{4}d``.
+
+So ``Lllldd`` and ``L l{3} d{2}`` (spaces are ignored) describe the same
+names, and ``[a-k]{2}d[l-z]{2}`` gives names like ``cf7pz``.
+"""
+
+import random
+import string
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+CHARACTER_CLASSES = {
+    'L': string.ascii_uppercase,
+    'l': string.ascii_lowercase,
+    'a': string.ascii_letters,
+    'd': string.digits,
+    'x': string.ascii_letters + string.digits,
+}
+
+# What ``username_generator`` used to pick from, as patterns; weights repeat the old duplicates
+DEFAULT_PATTERNS: Tuple[Tuple[str, float], ...] = (
+    ('a{5}', 3), ('l{5}', 2), ('L{5}', 1),
+    ('Ll{4}', 2), ('l{2}Ll{2}', 1), ('L{2}l{3}', 1), ('l{3}L{2}', 1),
+    ('l{4}d', 1), ('l{3}d{2}', 1), ('a{2}d{3}', 1), ('Ll{2}d{2}', 1), ('L{2}l{2}d', 1),
+    ('da{4}', 1), ('a{3}d{2}', 1), ('dl{3}d', 1),
+    ('x{5}', 1), ('[A-G]l{4}', 1), ('[a-r]{3}d{2}', 1), ('[A-K]{2}[a-m]{3}', 1),
+    ('[1-9][A-Ja-j]{4}', 1), ('[a-k]{2}d[l-z]{2}', 1),
+)
+
+# Characters a pattern may produce; anything else can't be in a username or a line of output
+_ALLOWED = frozenset(string.ascii_letters + string.digits + string.punctuation)
+
+
+class PatternError(ValueError):
+    """A pattern that doesn't parse."""
+
+
+@dataclass(frozen=True)
+class UsernamePattern:
+    """A compiled pattern: the characters allowed at each position of a name."""
+    source: str
+    positions: Tuple[bytes, ...]
+    weight: float = 1.0
+
+    @property
+    def length(self) -> int:
+        return len(self.positions)
+
+    @property
+    def combinations(self) -> int:
+        """How many distinct names the pattern can produce."""
+        total = 1
+        for alphabet in self.positions:
+            total *= len(alphabet)
+        return total
+
+
+def _character_set(source: str, start: int) -> Tuple[str, int]:
+    """Parse the ``[...]`` starting at ``start``; returns its characters and the index after it."""
+    end = source.find(']', start + 1)
+    if end == -1:
+        raise PatternError(f"Unclosed '[' in {source!r}")
+    body = source[start + 1:end]
+    if not body:
+        raise PatternError(f"Empty '[]' in {source!r}")
+
+    characters = []
+    i = 0
+    while i < len(body):
+        if i + 2 < len(body) and body[i + 1] == '-':
+            low, high = body[i], body[i + 2]
+            if low > high:
+                raise PatternError(f"Backwards range '{low}-{high}' in {source!r}")
+            characters.extend(chr(c) for c in range(ord(low), ord(high) + 1))
+            i += 3
+        else:
+            characters.append(body[i])
+            i += 1
+    return ''.join(dict.fromkeys(characters)), end + 1
+
+
+def compile_pattern(source: str, weight: float = 1.0) -> UsernamePattern:
+    """Compile one pattern; raises ``PatternError`` if it doesn't parse."""
+    if weight <= 0:
+        raise PatternError(f"Weight of {source!r} must be positive")
+
+    positions: List[str] = []
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char.isspace():
+            i += 1
+            continue
+
+        if char == '{':
+            end = source.find('}', i)
+            if not positions or end == -1 or not source[i + 1:end].isdigit():
+                raise PatternError(f"'{{n}}' must follow a character and hold a count in {source!r}")
+            count = int(source[i + 1:end])
+            if count == 0:
+                raise PatternError(f"'{{0}}' in {source!r}")
+            positions.extend([positions[-1]] * (count - 1))
+            i = end + 1
+            continue
+
+        if char == '[':
+            alphabet, i = _character_set(source, i)
+        elif char == '\\':
+            if i + 1 == len(source):
+                raise PatternError(f"Trailing '\\' in {source!r}")
+            alphabet, i = source[i + 1], i + 2
+        elif char in CHARACTER_CLASSES:
+            alphabet, i = CHARACTER_CLASSES[char], i + 1
+        elif char.isalnum():
+            raise PatternError(f"Unknown class {char!r} in {source!r}; escape it as '\\{char}' for the letter itself")
+        else:
+            alphabet, i = char, i + 1
+
+        bad = set(alphabet) - _ALLOWED
+        if bad:
+            raise PatternError(f"Characters {''.join(sorted(bad))!r} can't appear in a username ({source!r})")
+        positions.append(alphabet)
+
+    if not positions:
+        raise PatternError("Empty pattern")
+    return UsernamePattern(source, tuple(alphabet.encode('ascii') for alphabet in positions), weight)
+
+
+def parse_patterns(lines: Iterable[str]) -> List[UsernamePattern]:
+    """Compile a patterns file: one ``pattern [weight]`` per line, ``#`` starts a comment."""
+    patterns = []
+    for number, line in enumerate(lines, 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        source, _, last = line.rpartition(' ')
+        weight = 1.0
+        try:
+            weight = float(last)
+        except ValueError:
+            # A last word that isn't a number is part of the pattern
+            source = line
+        try:
+            patterns.append(compile_pattern(source, weight))
+        except PatternError as e:
+            raise PatternError(f"line {number}: {e}") from None
+    if not patterns:
+        raise PatternError("No patterns found")
+    return patterns
+
+
+def load_patterns(path: str) -> List[UsernamePattern]:
+    """Compile the patterns in the file at ``path``."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_patterns(f)
+
+
+def default_patterns() -> List[UsernamePattern]:
+    """The built-in mix of 5-character patterns."""
+    return [compile_pattern(source, weight) for source, weight in DEFAULT_PATTERNS]
+
+
+class PatternGenerator:
+    """Produce usernames from weighted patterns, a whole batch at a time.
+
+    Every position of a pattern gets its characters for the whole batch
+    from one block of random bytes, mapped onto its alphabet with a single
+    ``bytes.translate``; bytes that would bias the mapping are dropped
+    rather than wrapped around, so each character is uniform. The columns
+    are then interleaved into newline-separated names with slice
+    assignment. Each batch holds every pattern in proportion to its weight,
+    grouped by pattern.
+    """
+
+    def __init__(self, patterns: Sequence[UsernamePattern], seed: Optional[int] = None):
+        if not patterns:
+            raise ValueError("at least one pattern is needed")
+        self.patterns = list(patterns)
+        self._random = random.Random(seed)
+        self._tables: Dict[bytes, Tuple[bytes, bytes, float]] = {}
+
+    def _table(self, alphabet: bytes) -> Tuple[bytes, bytes, float]:
+        """Translate table, bytes to drop and share of bytes kept, for one alphabet."""
+        table = self._tables.get(alphabet)
+        if table is None:
+            # Only the largest multiple of len(alphabet) below 256 maps evenly
+            keep = 256 - 256 % len(alphabet)
+            mapping = bytes(alphabet[b % len(alphabet)] for b in range(256))
+            table = (mapping, bytes(range(keep, 256)), keep / 256)
+            self._tables[alphabet] = table
+        return table
+
+    def _column(self, alphabet: bytes, count: int) -> bytes:
+        """``count`` uniform characters from ``alphabet``."""
+        if len(alphabet) == 1:
+            return alphabet * count
+        mapping, dropped, kept = self._table(alphabet)
+        column = b''
+        while len(column) < count:
+            need = count - len(column)
+            raw = self._random.randbytes(int(need / kept) + 16)
+            column += raw.translate(mapping, dropped)
+        return column[:count]
+
+    def _pattern_block(self, pattern: UsernamePattern, count: int) -> bytearray:
+        stride = pattern.length + 1
+        block = bytearray(b'\n') * (count * stride)
+        for position, alphabet in enumerate(pattern.positions):
+            block[position::stride] = self._column(alphabet, count)
+        return block
+
+    def _split(self, count: int) -> List[int]:
+        """How many of ``count`` names each pattern gets: its share, with the remainder drawn by weight."""
+        weights = [pattern.weight for pattern in self.patterns]
+        total = sum(weights)
+        counts = [int(count * weight / total) for weight in weights]
+        for index in self._random.choices(range(len(counts)), weights, k=count - sum(counts)):
+            counts[index] += 1
+        return counts
+
+    def generate_block(self, count: int) -> bytes:
+        """``count`` names as ASCII, each followed by a newline."""
+        return b''.join(self._pattern_block(pattern, n)
+                        for pattern, n in zip(self.patterns, self._split(count)) if n)
+
+    def generate(self, count: int) -> List[str]:
+        """``count`` names (repeats are possible)."""
+        if count <= 0:
+            return []
+        names = self.generate_block(count).decode('ascii').split('\n')
+        names.pop()
+        return names
+
+    def batches(self, count: int, batch_size: int = 1 << 16) -> Iterator[List[str]]:
+        """``count`` names in lists of at most ``batch_size``."""
+        while count > 0:
+            size = min(count, batch_size)
+            yield self.generate(size)
+            count -= size
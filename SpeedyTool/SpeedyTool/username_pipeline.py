@@ -0,0 +1,249 @@
+"""Username preparation pipeline shared by every checker front-end."""
+
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from result_model import CheckResult, normalize_status
+from result_sink import SinkRecord
+from username_rules import partition_usernames
+
+if TYPE_CHECKING:
+    from candidate_source import CandidateSource
+    from censor_filter import CensorFilter
+    from checkpoint import Checkpoint, CheckpointEntry
+    from result_sink import ResultSink
+    from result_store import ResultStore, StoredResult
+    from taken_index import TakenIndex
+
+T = TypeVar('T')
+
+
+def canonical_username(username: str) -> str:
+    """Return the canonical form of a username.
+
+    Roblox compares usernames case-insensitively, so two spellings that
+    casefold to the same string always get the same answer from the API.
+    """
+    return username.strip().casefold()
+
+
+@dataclass
+class UsernameBatch:
+    """Distinct usernames to check plus the mapping back to every input spelling."""
+    to_check: List[str] = field(default_factory=list)
+    invalid_format: List[str] = field(default_factory=list)
+    known_taken: List[str] = field(default_factory=list)
+    predicted_censored: List[str] = field(default_factory=list)
+    cached: Dict[str, 'StoredResult'] = field(default_factory=dict)
+    resumed: Dict[str, 'CheckpointEntry'] = field(default_factory=dict)
+    spellings: Dict[str, List[str]] = field(default_factory=dict)
+    total_input: int = 0
+
+    @property
+    def duplicates(self) -> int:
+        """Number of input lines that did not need a request of their own."""
+        return self.total_input - len(self.spellings)
+
+    def absorb(self, results: Iterable[T], username_of: Callable[[T], str]) -> List[T]:
+        """Merge results decided outside this batch into it.
+
+        Spellings of names this batch already covers are added to its
+        spelling lists, so ``fan_out`` expands them too; results for names the
+        batch has never seen are returned for the caller to keep as-is.
+        """
+        unseen = []
+        for result in results:
+            username = username_of(result)
+            spellings = self.spellings.get(canonical_username(username))
+            if spellings is None:
+                unseen.append(result)
+            elif username not in spellings:
+                spellings.append(username)
+        return unseen
+
+    def fan_out(self, results: Iterable[T],
+                username_of: Callable[[T], str],
+                rebind: Callable[[T, str], T]) -> List[T]:
+        """Expand one result per distinct name into one result per input spelling."""
+        expanded = []
+        for result in results:
+            username = username_of(result)
+            spellings = self.spellings.get(canonical_username(username))
+            if not spellings:
+                expanded.append(result)
+                continue
+
+            for spelling in spellings:
+                expanded.append(result if spelling == username else rebind(result, spelling))
+
+        return expanded
+
+
+def prepare_usernames(usernames: Iterable[str], store: Optional['ResultStore'] = None,
+                      checkpoint: Optional['Checkpoint'] = None,
+                      taken: Optional['TakenIndex'] = None,
+                      censor: Optional['CensorFilter'] = None) -> UsernameBatch:
+    """Strip, casefold and collapse duplicate usernames, then drop impossible ones.
+
+    The first spelling seen for each canonical name is the one sent to the
+    API; every distinct spelling is remembered so results can be fanned back
+    out with ``UsernameBatch.fan_out``. Names that break Roblox's username
+    rules are moved to ``invalid_format`` and never cost a request, and so
+    are names in the ``taken`` index, which land in ``known_taken``, and
+    names with a fresh answer in ``store``, which land in ``cached``. Last,
+    names the ``censor`` filter is confident about land in
+    ``predicted_censored``; a real answer from the store always wins.
+    When resuming, names already finished according to ``checkpoint`` are
+    moved to ``resumed`` before anything else happens to them.
+    """
+    batch = UsernameBatch()
+
+    for line in usernames:
+        username = line.strip()
+        if not username:
+            continue
+
+        batch.total_input += 1
+        key = canonical_username(username)
+        spellings = batch.spellings.get(key)
+
+        if spellings is None:
+            batch.spellings[key] = [username]
+            batch.to_check.append(username)
+        elif username not in spellings:
+            spellings.append(username)
+
+    if checkpoint is not None:
+        batch.resumed = checkpoint.lookup_many(batch.to_check)
+        if batch.resumed:
+            batch.to_check = [username for username in batch.to_check if username not in batch.resumed]
+
+    batch.to_check, batch.invalid_format = partition_usernames(batch.to_check)
+
+    if taken is not None:
+        batch.to_check, batch.known_taken = taken.partition(batch.to_check)
+
+    if store is not None:
+        batch.cached = store.lookup_many(batch.to_check)
+        if batch.cached:
+            batch.to_check = [username for username in batch.to_check if username not in batch.cached]
+
+    if censor is not None:
+        batch.to_check, batch.predicted_censored = censor.partition(batch.to_check)
+
+    return batch
+
+
+def known_result(username: str, status: str, code: Optional[int] = None) -> CheckResult:
+    """A result decided without a request."""
+    return CheckResult(username, normalize_status(status), code)
+
+
+class CheckFlow:
+    """Where a run's answers come from and where they go, whichever front-end sends the requests.
+
+    ``prepare`` gives the checkpoint, the username rules, the taken index,
+    the result store and the censor filter a chance to answer each name
+    before it costs a request, and ``decided`` turns their answers into
+    results. Answers from the API are kept for later runs by ``remember``
+    and, for a list input, checkpointed by ``checkpoint_results``. ``write``
+    expands either kind to every input spelling, appends it to the sink and
+    tells the candidate source, if any, which names are finished.
+    """
+
+    def __init__(self, store: Optional['ResultStore'] = None, taken: Optional['TakenIndex'] = None,
+                 censor: Optional['CensorFilter'] = None):
+        self.store = store
+        self.taken = taken
+        self.censor = censor
+        # Set by the caller to make the run resumable and to write results as they finish
+        self.checkpoint: Optional['Checkpoint'] = None
+        self.sink: Optional['ResultSink'] = None
+        self.source: Optional['CandidateSource'] = None
+
+    @classmethod
+    def from_config(cls, config) -> 'CheckFlow':
+        """Open the result store, taken index and censor model that ``config`` names."""
+        from censor_filter import CensorFilter
+        from result_store import ResultStore
+        from taken_index import TakenIndex
+
+        return cls(ResultStore.from_config(config), TakenIndex.from_config(config), CensorFilter.from_config(config))
+
+    def prepare(self, usernames: Iterable[str]) -> UsernameBatch:
+        """Collapse and prefilter one batch of input lines."""
+        return prepare_usernames(usernames, self.store, self.checkpoint, self.taken, self.censor)
+
+    def begin(self, usernames: List[str]) -> Tuple[UsernameBatch, List[CheckResult]]:
+        """Prepare a whole input list, skipping the prefix an interrupted run finished.
+
+        Also returns the results restored for that prefix which the batch
+        doesn't cover itself.
+        """
+        restored = []
+        if self.checkpoint:
+            usernames, restored = self.checkpoint.begin(usernames)
+        batch = self.prepare(usernames)
+        restored = batch.absorb(restored, lambda entry: entry.username)
+        return batch, [known_result(entry.username, entry.status, entry.code) for entry in restored]
+
+    def decided(self, batch: UsernameBatch) -> Tuple[List[CheckResult], List[CheckResult]]:
+        """Return (resumed, decided) results for the names in ``batch`` that need no request."""
+        resumed = [known_result(username, entry.status, entry.code) for username, entry in batch.resumed.items()]
+        decided = [known_result(username, 'invalid_format') for username in batch.invalid_format]
+        decided.extend(known_result(username, 'taken', 1) for username in batch.known_taken)
+        # No code for predictions, since the API never said so
+        decided.extend(known_result(username, 'censored') for username in batch.predicted_censored)
+        decided.extend(known_result(username, stored.status, stored.code) for username, stored in batch.cached.items())
+        return resumed, decided
+
+    def remember(self, result: CheckResult) -> None:
+        """Keep an answer from the API for later runs, and score the censor filter with it."""
+        if self.store:
+            self.store.record(result.username, result.status, result.code)
+        if self.taken is not None:
+            self.taken.record(result.username, result.status)
+        if self.censor is not None:
+            self.censor.record(result.username, result.status)
+
+    def checkpoint_results(self, results: Iterable[CheckResult]) -> None:
+        """Record finished results in the checkpoint, flushing periodically."""
+        if not self.checkpoint:
+            return
+        for result in results:
+            self.checkpoint.record(result.username, result.status, result.code)
+        self.checkpoint.maybe_flush()
+
+    def write(self, batch: UsernameBatch, results: Iterable[CheckResult]) -> List[CheckResult]:
+        """Expand results to every input spelling and append them to the sink."""
+        results = batch.fan_out(
+            results,
+            lambda result: result.username,
+            lambda result, username: replace(result, username=username)
+        )
+        if self.sink:
+            self.sink.write_records([
+                SinkRecord(result.username, result.status, result.code, result.response_time, result.error_message)
+                for result in results
+            ])
+        if self.source is not None:
+            # Errors are final here, as retries are used up; they are in the output to recheck
+            self.source.finished(result.username for result in results)
+        return results
+
+    def finish(self, completed: bool) -> None:
+        """Drop the checkpoint if the run completed, otherwise keep it to resume from."""
+        if self.checkpoint:
+            if completed:
+                self.checkpoint.finish()
+            else:
+                self.checkpoint.close()
+
+    def close(self) -> None:
+        """Save and release the store, the taken index and the censor filter."""
+        if self.store:
+            self.store.close()
+        if self.taken is not None:
+            self.taken.close()
+        if self.censor is not None:
+            self.censor.close()
@@ -0,0 +1,44 @@
+"""Local Roblox username rules, checked in bulk before any request is made."""
+
+import re
+from typing import Iterable, List, Tuple
+
+MIN_LENGTH = 3
+MAX_LENGTH = 20
+
+# 3-20 ASCII letters/digits with at most one underscore, never at either end.
+# Compiled in MULTILINE mode so a whole list can be matched in a single pass.
+_VALID_USERNAME = re.compile(
+    rf'^(?=[A-Za-z0-9_]{{{MIN_LENGTH},{MAX_LENGTH}}}$)[A-Za-z0-9]+(?:_[A-Za-z0-9]+)?$',
+    re.MULTILINE
+)
+
+
+def is_valid_format(username: str) -> bool:
+    """Return True if a single username can possibly be accepted by Roblox."""
+    return '\n' not in username and _VALID_USERNAME.match(username) is not None
+
+
+def partition_usernames(usernames: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """Split usernames into (possible, invalid_format) lists.
+
+    The names are joined into one newline-separated blob and matched with a
+    single ``findall`` so the rule engine runs in C rather than once per name
+    in Python. Matches are then checked against whole names, so a name with an
+    embedded newline can never sneak through as a fragment.
+    """
+    usernames = list(usernames)
+    if not usernames:
+        return [], []
+
+    accepted = set(_VALID_USERNAME.findall('\n'.join(usernames)))
+
+    possible = []
+    invalid = []
+    for username in usernames:
+        if username in accepted:
+            possible.append(username)
+        else:
+            invalid.append(username)
+
+    return possible, invalid
@@ -0,0 +1,128 @@
+"""Fixed pool of long-lived worker tasks fed from a bounded queue."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, List, Optional, TypeVar
+
+from retry_queue import RetryQueue
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class RetryLater(Exception):
+    """Raised by a handler to run ``item`` again after ``delay`` seconds."""
+
+    def __init__(self, item: Any, delay: float):
+        super().__init__(f"retry in {delay:.3f}s")
+        self.item = item
+        self.delay = delay
+
+
+class WorkerPool(Generic[T, R]):
+    """Run ``handler`` over submitted items with a fixed number of workers.
+
+    Each worker pulls the next item as soon as its previous one finishes, so
+    one slow request only ever occupies its own worker instead of holding up
+    a whole batch. ``submit`` blocks while the queue is full, which pushes
+    back on whoever produces the items. Results are delivered to the
+    callback given with each item, in completion order.
+
+    A handler that raises ``RetryLater`` frees its worker at once; the item
+    waits out its delay in ``retries`` and is then queued again, keeping the
+    callback it was submitted with.
+    """
+
+    def __init__(self, handler: Callable[[T], Awaitable[R]], workers: int, queue_depth: Optional[int] = None,
+                 retries: Optional[RetryQueue] = None):
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        self.handler = handler
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_depth or workers)
+        self.retries = retries
+        self.busy = 0
+        self._tasks: List[asyncio.Task] = []
+        self._error: Optional[BaseException] = None
+        self._outstanding = 0  # Submitted items not yet finished, including those waiting to retry
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._retry_due = asyncio.Event()
+
+    async def __aenter__(self) -> 'WorkerPool[T, R]':
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """Start the worker tasks."""
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        if self.retries is not None:
+            self._tasks.append(asyncio.create_task(self._release_retries()))
+
+    async def submit(self, item: T, on_done: Callable[[R], None]) -> None:
+        """Queue ``item``; ``on_done`` is called with its result."""
+        self._raise_error()
+        self._outstanding += 1
+        self._idle.clear()
+        await self.queue.put((item, on_done))
+
+    async def join(self) -> None:
+        """Wait until every submitted item has been handled, retries included."""
+        await self._idle.wait()
+        self._raise_error()
+
+    async def close(self) -> None:
+        """Stop the workers, abandoning anything still queued."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    async def _work(self) -> None:
+        while True:
+            item, on_done = await self.queue.get()
+            self.busy += 1
+            finished = True
+            try:
+                on_done(await self.handler(item))
+            except asyncio.CancelledError:
+                raise
+            except RetryLater as retry:
+                if self.retries is None:
+                    raise RuntimeError("handler asked for a retry but the pool has no retry queue") from retry
+                self.retries.push((retry.item, on_done), retry.delay)
+                self._retry_due.set()
+                finished = False
+            except Exception as e:
+                # Surfaced to the producer on its next submit or join
+                if self._error is None:
+                    self._error = e
+            finally:
+                self.busy -= 1
+                self.queue.task_done()
+                if finished:
+                    self._outstanding -= 1
+                    if not self._outstanding:
+                        self._idle.set()
+
+    async def _release_retries(self) -> None:
+        # Sleeps until the earliest retry is due, or until a sooner one is parked
+        while True:
+            self._retry_due.clear()
+            wait = self.retries.time_to_next()
+            if wait is None:
+                await self._retry_due.wait()
+            elif wait > 0:
+                try:
+                    await asyncio.wait_for(self._retry_due.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                for job in self.retries.pop_due():
+                    await self.queue.put(job)